@@ -0,0 +1,102 @@
+"""
+Build the static assets served from /static.
+
+- Compiles globals.css with the Tailwind CLI, purged against the classes used in
+  components, pages, static/js and the installed shad4fast package, and minified.
+- Downloads hyperscript so browsers never fetch it from a CDN.
+- Writes every asset under a content-hashed name and records the mapping in
+  static/manifest.json, which main.py reads at startup.
+
+Run from the src directory: python build_assets.py
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+from typing import List
+
+import shad4fast
+
+SRC_DIR = Path(__file__).parent
+STATIC_DIR = SRC_DIR / "static"
+MANIFEST_FILE = STATIC_DIR / "manifest.json"
+
+# The config in tailwind.config.js uses the v3 format
+TAILWINDCSS_VERSION = "v3.4.17"
+HYPERSCRIPT_VERSION = "0.9.12"
+HYPERSCRIPT_URL = f"https://unpkg.com/hyperscript.org@{HYPERSCRIPT_VERSION}/dist/_hyperscript.min.js"
+
+# Files whose class names are kept in the CSS, by directory. shad4fast is
+# wherever pip installed it, e.g. not in a virtualenv in the Docker image
+CONTENT_GLOBS = [
+    (SRC_DIR, "**/*.py"),
+    (SRC_DIR, "static/js/**/*.js"),
+    (Path(shad4fast.__file__).parent, "**/*.py"),
+    (Path(shad4fast.__file__).parent, "**/*.js"),
+]
+
+def content_paths() -> List[str]:
+    """
+    The content globs as absolute paths for the Tailwind CLI. Exits if one
+    matches no file, as every class used only there would be purged.
+    """
+    paths = []
+    for directory, pattern in CONTENT_GLOBS:
+        if next(directory.glob(pattern), None) is None:
+            sys.exit(f"No file matches the Tailwind content glob {directory / pattern}")
+        paths.append(str(directory / pattern))
+    return paths
+
+def build_css(output: Path):
+    tailwind = shutil.which("tailwindcss")
+    if not tailwind:
+        sys.exit("tailwindcss not found, install it with: pip install pytailwindcss")
+    subprocess.run(
+        [
+            tailwind, "-c", "tailwind.config.js", "-i", "globals.css", "-o", str(output),
+            "--content", ",".join(content_paths()), "--minify"
+        ],
+        cwd=SRC_DIR,
+        env={"TAILWINDCSS_VERSION": TAILWINDCSS_VERSION, **os.environ},
+        check=True
+    )
+
+def download_hyperscript(output: Path):
+    with urllib.request.urlopen(HYPERSCRIPT_URL, timeout=30) as response:
+        output.write_bytes(response.read())
+
+def write_hashed(source: Path, logical_name: str) -> str:
+    """Copy source to static/ under a content-hashed name and return that name."""
+    digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+    stem, suffix = logical_name.rsplit(".", 1)
+    hashed_name = f"{stem}.{digest}.{suffix}"
+    target = STATIC_DIR / hashed_name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Remove builds of the same asset with an older hash
+    for old in target.parent.glob(f"{Path(stem).name}.*.{suffix}"):
+        old.unlink()
+    shutil.copyfile(source, target)
+    return hashed_name
+
+def main():
+    manifest = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        css_file = Path(tmp) / "app.css"
+        build_css(css_file)
+        manifest["css/app.css"] = write_hashed(css_file, "css/app.css")
+
+        hyperscript_file = Path(tmp) / "_hyperscript.min.js"
+        download_hyperscript(hyperscript_file)
+        manifest["vendor/_hyperscript.min.js"] = write_hashed(hyperscript_file, "vendor/_hyperscript.min.js")
+
+    MANIFEST_FILE.write_text(json.dumps(manifest, indent=2))
+    for logical_name, hashed_name in manifest.items():
+        print(f"{logical_name} -> {hashed_name}")
+
+if __name__ == "__main__":
+    main()
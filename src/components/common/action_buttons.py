@@ -19,8 +19,9 @@ def DeleteButton(item_id: str, endpoint: str, confirm_message: Optional[str] = N
         **{
             "data-item-id": item_id,
             "hx-delete": f"{endpoint}/{item_id}",
-            "hx-target": "#settings-page",
-            "hx-swap": "innerHTML",
+            # The response is empty on success, which removes the row
+            "hx-target": "closest tr",
+            "hx-swap": "outerHTML",
             "hx-confirm": confirm_message or "Are you sure you want to delete this item?",
         }
     )
@@ -34,8 +35,8 @@ def DeleteAllButton(endpoint: str, confirm_message: Optional[str] = None, button
         cls="flex items-center px-4 py-2 border border-gray-300 hover:border-red-200 dark:border-gray-600 dark:hover:border-red-600",
         **{
             "hx-delete": f"{endpoint}/delete/all",
-            "hx-target": "#settings-page",
-            "hx-swap": "innerHTML",
+            "hx-target": "#settings-table-container",
+            "hx-swap": "outerHTML",
             "hx-confirm": confirm_message or "Are you sure you want to delete all items? This cannot be undone.",
         }
     )
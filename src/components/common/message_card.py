@@ -13,3 +13,20 @@ def MessageCard(message: str = None, message_type: str = None):
         id=f"notification-card-{uuid.uuid4()}",
         data_message_type=message_type
     )
+
+NOTIFICATIONS_ID = "notifications"
+
+def Notifications(success_messages: list[str] = None, error_messages: list[str] = None, oob: bool = False):
+    """
+    Container for notification cards. With oob set, the cards are appended to
+    the container already on the page, so any HTMX response can carry them.
+    """
+    cards = [MessageCard(message=msg, message_type="error") for msg in error_messages or []]
+    cards += [MessageCard(message=msg, message_type="success") for msg in success_messages or []]
+
+    return Div(
+        *cards,
+        id=NOTIFICATIONS_ID,
+        cls="fixed top-0 right-0 z-50 flex flex-col gap-4 p-4",
+        **({"hx-swap-oob": "beforeend"} if oob else {})
+    )
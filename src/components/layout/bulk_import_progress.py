@@ -0,0 +1,31 @@
+from fasthtml.components import Div, Span
+
+def BulkImportProgress(job):
+    total = f" of {job.total}" if job.total is not None else ""
+    percent = int(job.processed * 100 / job.total) if job.total else 0
+
+    return Div(
+        Div(
+            Span(
+                f"Importing knowledge bases: {job.processed}{total} processed",
+                cls="text-sm font-medium text-gray-900 dark:text-white"
+            ),
+            Span(
+                f"{job.failed} failed" if job.failed else "",
+                cls="text-sm text-red-500"
+            ),
+            cls="flex justify-between mb-2"
+        ),
+        Div(
+            Div(
+                cls="h-2 bg-black dark:bg-white rounded-full",
+                style=f"width: {percent}%"
+            ),
+            cls="w-full h-2 bg-gray-200 dark:bg-gray-800 rounded-full overflow-hidden"
+        ) if job.total else None,
+        id="bulk-import-progress",
+        cls="w-full p-6 mb-4 bg-white dark:bg-gray-900 shadow rounded-lg",
+        hx_get=f"/api/knowledge-base/bulk/{job.id}",
+        hx_trigger="every 1s",
+        hx_swap="outerHTML"
+    )
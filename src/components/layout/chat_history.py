@@ -23,6 +23,7 @@ def ChatHistory(conversations: List[Conversation] = None):
             ),
             Div(
                 "No recent chats" if not items else "",
+                id="chat-history-empty",
                 cls="px-4 py-2 text-sm text-gray-500 dark:text-gray-400"
             ) if not items else None,
             *[
@@ -32,5 +33,6 @@ def ChatHistory(conversations: List[Conversation] = None):
                     cls="block px-4 py-2 text-sm text-gray-600 dark:text-gray-300 hover:bg-gray-200 dark:hover:bg-gray-800 rounded-lg truncate"
                 ) for item in items
             ],
+            id="chat-history",
             cls="space-y-1 w-full"
         )
@@ -1,6 +1,7 @@
 from fasthtml.components import Div
 from components.layout.settings_table import SettingsTable
 from src.components.common.action_buttons import DeleteButton, DeleteAllButton
+from src.services.api.pagination import PageRequest, CONVERSATION_DEFAULT_SORT
 from datetime import datetime
 
 def format_timestamp(timestamp_str: str) -> str:
@@ -11,9 +12,17 @@ def format_timestamp(timestamp_str: str) -> str:
     except:
         return timestamp_str
 
-def ChatHistorySettings(conversations=None):
+def ChatHistorySettings(conversations=None, page=None, total=None, partial=False):
+    """
+    conversations holds one page, already sorted and filtered; total is the
+    number of matching conversations across all pages.
+    """
     if conversations is None:
         conversations = []
+    if page is None:
+        page = PageRequest(page=1, sort=CONVERSATION_DEFAULT_SORT)
+    if total is None:
+        total = len(conversations)
 
     def create_delete_button(item_id: str):
         return DeleteButton(
@@ -37,16 +46,27 @@ def ChatHistorySettings(conversations=None):
             confirm_message="Are you sure you want to delete all conversations? This cannot be undone.",
             button_text="Delete All"
         )
-    ] if items else []
+    ] if total else []
+
+    table = SettingsTable(
+        title="Chat History Management",
+        col1_name="Name",
+        col2_name="Date Added",
+        items=items,
+        row_actions=[create_delete_button],
+        header_actions=header_actions,
+        page=page,
+        total=total,
+        endpoint="/settings/chat-history",
+        col1_sort="title",
+        col2_sort="createdAt",
+        search_placeholder="Search by name...",
+        partial=partial
+    )
+    if partial:
+        return table
 
     return Div(
-        SettingsTable(
-            title="Chat History Management",
-            col1_name="Name",
-            col2_name="Date Added",
-            items=items,
-            row_actions=[create_delete_button],
-            header_actions=header_actions
-        ),
+        table,
         cls="max-w-7xl mx-auto py-6 sm:px-6 lg:px-8"
     )
@@ -0,0 +1,51 @@
+from fasthtml.common import NotStr
+from fasthtml.components import Div
+from typing import Iterable, List, Optional, Tuple
+from src.services.api.types import ChatMessage
+
+# Keep in sync with messageClasses in static/js/chat.js
+MESSAGE_CLASSES = {
+    "base": "max-w-[70%] p-4 rounded-[20px] mb-4",
+    "user": "ml-auto bg-blue-500 text-white rounded-br-[5px]",
+    "assistant": "mr-auto bg-gray-100 dark:bg-gray-800 rounded-bl-[5px]",
+}
+
+def group_messages(messages: Iterable[ChatMessage]) -> List[Tuple[str, str]]:
+    """
+    Merge consecutive messages from the same sender into one bubble.
+    Takes messages oldest first; returns (sender type, content) pairs.
+    """
+    bubbles = []
+    for message in messages:
+        if bubbles and bubbles[-1][0] == message.senderType:
+            bubbles[-1] = (message.senderType, bubbles[-1][1] + message.content)
+        else:
+            bubbles.append((message.senderType, message.content))
+    return bubbles
+
+def MessageBubble(sender_type: str, content: str):
+    if sender_type.lower() == "user":
+        return Div(content, cls=f"{MESSAGE_CLASSES['base']} {MESSAGE_CLASSES['user']}")
+
+    # Assistant answers are HTML produced by the backend
+    return Div(
+        Div(NotStr(content), cls="inline"),
+        cls=f"{MESSAGE_CLASSES['base']} {MESSAGE_CLASSES['assistant']}"
+    )
+
+def OlderMessagesLoader(conversation_id: str, before: str):
+    """Loads the previous page of messages in its place once scrolled into view."""
+    return Div(
+        id="older-messages-loader",
+        cls="h-px",
+        hx_get=f"/api/conversations/{conversation_id}/messages?before={before}",
+        hx_trigger="intersect once",
+        hx_swap="outerHTML"
+    )
+
+def MessageHistory(conversation_id: str, bubbles: List[Tuple[str, str]], before: Optional[str] = None):
+    """A page of bubbles, oldest first, preceded by a loader when older ones exist."""
+    return (
+        OlderMessagesLoader(conversation_id, before) if before else None,
+        *[MessageBubble(sender_type, content) for sender_type, content in bubbles]
+    )
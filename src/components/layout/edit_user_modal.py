@@ -110,8 +110,9 @@ def EditUserModal(user: Optional[Dict] = None, current_user_id: str = None):
                         cls="bg-white dark:bg-gray-800 p-6 sm:p-8",
                         **{
                             "hx-post": action,
-                            "hx-target": "#settings-page",
-                            "hx-swap": "innerHTML",
+                            # Edits replace their row; a new user reloads the table page
+                            "hx-target": "#settings-table-container" if is_new_user else f"#row-{user['id']}",
+                            "hx-swap": "outerHTML",
                             "hx-validate": "true",
                             "hx-on::before-request": "return validatePasswordsAndSubmit(this);"
                         }
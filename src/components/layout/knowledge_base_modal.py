@@ -73,8 +73,9 @@ def KnowledgeBaseModal(kb: Optional[Dict] = None):
                         cls="bg-white dark:bg-gray-800 p-6 sm:p-8",
                         **{
                             "hx-post": action,
-                            "hx-target": "#settings-page",
-                            "hx-swap": "innerHTML",
+                            # Edits replace their row; a new entry reloads the table page
+                            "hx-target": "#settings-table-container" if is_new_kb else f"#row-{kb['id']}",
+                            "hx-swap": "outerHTML",
                         }
                     ),
                     cls="relative transform overflow-hidden rounded-xl bg-white dark:bg-gray-800 shadow-2xl transition-all sm:w-full sm:max-w-2xl",  # Increased max-width
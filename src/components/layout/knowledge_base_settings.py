@@ -1,6 +1,8 @@
 from fasthtml.components import Div, Form, Input, Button
-from components.layout.settings_table import SettingsTable
-from src.components.common.action_buttons import DeleteButton, EditButton, AddButton
+from components.layout.settings_table import SettingsTable, SettingsTableRow
+from src.components.common.action_buttons import DeleteButton, DeleteAllButton, EditButton, AddButton
+from src.components.layout.bulk_import_progress import BulkImportProgress
+from src.services.api.pagination import PageRequest, KNOWLEDGE_BASE_DEFAULT_SORT
 from datetime import datetime
 
 def format_timestamp(timestamp_str: str) -> str:
@@ -11,38 +13,44 @@ def format_timestamp(timestamp_str: str) -> str:
     except:
         return timestamp_str
 
-def KnowledgeBaseSettings(knowledge_bases=None):
-
-    if knowledge_bases is None:
-        knowledge_bases = []
+def create_edit_button(kb_id: str):
+    return EditButton(
+        item_id=kb_id,
+        endpoint=f"/settings/knowledge-base/edit"
+    )
 
-    sorted_knowledge_bases = sorted(knowledge_bases, 
-        key=lambda kb: ( 
-            kb.title.lower() 
-        )
+def create_delete_button(kb_id: str):
+    return DeleteButton(
+        item_id=kb_id,
+        endpoint="/api/knowledge-base",
+        confirm_message="Are you sure you want to delete this knowledge base? This cannot be undone."
     )
 
-    def create_edit_button(kb_id: str):
-        return EditButton(
-            item_id=kb_id,
-            endpoint=f"/settings/knowledge-base/edit"
-        )
+ROW_ACTIONS = [create_edit_button, create_delete_button]
 
-    def create_delete_button(kb_id: str):
-        return DeleteButton(
-            item_id=kb_id,
-            endpoint="/api/knowledge-base",
-            confirm_message="Are you sure you want to delete this knowledge base? This cannot be undone."
-        )
+def table_item(kb):
+    return {
+        "id": kb.id,
+        "col1": kb.title,
+        "col2": format_timestamp(kb.createdAt),
+    }
 
-    items = [
-        {
-            "id": kb.id,
-            "col1": kb.title,
-            "col2": format_timestamp(kb.createdAt),
-        }
-        for kb in sorted_knowledge_bases
-    ]
+def KnowledgeBaseRow(kb):
+    return SettingsTableRow(table_item(kb), ROW_ACTIONS)
+
+def KnowledgeBaseSettings(knowledge_bases=None, import_job=None, page=None, total=None, partial=False):
+    """
+    knowledge_bases holds one page, already sorted and filtered by the backend;
+    total is the number of matching knowledge bases across all pages.
+    """
+    if knowledge_bases is None:
+        knowledge_bases = []
+    if page is None:
+        page = PageRequest(page=1, sort=KNOWLEDGE_BASE_DEFAULT_SORT)
+    if total is None:
+        total = len(knowledge_bases)
+
+    items = [table_item(kb) for kb in knowledge_bases]
 
     header_actions = [
         AddButton(
@@ -72,16 +80,36 @@ def KnowledgeBaseSettings(knowledge_bases=None):
             )
         )
     ]
+    if total:
+        header_actions.append(
+            DeleteAllButton(
+                endpoint="/api/knowledge-base",
+                confirm_message="Are you sure you want to delete all knowledge bases? This cannot be undone.",
+                button_text="Delete All"
+            )
+        )
+
+    table = SettingsTable(
+        title="Knowledge Base Management",
+        col1_name="Name",
+        col2_name="Date Added",
+        items=items,
+        row_actions=ROW_ACTIONS,
+        header_actions=header_actions,
+        page=page,
+        total=total,
+        endpoint="/settings/knowledge-base",
+        col1_sort="title",
+        col2_sort="createdAt",
+        search_placeholder="Search by name...",
+        partial=partial
+    )
+    if partial:
+        return table
 
     return Div(
-        SettingsTable(
-            title="Knowledge Base Management",
-            col1_name="Name",
-            col2_name="Date Added",
-            items=items,
-            row_actions=[create_edit_button, create_delete_button],
-            header_actions=header_actions
-        ),
+        BulkImportProgress(import_job) if import_job else None,
+        table,
         Div(id="modal"),
         cls="max-w-7xl mx-auto py-6 sm:px-6 lg:px-8"
     )
@@ -1,4 +1,4 @@
-from fasthtml.components import Div, H2
+from fasthtml.components import Div, H2, Input, Span, Button
 from shad4fast import (
     Table,
     TableBody,
@@ -7,8 +7,115 @@ from shad4fast import (
     TableHeader,
     TableRow,
 )
+from lucide_fasthtml import Lucide
 from typing import List, Dict, Optional, Any
 from src.components.common.heading import SettingsHeading
+from src.services.api.pagination import PageRequest, parse_sort
+
+TABLE_CONTAINER_ID = "settings-table-container"
+PAGINATION_ID = "settings-table-pagination"
+
+def _table_request(url: str, **attributes):
+    """HTMX attributes loading another state of the table in place."""
+    return {
+        "hx-get": url,
+        "hx-target": f"#{TABLE_CONTAINER_ID}",
+        "hx-swap": "outerHTML",
+        "hx-push-url": "true",
+        **attributes
+    }
+
+def SortableHead(name: str, sort_key: Optional[str], page: Optional[PageRequest], endpoint: Optional[str]):
+    if not sort_key or page is None:
+        return name
+
+    field, descending = parse_sort(page.sort)
+    is_sorted = field == sort_key
+    next_sort = sort_key if not is_sorted or descending else f"-{sort_key}"
+    icon = ("arrow-down" if descending else "arrow-up") if is_sorted else "arrow-up-down"
+    return Button(
+        name,
+        Lucide(icon, cls="h-3 w-3 ml-1"),
+        type="button",
+        cls="flex items-center uppercase tracking-wider hover:text-gray-900 dark:hover:text-white",
+        **_table_request(page.url(endpoint, page=1, sort=next_sort))
+    )
+
+def Pagination(page: PageRequest, total: int, endpoint: str, oob: bool = False):
+    """Table footer; with oob set it replaces the one on the page, e.g. after a row was deleted."""
+    page_count = page.page_count(total)
+    button_cls = "flex items-center px-3 py-1 border border-gray-300 dark:text-white dark:border-gray-600 rounded-full hover:bg-gray-100 dark:hover:bg-gray-800 disabled:opacity-50 disabled:pointer-events-none"
+    first = page.offset + 1 if total else 0
+    last = min(page.offset + page.page_size, total)
+
+    return Div(
+        Span(f"{first}-{last} of {total}", cls="text-sm text-gray-500 dark:text-gray-400"),
+        Div(
+            Button(
+                Lucide("chevron-left", cls="h-4 w-4"),
+                type="button",
+                cls=button_cls,
+                disabled=page.page <= 1,
+                **_table_request(page.url(endpoint, page=page.page - 1))
+            ),
+            Span(f"Page {page.page} of {page_count}", cls="text-sm text-gray-500 dark:text-gray-400"),
+            Button(
+                Lucide("chevron-right", cls="h-4 w-4"),
+                type="button",
+                cls=button_cls,
+                disabled=page.page >= page_count,
+                **_table_request(page.url(endpoint, page=page.page + 1))
+            ),
+            cls="flex items-center space-x-2"
+        ),
+        id=PAGINATION_ID,
+        cls="flex justify-between items-center px-6 py-4 border-t border-gray-200 dark:border-gray-800",
+        **({"hx-swap-oob": "true"} if oob else {})
+    )
+
+def TableSearch(page: PageRequest, endpoint: str, placeholder: str):
+    return Input(
+        type="search",
+        name="q",
+        value=page.query,
+        placeholder=placeholder,
+        cls="px-4 py-2 text-sm border border-gray-300 dark:border-gray-600 dark:bg-gray-900 dark:text-white rounded-full",
+        **_table_request(
+            endpoint,
+            **{
+                "hx-trigger": "input changed delay:300ms, search",
+                # Keep the current sort; the page goes back to the first one
+                "hx-include": "#settings-table-sort",
+            }
+        )
+    )
+
+def SettingsTableRow(item: Dict, row_actions: Optional[List[Any]] = None):
+    """A single table row, also returned on its own when one item changes."""
+    if row_actions is None:
+        row_actions = []
+
+    return TableRow(
+        TableCell(item["col1"], cls="px-6 py-4 text-sm font-medium text-gray-900 dark:text-white border-r border-gray-200 dark:border-gray-800 truncate max-w-0"),
+        TableCell(item["col2"], cls="px-6 py-4 text-sm text-gray-500 dark:text-gray-400 border-r border-gray-200 dark:border-gray-800"),
+        TableCell(
+            *[
+                action(item["id"]) if callable(action) else action 
+                for action in row_actions
+            ],
+            cls="px-6 py-4 space-x-2"
+        ) if row_actions else None,
+        cls="bg-white hover:bg-gray-70 dark:bg-gray-900 dark:hover:bg-gray-950",
+        id=f"row-{item['id']}"
+    )
+
+def TableError(message: str):
+    """Replaces the table container when reloading it failed."""
+    return Div(
+        message,
+        id=TABLE_CONTAINER_ID,
+        cls="w-full text-center py-8 text-red-500"
+    )
 
 def SettingsTable(
     title: str, 
@@ -16,62 +123,68 @@ def SettingsTable(
     col2_name: str, 
     items: Optional[List[Dict]] = None,
     row_actions: Optional[List[Any]] = None,
-    header_actions: Optional[List[Any]] = None
+    header_actions: Optional[List[Any]] = None,
+    page: Optional[PageRequest] = None,
+    total: int = 0,
+    endpoint: Optional[str] = None,
+    col1_sort: Optional[str] = None,
+    col2_sort: Optional[str] = None,
+    search_placeholder: str = "Search...",
+    partial: bool = False
 ):
+    """
+    Settings table. When a page and endpoint are given, items hold only the
+    current page and the table gets sortable headers, a search box and page
+    controls that reload it from the endpoint through HTMX. With partial set
+    only the table container is rendered, for those reloads.
+    """
     if items is None:
         items = []
     if row_actions is None:
         row_actions = []
     if header_actions is None:
         header_actions = []
-        
+
+    paged = page is not None and endpoint is not None
+    container = Div(
+        Input(type="hidden", name="sort", value=page.sort, id="settings-table-sort") if paged else None,
+        Table(
+            TableHeader(
+                TableRow(
+                    TableHead(SortableHead(col1_name, col1_sort, page, endpoint), cls="w-2/5 px-6 py-4 text-sm font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider border-r border-gray-200 dark:border-gray-800 first:rounded-tl-lg"),
+                    TableHead(SortableHead(col2_name, col2_sort, page, endpoint), cls="w-2/5 px-6 py-4 text-sm font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider border-r border-gray-200 dark:border-gray-800"),
+                    TableHead("Actions", cls="w-1/5 px-6 py-4 text-sm font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider rounded-tr-lg") if row_actions else None,
+                ),
+                cls="bg-gray-50 dark:bg-gray-800"
+            ),
+            TableBody(
+                *[SettingsTableRow(item, row_actions) for item in items],
+                cls="divide-y divide-gray-200 dark:divide-gray-800"
+            ),
+            cls="w-full border border-gray-200 dark:border-gray-800 rounded-lg"
+        ) if items else Div(
+            "No items found",
+            cls="text-center py-8 text-gray-500 dark:text-gray-400"
+        ),
+        Pagination(page, total, endpoint) if paged else None,
+        id=TABLE_CONTAINER_ID,
+        cls="w-full bg-white dark:bg-gray-900 shadow rounded-lg overflow-hidden [&_*]:!transition-none"
+    )
+    if partial:
+        return container
+
     return Div(
         Div(
             Div(
                 SettingsHeading(title),
                 Div(
+                    TableSearch(page, endpoint, search_placeholder) if paged else None,
                     *header_actions,
                     cls="flex items-center space-x-2"
-                ) if header_actions else None,
+                ) if header_actions or paged else None,
                 cls="flex justify-between items-center mb-8"
             ),
         ),
-        Div(
-            Table(
-                TableHeader(
-                    TableRow(
-                        TableHead(col1_name, cls="w-2/5 px-6 py-4 text-sm font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider border-r border-gray-200 dark:border-gray-800 first:rounded-tl-lg"),
-                        TableHead(col2_name, cls="w-2/5 px-6 py-4 text-sm font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider border-r border-gray-200 dark:border-gray-800"),
-                        TableHead("Actions", cls="w-1/5 px-6 py-4 text-sm font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider rounded-tr-lg") if row_actions else None,
-                    ),
-                    cls="bg-gray-50 dark:bg-gray-800"
-                ),
-                TableBody(
-                    *[
-                        TableRow(
-                            TableCell(item["col1"], cls="px-6 py-4 text-sm font-medium text-gray-900 dark:text-white border-r border-gray-200 dark:border-gray-800 truncate max-w-0"),
-                            TableCell(item["col2"], cls="px-6 py-4 text-sm text-gray-500 dark:text-gray-400 border-r border-gray-200 dark:border-gray-800"),
-                            TableCell(
-                                *[
-                                    action(item["id"]) if callable(action) else action 
-                                    for action in row_actions
-                                ],
-                                cls="px-6 py-4 space-x-2"
-                            ) if row_actions else None,
-                            cls="bg-white hover:bg-gray-70 dark:bg-gray-900 dark:hover:bg-gray-950",
-                            id=f"row-{item['id']}"
-                        )
-                        for item in items
-                    ],
-                    cls="divide-y divide-gray-200 dark:divide-gray-800"
-                ),
-                cls="w-full border border-gray-200 dark:border-gray-800 rounded-lg"
-            ) if items else Div(
-                "No items found",
-                cls="text-center py-8 text-gray-500 dark:text-gray-400"
-            ),
-            id="settings-table-container",
-            cls="w-full bg-white dark:bg-gray-900 shadow rounded-lg overflow-hidden [&_*]:!transition-none"
-        ),
+        container,
         cls="w-full p-6"
     )
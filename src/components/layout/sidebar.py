@@ -30,15 +30,20 @@ def UserMenu(is_admin=None):
         cls="absolute bottom-12 left-4 right-4 z-10 rounded-[16px] bg-white dark:bg-gray-700 shadow-lg ring-1 ring-black ring-opacity-5 focus:outline-none",
     )
 
+def SidebarUsername(username: str, oob: bool = False):
+    return Span(
+        username,
+        id="sidebar-username",
+        cls="text-base text-black dark:text-white font-medium ml-2",
+        **({"hx-swap-oob": "true"} if oob else {})
+    )
+
 def Sidebar(username=None, content=None, is_admin=False, new_chat_button=False):
     user_display = (
         Div(
             Div(
                 Lucide("circle-user-round", cls="w-6 h-6 dark:brightness-0 dark:invert"),
-                Span(
-                    username,
-                    cls="text-base text-black dark:text-white font-medium ml-2"
-                ),
+                SidebarUsername(username),
                 cls="flex items-center cursor-pointer hover:opacity-80 px-4 py-2",
                 **{"_": "on click toggle .hidden on #user-menu"}
             ),
@@ -1,43 +1,53 @@
-from src.components.layout.settings_table import SettingsTable
+from src.components.layout.settings_table import SettingsTable, SettingsTableRow
 from src.components.common.action_buttons import DeleteButton, EditButton, AddButton
 from components.layout.edit_user_modal import EditUserModal
-from typing import List
+from typing import List, Optional
 from src.services.api.types import User
+from src.services.api.pagination import PageRequest, USER_DEFAULT_SORT
 from fasthtml.components import Div
 
-def UsersSettings(users: List[User] = []):
-    sorted_users = sorted(users,
-        key=lambda u: (
-            "0" if any(role.upper() == "ADMIN" for role in u.roles) else "1",
-            u.username.lower()
-        )
+def create_edit_button(user_id: str):
+    return EditButton(
+        item_id=user_id,
+        endpoint=f"/settings/users/edit"
     )
 
-    table_items = [
-        {
-            "id": user.id,
-            "col1": user.username,
-            "col2": "••••••••",
-        }
-        for user in sorted_users
-    ]
+def delete_button_for(user: User):
+    # Admins cannot be deleted
+    if any(role.upper() == "ADMIN" for role in user.roles):
+        return None
 
-    def create_edit_button(user_id: str):
-        return EditButton(
-            item_id=user_id,
-            endpoint=f"/settings/users/edit"
-        )
+    return DeleteButton(
+        item_id=user.id,
+        endpoint="/api/users",
+        confirm_message="Are you sure you want to delete this user? This cannot be undone."
+    )
+
+def table_item(user: User):
+    return {
+        "id": user.id,
+        "col1": user.username,
+        "col2": "••••••••",
+    }
+
+def UserRow(user: User):
+    return SettingsTableRow(table_item(user), [create_edit_button, lambda _: delete_button_for(user)])
+
+def UsersSettings(users: List[User] = [], page: Optional[PageRequest] = None, total: Optional[int] = None, partial: bool = False):
+    """
+    users holds one page, already sorted and filtered by the backend; total is
+    the number of matching users across all pages.
+    """
+    if page is None:
+        page = PageRequest(page=1, sort=USER_DEFAULT_SORT)
+    if total is None:
+        total = len(users)
+
+    table_items = [table_item(user) for user in users]
 
     def create_delete_button(user_id: str):
         user = next((u for u in users if u.id == user_id), None)
-        if user and any(role.upper() == "ADMIN" for role in user.roles):
-            return None
-
-        return DeleteButton(
-            item_id=user_id,
-            endpoint="/api/users",
-            confirm_message="Are you sure you want to delete this user? This cannot be undone."
-        )
+        return delete_button_for(user) if user else None
 
     header_actions = [
         AddButton(
@@ -46,15 +56,25 @@ def UsersSettings(users: List[User] = []):
         )
     ]
 
+    table = SettingsTable(
+        title="Users Management",
+        col1_name="Username",
+        col2_name="Password",
+        items=table_items,
+        row_actions=[create_edit_button, create_delete_button],
+        header_actions=header_actions,
+        page=page,
+        total=total,
+        endpoint="/settings/users",
+        col1_sort="username",
+        search_placeholder="Search by username or email...",
+        partial=partial
+    )
+    if partial:
+        return table
+
     return Div(
-        SettingsTable(
-            title="Users Management",
-            col1_name="Username",
-            col2_name="Password",
-            items=table_items,
-            row_actions=[create_edit_button, create_delete_button],
-            header_actions=header_actions
-        ),
+        table,
         Div(id="modal"),
         cls="max-w-7xl mx-auto py-6 sm:px-6 lg:px-8"
     )
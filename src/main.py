@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 import sys
@@ -11,8 +12,9 @@ STATIC_DIR = Path(__file__).parent / "static"
 root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
 
-from fasthtml.common import fast_app, serve, Script, FileResponse
+from fasthtml.common import fast_app, serve, Script, Link
 from src.services.api.api import setup_routes
+from src.services.static.assets import AssetIndex, StaticAssetsMiddleware
 
 def run_mock_server():
     from src.services.mock.api import app
@@ -34,19 +36,40 @@ handler.setFormatter(
 logger.addHandler(handler)
 logger.setLevel(getattr(logging, LOG_LEVEL))
 
-connection_settings_js = Script(src="/static/js/connection_settings.js", type="module")
-hyperscript_cdn = Script(src="https://unpkg.com/hyperscript.org@0.9.12")
-llm_selector_js = Script(src="/static/js/llm-selector.js", type="module")
-chat_js = Script(src="/static/js/chat.js", type="module")
-users_settings_js = Script(src="/static/js/users_settings.js", type="module")
-messages_js = Script(src="/static/js/messages.js", type="module")
-modal_js = Script(src="/static/js/modal.js", type="module")
+# Precompiled CSS and vendored scripts, produced by build_assets.py
+MANIFEST_FILE = STATIC_DIR / "manifest.json"
+asset_manifest = json.loads(MANIFEST_FILE.read_text()) if MANIFEST_FILE.exists() else {}
+
+if "css/app.css" in asset_manifest:
+    use_tailwind_cdn = False
+    stylesheets = [Link(rel="stylesheet", href=f"/static/{asset_manifest['css/app.css']}")]
+else:
+    logger.warning("No compiled CSS found, falling back to the Tailwind CDN. Run build_assets.py to build it.")
+    use_tailwind_cdn = True
+    stylesheets = []
+
+if "vendor/_hyperscript.min.js" in asset_manifest:
+    hyperscript_js = Script(src=f"/static/{asset_manifest['vendor/_hyperscript.min.js']}")
+else:
+    hyperscript_js = Script(src="https://unpkg.com/hyperscript.org@0.9.12")
+
+# Static files are served from memory under content-hashed URLs
+asset_index = AssetIndex(STATIC_DIR)
+import_map = Script(asset_index.import_map(), type="importmap")
+connection_settings_js = Script(src=asset_index.url("js/connection_settings.js"), type="module")
+llm_selector_js = Script(src=asset_index.url("js/llm-selector.js"), type="module")
+chat_js = Script(src=asset_index.url("js/chat.js"), type="module")
+users_settings_js = Script(src=asset_index.url("js/users_settings.js"), type="module")
+messages_js = Script(src=asset_index.url("js/messages.js"), type="module")
+modal_js = Script(src=asset_index.url("js/modal.js"), type="module")
 
 app, rt = fast_app(
     pico=False,
     hdrs=(
-        ShadHead(tw_cdn=True, theme_handle=True),
-        hyperscript_cdn,
+        import_map,
+        ShadHead(tw_cdn=use_tailwind_cdn, theme_handle=True),
+        *stylesheets,
+        hyperscript_js,
         connection_settings_js,
         llm_selector_js,
         chat_js,
@@ -56,12 +79,9 @@ app, rt = fast_app(
     )
 )
 
+app.add_middleware(StaticAssetsMiddleware, index=asset_index)
 setup_routes(app, rt)
 
-@rt("/static/{filepath}")
-def serve_static(filepath: str):
-    return FileResponse(STATIC_DIR / filepath)
-
 if __name__ == "__main__":
     use_mock = os.getenv("MOCK_API", "false").lower() == "true"
     if use_mock:
@@ -71,8 +91,27 @@ if __name__ == "__main__":
         logger.info("Mock API server process started")
 
     HOT_RELOAD = os.getenv("HOT_RELOAD", "False").lower() == "true"
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+    GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
     try:
-        serve(port=7860, reload=HOT_RELOAD)
+        if WEB_WORKERS > 1 and not HOT_RELOAD:
+            import uvicorn
+            # Each worker imports this module on its own, so caches and the
+            # API client are per worker and nothing is shared across processes
+            logger.info(f"Starting {WEB_WORKERS} workers")
+            logger.warning(
+                "Chat streams and bulk imports are kept by the worker that started them; "
+                "resuming or polling them from another worker fails. See the README."
+            )
+            uvicorn.run(
+                "main:app",
+                host="0.0.0.0",
+                port=7860,
+                workers=WEB_WORKERS,
+                timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+            )
+        else:
+            serve(port=7860, reload=HOT_RELOAD)
     finally:
         if use_mock:
             logger.info("Shutting down mock API server...")
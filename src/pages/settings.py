@@ -1,4 +1,3 @@
-import json
 from fasthtml.components import Div, H1, A
 from src.components.layout.sidebar import Sidebar
 from src.components.layout.chat_history_settings import ChatHistorySettings
@@ -8,7 +7,7 @@ from src.components.layout.users_settings import UsersSettings
 from fastapi import Request
 from lucide_fasthtml import Lucide
 from src.components.layout.users_settings import UsersSettings
-from src.components.common.message_card import MessageCard
+from src.components.common.message_card import Notifications
 
 def BackButton():
     return Div(
@@ -76,10 +75,9 @@ async def Settings(
     success_messages: list[str] = [],
     error_messages: list[str] = [],
 ):
-    user = request.session.get("user")
-    user = json.loads(user)
-    username = user.get("username")
-    is_admin = "ADMIN".upper() in [role.upper() for role in user.get("roles", [])]
+    user = request.state.user
+    username = user.username
+    is_admin = user.is_admin
 
     if section == "users" and not is_admin:
         return Div("Access denied. Admin privileges required.", cls="p-6 text-red-500")
@@ -99,21 +97,8 @@ async def Settings(
 
     settings_content = GetSettingsContent(section, is_admin)
 
-    notifications_container = None
-    if error_messages or success_messages:
-        notifications = []
-        for msg in error_messages or []:
-            notifications.append(MessageCard(message=msg, message_type="error"))
-        for msg in success_messages or []:
-            notifications.append(MessageCard(message=msg, message_type="success"))
-
-        notifications_container = Div(
-            *notifications,
-            cls="fixed top-0 right-0 z-50 flex flex-col gap-4 p-4"
-        )
-
     return Div(
-        notifications_container,
+        Notifications(success_messages=success_messages, error_messages=error_messages),
         Div(
             Sidebar(username=username, content=settings_content, is_admin=is_admin),
             Div(content, cls="ml-80 p-6 flex-1"),
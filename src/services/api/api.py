@@ -5,27 +5,59 @@ from fastapi.responses import StreamingResponse, JSONResponse
 from pages.chat import Chat
 from pages.settings import Settings
 from src.pages.login import LoginPage
-from src.services.api.middleware import login_required
+from src.services.api.middleware import login_required, mark_session_expired
 from src.services.api.client import VespaAgentClient
+from src.services.api.sse import EVENT_CONVERSATION, format_event
 from src.services.config.config_service import ConfigService
-from fasthtml.common import Redirect
+from fasthtml.common import Redirect, HtmxResponseHeaders
 from src.components.layout.chat_history import ChatHistory
+from src.components.layout.chat_messages import MessageHistory, group_messages
 from src.components.layout.chat_history_settings import ChatHistorySettings
 from src.components.layout.connection_settings import ConnectionSettings
-from src.components.layout.knowledge_base_settings import KnowledgeBaseSettings
-from src.components.layout.users_settings import UsersSettings
-from src.services.api.types import ErrorResponse, LLMsResponse
+from src.components.layout.knowledge_base_settings import KnowledgeBaseSettings, KnowledgeBaseRow
+from src.components.layout.users_settings import UsersSettings, UserRow
+from src.components.layout.sidebar import SidebarUsername
+from src.components.common.message_card import Notifications
+from src.components.layout.settings_table import TABLE_CONTAINER_ID, Pagination, TableError
+from src.services.api.pagination import (
+    PageRequest,
+    paginate,
+    KNOWLEDGE_BASE_SORT_KEYS,
+    KNOWLEDGE_BASE_DEFAULT_SORT,
+    USER_SORT_KEYS,
+    USER_DEFAULT_SORT,
+    CONVERSATION_SORT_KEYS,
+    CONVERSATION_DEFAULT_SORT,
+)
+from src.services.api.types import ErrorResponse, LLMsResponse, KnowledgeBasesResponse, UsersResponse, ConversationsResponse
 from components.layout.edit_user_modal import EditUserModal
 from components.layout.knowledge_base_modal import KnowledgeBaseModal
-from typing import Any
-import logging
+from src.components.layout.bulk_import_progress import BulkImportProgress
+from src.services.jobs.bulk_import import BulkImportManager
+from src.services.jobs.chat_streams import ChatStreamManager, parse_event_id
+from src.services.jobs.csv_stream import open_knowledge_base_csv
+import asyncio
 import json
-import csv
-import io
-from typing import List, Dict
+import logging
+import os
+import signal
+import threading
+from urllib.parse import urlsplit
+from typing import Any, List, Optional, Tuple
 
 logger = logging.getLogger("vespa_app")
 
+# Failed rows listed individually when a bulk import finishes
+MAX_REPORTED_IMPORT_ERRORS = 10
+# Messages fetched per page of a conversation's history
+CHAT_MESSAGES_PAGE_SIZE = int(os.getenv("CHAT_MESSAGES_PAGE_SIZE", "50"))
+
+# Seconds between SIGTERM and the server closing its socket, during which
+# /health/ready already fails so load balancers stop sending new requests
+SHUTDOWN_DRAIN_DELAY = float(os.getenv("SHUTDOWN_DRAIN_DELAY", "5"))
+
+STREAM_GONE_MESSAGE = "The answer can no longer be resumed. Reload the conversation to see it."
+
 def setup_routes(app, rt):
     app.add_middleware(
         CORSMiddleware,
@@ -36,7 +68,103 @@ def setup_routes(app, rt):
     )
 
     app.config_service = ConfigService()
-    app.client = VespaAgentClient(app.config_service)
+    app.client = None
+    app.ready = False
+
+    def is_table_request(request: Request) -> bool:
+        """Whether HTMX asked for just the settings table (page, sort or search change)."""
+        return request.headers.get("HX-Target") == TABLE_CONTAINER_ID
+
+    async def refreshed_pagination(request: Request, endpoint: str, fetch_page):
+        """
+        The footer of the settings table at `endpoint` with its counts brought
+        up to date, to swap in after a row was deleted from it. None if the
+        request did not come from that table.
+        """
+        current_url = request.headers.get("HX-Current-URL")
+        if not current_url or urlsplit(current_url).path != endpoint:
+            return None
+        try:
+            response, page = await fetch_page(request, request.state.user.token)
+        except Exception as e:
+            logger.error(f"Error refreshing the pagination of {endpoint}: {str(e)}")
+            return None
+        if isinstance(response, ErrorResponse) or response.total is None:
+            return None
+        return Pagination(page, response.total, endpoint, oob=True)
+
+    async def fetch_knowledge_bases_page(request: Request, token: str):
+        page = PageRequest.from_request(request, KNOWLEDGE_BASE_SORT_KEYS, KNOWLEDGE_BASE_DEFAULT_SORT)
+        response = await app.client.get_knowledge_bases(
+            token, offset=page.offset, limit=page.page_size, sort=page.sort, query=page.query
+        )
+        if isinstance(response, KnowledgeBasesResponse) and not response.knowledgeBases and response.total and page.page > 1:
+            # The page ran empty, e.g. its last row was deleted; show the last one left
+            page = page.last_page(response.total)
+            response = await app.client.get_knowledge_bases(
+                token, offset=page.offset, limit=page.page_size, sort=page.sort, query=page.query
+            )
+        return response, page
+
+    async def fetch_users_page(request: Request, token: str):
+        page = PageRequest.from_request(request, USER_SORT_KEYS, USER_DEFAULT_SORT)
+        response = await app.client.get_users(
+            token, offset=page.offset, limit=page.page_size, sort=page.sort, query=page.query
+        )
+        if isinstance(response, UsersResponse) and not response.users and response.total and page.page > 1:
+            page = page.last_page(response.total)
+            response = await app.client.get_users(
+                token, offset=page.offset, limit=page.page_size, sort=page.sort, query=page.query
+            )
+        return response, page
+
+    async def fetch_message_bubbles(conversation_id: str, token: str, before: Optional[str] = None):
+        """
+        Fetch the messages older than `before` (the newest ones if unset) and
+        group them into bubbles, oldest first.
+        The oldest bubble of a page may go on in the next one, so it is held
+        back for the page that completes it. Returns (backend response,
+        bubbles, cursor for the next older page or None).
+        """
+        messages = []
+        while True:
+            response = await app.client.get_conversation_messages(
+                conversation_id, token, before=before, limit=CHAT_MESSAGES_PAGE_SIZE
+            )
+            if isinstance(response, ErrorResponse):
+                return response, [], None
+
+            messages.extend(response.messages)
+            if not response.hasMore:
+                return response, group_messages(reversed(messages)), None
+
+            cut = len(messages)
+            while cut > 0 and messages[cut - 1].senderType == messages[-1].senderType:
+                cut -= 1
+            if cut > 0:
+                kept = messages[:cut]
+                return response, group_messages(reversed(kept)), kept[-1].messageId
+            # The whole page is one bubble; keep reading until it ends
+            before = messages[-1].messageId
+
+    async def fetch_conversations_page(request: Request, token: str):
+        """The conversation list is cached whole by the client, so it is paged here."""
+        page = PageRequest.from_request(request, CONVERSATION_SORT_KEYS, CONVERSATION_DEFAULT_SORT)
+        response = await app.client.get_conversations(token)
+        if isinstance(response, ErrorResponse):
+            return response, page
+
+        def slice_page(page: PageRequest):
+            return paginate(
+                response.conversations, page.offset, page.page_size, page.sort, CONVERSATION_SORT_KEYS, page.query,
+                search=lambda conversation: conversation.title
+            )
+
+        conversations, total = slice_page(page)
+        if not conversations and total and page.page > 1:
+            page = page.last_page(total)
+            conversations, total = slice_page(page)
+        return ConversationsResponse(conversations=conversations, total=total), page
 
     @rt("/login")
     async def get_login(request : Request):
@@ -74,27 +202,12 @@ def setup_routes(app, rt):
         content = None
         llm_options = None
         try:
-            user = request.session.get("user")
-            user_json = json.loads(user)
-            token = user_json.get("token")
+            user = request.state.user
+            token = user.token
 
-            conversations_response = await request.app.client.get_conversations(
-                token=token
+            _, content, llm_options = await _load_chat_page(
+                request, token, error_messages
             )
-            if error_response := get_error_response(conversations_response):
-                logger.error(f"Error getting conversations: {error_response}")
-                error_messages.append(error_response.message)
-            else:
-                content = ChatHistory(
-                    conversations=conversations_response.conversations
-                )
-
-            llms = await request.app.client.get_llms(token)
-            if error_response := get_error_response(llms):
-                logger.error(f"Error getting LLMs: {error_response}")
-                error_messages.append(error_response.message)
-            else:
-                llm_options = _parse_llm_options(request, llms)
         except Exception as e:
             logger.error(f"Error preparing chat page: {e}")
             error_messages.append("Failed to prepare the chat page. Please try again later.")
@@ -111,39 +224,23 @@ def setup_routes(app, rt):
     async def conversation(request: Request, conversation_id: str):
         error_messages = []
         content = None
-        conversation_result = None
+        history = None
+        streaming = None
         llm_options = None
         try:
-            user = request.session.get("user")
-            user_json = json.loads(user)
-            token = user_json.get("token")
-
-            response = await app.client.get_conversation(conversation_id, token)
-            if error_response := get_error_response(response):
-                logger.error(f"Error getting conversation {conversation_id}: {error_response}")
-                conversation_result = None
-                error_messages.append(error_response.message)
-            else:
-                conversation_result = response
-
-            conversations_response = await request.app.client.get_conversations(
-                token=token
+            user = request.state.user
+            token = user.token
+
+            # An answer still being generated, e.g. in another tab, is followed
+            # live by the page instead of being shown as it was so far, unless
+            # its start has already been dropped from the replay buffer
+            streaming = app.chat_streams.active(conversation_id, user.id)
+            if streaming and not streaming.can_resume_after(-1):
+                streaming = None
+            history, content, llm_options = await _load_chat_page(
+                request, token, error_messages, conversation_id=conversation_id,
+                streaming_text=streaming.text if streaming else None
             )
-            if error_response := get_error_response(conversations_response):
-                logger.error(f"Error getting conversations: {error_response}")
-                content = None
-                error_messages.append(error_response.message)
-            else:
-                content = ChatHistory(
-                    conversations=conversations_response.conversations
-                )
-
-            llms = await request.app.client.get_llms(token)
-            if error_response := get_error_response(llms):
-                logger.error(f"Error getting LLMs: {error_response}")
-                error_messages.append(error_response.message)
-            else:
-                llm_options = _parse_llm_options(request, llms)
         except Exception as e:
             logger.error(f"Error loading conversation {conversation_id}: {str(e)}")
             error_messages.append("Failed to prepare the chat page. Please try again later.")
@@ -152,10 +249,30 @@ def setup_routes(app, rt):
             user=user,
             llm_options=llm_options,
             content=content,
-            conversation=conversation_result,
+            conversation_id=conversation_id if history is not None else None,
+            history=history,
+            streaming_text=streaming.text if streaming and history is not None else None,
             error_messages=error_messages if error_messages else None
         )
 
+    @rt("/api/conversations/{conversation_id}/messages", methods=["GET"])
+    @login_required
+    async def conversation_messages(request: Request, conversation_id: str):
+        """Older messages of a conversation, requested as the user scrolls up."""
+        user = request.state.user
+        before = request.query_params.get("before")
+
+        try:
+            response, bubbles, older_cursor = await fetch_message_bubbles(conversation_id, user.token, before)
+        except Exception as e:
+            logger.error(f"Error loading messages of conversation {conversation_id}: {str(e)}")
+            return notify(error_messages=["Failed to load older messages"])
+
+        if error_response := get_error_response(response):
+            return notify(error_messages=[error_response.message])
+
+        return MessageHistory(conversation_id, bubbles, older_cursor)
+
     @rt("/api/set-llm", methods=["POST"])
     async def set_llm(request: Request):
         data = await request.json()
@@ -174,89 +291,128 @@ def setup_routes(app, rt):
         message = request.query_params.get("message")
         return Redirect(f"/login?message={message}")
 
-    @rt("/api/chat", methods=["POST", "GET"])
+    @rt("/api/chat", methods=["POST"])
     @login_required
     async def chat(request: Request):
+        """
+        Send one chat turn and stream the answer back as SSE. The prompt comes
+        in the form body. Without a conversation_id a conversation is created
+        first and its id sent ahead of the answer in a "conversation" event.
+        """
         llm_id = request.session.get("selected-llm")
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
-        conversation_id = request.query_params.get("conversation_id")
-
-        # We make a POST first to create the conversation if it doesn't exist
-        if request.method == "POST":
+        user = request.state.user
+        token = user.token
+
+        form = await request.form()
+        text = form.get("text")
+        conversation_id = form.get("conversation_id")
+        if not text:
+            return JSONResponse({"status": "error", "message": "No text provided"}, status_code=400)
+        if not llm_id:
+            return JSONResponse({"status": "error", "message": "No LLM selected"}, status_code=400)
+
+        created = not conversation_id
+        if created:
             try:
-                form = await request.form()
-                text = form.get("text")
-                if not text:
-                    return {"status": "error", "message": "No text provided"}, 400
-                if not llm_id:
-                    return {"status": "error", "message": "No LLM selected"}, 400
-
-                if not conversation_id:
-                    # Create new conversation if none exists
-                    response = await app.client.create_conversation(token)
-                    if error_response := get_error_response(response):
-                        logger.error(f"Error creating conversation: {error_response}")
-                        return {"status": "error", "message": "Failed to create conversation"}, 500
-
-                    conversation_id = response.conversationId
-                    return {
-                        "status": "success",
-                        "conversation_id": conversation_id,
-                        "initial_text": text
-                    }
-
-                return {"status": "success"}
+                response = await app.client.create_conversation(token)
             except Exception as e:
                 logger.error(f"Error creating conversation: {str(e)}")
-                return {"status": "error", "message": "Failed to create conversation"}, 500
-        # Then we make a GET to stream the conversation
-        elif request.method == "GET":
-            text = request.query_params.get("text")
-            if not text:
-                return {"status": "error", "message": "No text provided"}, 400
-            if not llm_id:
-                return {"status": "error", "message": "No LLM selected"}, 400
-            if not conversation_id:
-                return {"status": "error", "message": "No conversation ID provided"}, 400
+                return JSONResponse({"status": "error", "message": "Failed to create conversation"}, status_code=500)
+            if error_response := get_error_response(response):
+                logger.error(f"Error creating conversation: {error_response}")
+                return JSONResponse({"status": "error", "message": "Failed to create conversation"}, status_code=500)
+            conversation_id = response.conversationId
+
+        preamble = [
+            format_event(EVENT_CONVERSATION, json.dumps({"conversationId": conversation_id}))
+        ] if created else []
+        stream = app.chat_streams.start(conversation_id, user.id, llm_id, text, token, preamble)
+        if stream is None:
+            return JSONResponse(
+                {"status": "error", "message": "An answer is still being generated for this conversation"},
+                status_code=409
+            )
+        # Attached to an answer too long to be replayed from its start
+        if not stream.can_resume_after(-1):
+            return JSONResponse({"status": "error", "message": STREAM_GONE_MESSAGE}, status_code=410)
+
+        logger.debug(f"Starting SSE stream {stream.id}")
+        return StreamingResponse(
+            stream.subscribe(is_disconnected=request.is_disconnected),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
 
-            try:
-                logger.debug("Starting SSE stream")
-                return StreamingResponse(
-                    app.client.stream_conversation(
-                        llm_id=llm_id,
-                        text=text,
-                        token=token,
-                        conversation_id=conversation_id
-                    ),
-                    media_type="text/event-stream"
-                )
-            except Exception as e:
-                logger.error(f"Error creating conversation: {str(e)}")
-                return {"status": "error", "message": "Failed to create conversation"}, 500
+    @rt("/api/conversations/{conversation_id}/stream", methods=["GET"])
+    @login_required
+    async def resume_chat_stream(request: Request, conversation_id: str):
+        """
+        Reconnect to the answer being streamed for a conversation. Frames after
+        the Last-Event-ID are replayed from the buffer, then live ones follow;
+        the LLM is not asked again.
+        """
+        user = request.state.user
+        stream = app.chat_streams.get(conversation_id, user.id)
+        if stream is None:
+            return JSONResponse(
+                {"status": "error", "message": "No answer is being streamed for this conversation"},
+                status_code=404
+            )
+
+        last_event_id = parse_event_id(
+            request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        )
+        # Without an id the client has seen nothing of this answer yet
+        turn_id, after = last_event_id or (stream.id, -1)
+        if turn_id != stream.id or not stream.can_resume_after(after):
+            return JSONResponse({"status": "error", "message": STREAM_GONE_MESSAGE}, status_code=410)
+
+        logger.debug(f"Resuming SSE stream {stream.id} after frame {after}")
+        return StreamingResponse(
+            stream.subscribe(after, is_disconnected=request.is_disconnected),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
 
     @rt("/settings/chat-history")
     @login_required
     async def chat_history_settings(request: Request):
         try:
-            user = request.session.get("user")
-            user = json.loads(user)
-            token = user.get("token")
-            username = user.get("username")
+            user = request.state.user
+            token = user.token
+            username = user.username
+
+            conversations_response, page = await fetch_conversations_page(request, token)
+            if error_response := get_error_response(conversations_response):
+                if is_table_request(request):
+                    return TableError(error_response.message)
+                return await Settings(
+                    request,
+                    "chat-history",
+                    error_messages=[error_response.message]
+                )
+
+            if is_table_request(request):
+                return ChatHistorySettings(
+                    conversations=conversations_response.conversations,
+                    page=page,
+                    total=conversations_response.total,
+                    partial=True
+                )
 
-            conversations_response = await request.app.client.get_conversations(
-                token=token
-            )
             return await Settings(
                 request,
                 "chat-history",
                 content=ChatHistorySettings(
-                    conversations=conversations_response.conversations
+                    conversations=conversations_response.conversations,
+                    page=page,
+                    total=conversations_response.total
                 )
             )
         except Exception as e:
             logger.error(f"Error fetching conversations for user {username}: {str(e)}")
+            if is_table_request(request):
+                return TableError("Failed to load conversations. Please try again later.")
             return await Settings(
                 request,
                 "chat-history",
@@ -266,9 +422,8 @@ def setup_routes(app, rt):
     @rt("/settings/connection-settings")
     @login_required
     async def connection_settings(request: Request):
-        user = request.session.get("user")
-        user = json.loads(user)
-        if not any(role.upper() == "ADMIN" for role in user.get("roles", [])):
+        user = request.state.user
+        if not user.is_admin:
             logger.warning(f"Non-admin user tried to access connection settings: {user}")
             return await Settings(
                 request,
@@ -287,16 +442,11 @@ def setup_routes(app, rt):
     @login_required
     async def delete_conversation(request: Request, conversation_id: str):
         client = request.app.client
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         if not token:
-            return await Settings(
-                request,
-                "chat-history",
-                error_messages=["Authentication required"]
-            )
+            return mutation_failed("Authentication required")
 
         try:
             response = await client.delete_conversation(
@@ -305,76 +455,42 @@ def setup_routes(app, rt):
             )
 
             if error_response := get_error_response(response):
-                return await Settings(
-                    request,
-                    "chat-history",
-                    error_messages=[error_response.message]
-                )
-
-            conversations_response = await client.get_conversations(token)
-            if error_response := get_error_response(conversations_response):
-                return await Settings(
-                    request,
-                    "chat-history",
-                    error_messages=[error_response.message]
-                )
+                return mutation_failed(error_response.message)
 
-            return await Settings(
-                request,
-                "chat-history",
-                content=ChatHistorySettings(
-                    conversations=conversations_response.conversations
-                ),
-                success_messages=["Conversation deleted successfully"]
+            # The empty response removes the row
+            return (
+                notify(success_messages=["Conversation deleted successfully"]),
+                await refreshed_pagination(request, "/settings/chat-history", fetch_conversations_page)
             )
 
         except Exception as e:
             logger.error(f"Error deleting conversation {conversation_id}: {str(e)}")
-            return await Settings(
-                request,
-                "chat-history",
-                error_messages=["Error deleting conversation"]
-            )
+            return mutation_failed("Error deleting conversation")
 
     @rt("/api/conversations/delete/all", methods=["DELETE"])
     @login_required
     async def delete_all_conversations(request: Request):
         client = request.app.client
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         if not token:
-            return await Settings(
-                request,
-                "chat-history",
-                error_messages=["Authentication required"]
-            )
+            return mutation_failed("Authentication required")
 
         try:
             response = await client.delete_all_conversations(token=token)
 
             if error_response := get_error_response(response):
-                return await Settings(
-                    request,
-                    "chat-history",
-                    error_messages=[error_response.message]
-                )
+                return mutation_failed(error_response.message)
 
-            return await Settings(
-                request,
-                "chat-history",
-                content=ChatHistorySettings(conversations=[]),
-                success_messages=["All conversations deleted successfully"]
+            return (
+                ChatHistorySettings(conversations=[], partial=True),
+                notify(success_messages=["All conversations deleted successfully"])
             )
 
         except Exception as e:
             logger.error(f"Error deleting all conversations: {str(e)}")
-            return await Settings(
-                request,
-                "chat-history",
-                error_messages=[str(e)]
-            )
+            return mutation_failed(str(e))
 
     @rt("/api/config/connection-endpoint", methods=["GET"])
     @login_required
@@ -395,7 +511,7 @@ def setup_routes(app, rt):
         try:
             form_data = await request.form()
             endpoint = form_data.get("endpoint", "")
-            request.app.config_service.update_connection_endpoint(endpoint)
+            await request.app.config_service.update_connection_endpoint(endpoint)
             await request.app.client.update_base_url()
             return await Settings(
                 request,
@@ -415,11 +531,10 @@ def setup_routes(app, rt):
     @rt("/settings/users")
     @login_required
     async def users_settings(request: Request):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
-        if "ADMIN" not in [role.upper() for role in user.get("roles", [])]:
+        if not user.is_admin:
             logger.warning(f"Non-admin user tried to access users settings: {user}")
             return await Settings(
                 request,
@@ -428,23 +543,32 @@ def setup_routes(app, rt):
             )
 
         try:
-            users_response = await app.client.get_users(token)
+            users_response, page = await fetch_users_page(request, token)
             if error_response := get_error_response(users_response):
+                if is_table_request(request):
+                    return TableError(error_response.message)
                 return await Settings(
                     request,
                     "users",
                     error_messages=[error_response.message]
                 )
 
+            if is_table_request(request):
+                return UsersSettings(users=users_response.users, page=page, total=users_response.total, partial=True)
+
             return await Settings(
                 request,
                 "users",
                 content=UsersSettings(
-                    users=users_response.users
+                    users=users_response.users,
+                    page=page,
+                    total=users_response.total
                 )
             )
         except Exception as e:
             logger.error(f"Error fetching users: {str(e)}")
+            if is_table_request(request):
+                return TableError("Failed to load users. Please try again later.")
             return await Settings(
                 request,
                 "users",
@@ -455,16 +579,11 @@ def setup_routes(app, rt):
     @login_required
     async def delete_user(request: Request, user_id: str):
         try:
-            user = request.session.get("user")
-            user = json.loads(user)
-            token = user.get("token")
+            user = request.state.user
+            token = user.token
 
-            if "ADMIN" not in [role.upper() for role in user.get("roles", [])]:
-                return await Settings(
-                    request,
-                    "users",
-                    error_messages=["Admin privileges required"]
-                )
+            if not user.is_admin:
+                return mutation_failed("Admin privileges required")
 
             response = await app.client.delete_user(
                 user_id=user_id,
@@ -472,42 +591,23 @@ def setup_routes(app, rt):
             )
 
             if error_response := get_error_response(response):
-                return await Settings(
-                    request,
-                    "users",
-                    error_messages=[error_response.message]
-                )
-
-            users_response = await app.client.get_users(token=token)
-            if error_response := get_error_response(users_response):
-                return await Settings(
-                    request,
-                    "users",
-                    error_messages=[error_response.message]
-                )
+                return mutation_failed(error_response.message)
 
-            return await Settings(
-                request,
-                "users",
-                content=UsersSettings(users=users_response.users),
-                success_messages=[response.message]
+            return (
+                notify(success_messages=[response.message]),
+                await refreshed_pagination(request, "/settings/users", fetch_users_page)
             )
         except Exception as e:
             logger.error(f"Error deleting user: {str(e)}")
-            return await Settings(
-                request,
-                "users",
-                error_messages=["Failed to delete user"]
-            )
+            return mutation_failed("Failed to delete user")
 
     @rt("/settings/users/edit/{user_id}")
     @login_required
     async def get_edit_user(request: Request, user_id: str):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
-        if "ADMIN" not in [role.upper() for role in user.get("roles", [])]:
+        if not user.is_admin:
             return await Settings(
                 request,
                 "users",
@@ -526,7 +626,7 @@ def setup_routes(app, rt):
                     error_messages=[error_response.message]
                 )
 
-            return EditUserModal(user=response.model_dump(), current_user_id=user.get("id"))
+            return EditUserModal(user=response.model_dump(), current_user_id=user.id)
         except Exception as e:
             logger.error(f"Error fetching user: {str(e)}")
             return await Settings(
@@ -538,16 +638,11 @@ def setup_routes(app, rt):
     @rt("/api/users/edit/{user_id}", methods=["POST"])
     @login_required
     async def edit_user(request: Request, user_id: str):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
-        if "ADMIN" not in [role.upper() for role in user.get("roles", [])]:
-            return await Settings(
-                request,
-                "users",
-                error_messages=["Admin privileges required"]
-            )
+        if not user.is_admin:
+            return mutation_failed("Admin privileges required")
 
         try:
             form_data = await request.form()
@@ -569,56 +664,36 @@ def setup_routes(app, rt):
 
             if error_response := get_error_response(response):
                 logger.error(f"Error from edit_user endpoint: {error_response.message}")
+                return mutation_failed(error_response.message)
 
-                users_response = await app.client.get_users(token=token)
-                if error_response_2 := get_error_response(users_response):
-                    return await Settings(
-                        request,
-                        "users",
-                        error_messages=[error_response.message, error_response_2.message]
-                    )
-                else:
-                    return await Settings(
-                        request,
-                        "users",
-                        content=UsersSettings(users=users_response.users),
-                        error_messages=[error_response.message]
-                    )
-
-            user["username"] = user_data["username"]
-            if user_id == user.get("id"):
-                request.session["user"] = json.dumps({**user})
+            sidebar_username = None
+            if user_id == user.id:
+                user = user.with_username(user_data["username"])
+                request.state.user = user
+                request.session["user"] = user.to_session()
                 request.session["token"] = f"mock_token_{user_data['username']}"
+                sidebar_username = SidebarUsername(user.username, oob=True)
 
-            users_response = await app.client.get_users(token=token)
-            if error_response := get_error_response(users_response):
-                return await Settings(
-                    request,
-                    "users",
-                    error_messages=[error_response.message]
-                )
+            # Re-read only the edited user to render its row
+            user_response = await app.client.get_user(user_id=user_id, token=token)
+            if error_response := get_error_response(user_response):
+                return mutation_failed(f"User updated but failed to refresh it: {error_response.message}")
 
-            return await Settings(
-                request,
-                "users",
-                content=UsersSettings(users=users_response.users),
-                success_messages=[response.message]
+            return (
+                UserRow(user_response),
+                sidebar_username,
+                notify(success_messages=[response.message])
             )
 
         except Exception as e:
             logger.error(f"Error editing user: {str(e)}")
-            return await Settings(
-                request,
-                "users",
-                error_messages=["Failed to update user"]
-            )
+            return mutation_failed("Failed to update user")
 
     @rt("/settings/users/new")
     @login_required
     async def new_user(request: Request):
-        user = request.session.get("user")
-        user = json.loads(user)
-        if "ADMIN" not in [role.upper() for role in user.get("roles", [])]:
+        user = request.state.user
+        if not user.is_admin:
             return await Settings(
                 request,
                 "users",
@@ -629,16 +704,11 @@ def setup_routes(app, rt):
     @rt("/api/users/new", methods=["POST"])
     @login_required
     async def create_user(request: Request):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
-        if "ADMIN" not in [role.upper() for role in user.get("roles", [])]:
-            return await Settings(
-                request,
-                "users",
-                error_messages=["Admin privileges required"]
-            )
+        if not user.is_admin:
+            return mutation_failed("Admin privileges required")
 
         try:
             form_data = await request.form()
@@ -658,69 +728,60 @@ def setup_routes(app, rt):
 
             if error_response := get_error_response(response):
                 logger.error(f"Error from create_user endpoint: {error_response.message}")
-                users_response = await app.client.get_users(token=token)
-                if error_response_2 := get_error_response(users_response):
-                    return await Settings(
-                        request,
-                        "users",
-                        error_messages=[error_response.message, error_response_2.message]
-                    )
-                else:
-                    return await Settings(
-                        request,
-                        "users",
-                        content=UsersSettings(users=users_response.users),
-                        error_messages=[error_response.message]
-                    )
-
-            users_response = await app.client.get_users(token=token)
+                return mutation_failed(error_response.message)
+
+            # Reload the current page of the table, where the new user may now appear
+            users_response, page = await fetch_users_page(request, token)
             if error_response := get_error_response(users_response):
-                return await Settings(
-                    request,
-                    "users",
-                    error_messages=[error_response.message]
-                )
+                return mutation_failed(f"User created but failed to refresh the list: {error_response.message}")
 
-            return await Settings(
-                request,
-                "users",
-                content=UsersSettings(users=users_response.users),
-                success_messages=[response.message]
+            return (
+                UsersSettings(users=users_response.users, page=page, total=users_response.total, partial=True),
+                notify(success_messages=[response.message])
             )
 
         except Exception as e:
             logger.error(f"Error creating user: {str(e)}")
-            return await Settings(
-                request,
-                "users",
-                error_messages=["Failed to create user"]
-            )
+            return mutation_failed("Failed to create user")
 
     @rt("/settings/knowledge-base")
     @login_required
     async def knowledge_bases_settings(request: Request):
         try:
-            user = request.session.get("user")
-            user = json.loads(user)
-            token = user.get("token")
+            user = request.state.user
+            token = user.token
 
-            knowledge_bases_response = await app.client.get_knowledge_bases(token)
+            knowledge_bases_response, page = await fetch_knowledge_bases_page(request, token)
             if error_response := get_error_response(knowledge_bases_response):
+                if is_table_request(request):
+                    return TableError(error_response.message)
                 return await Settings(
                     request,
                     "knowledge-base",
                     error_messages=[error_response.message]
                 )
 
+            if is_table_request(request):
+                return KnowledgeBaseSettings(
+                    knowledge_bases=knowledge_bases_response.knowledgeBases,
+                    page=page,
+                    total=knowledge_bases_response.total,
+                    partial=True
+                )
+
             return await Settings(
                 request,
                 "knowledge-base",
                 content=KnowledgeBaseSettings(
-                    knowledge_bases=knowledge_bases_response.knowledgeBases
+                    knowledge_bases=knowledge_bases_response.knowledgeBases,
+                    page=page,
+                    total=knowledge_bases_response.total
                 )
             )
         except Exception as e:
             logger.error(f"Error fetching knowledge bases: {str(e)}")
+            if is_table_request(request):
+                return TableError("Failed to load knowledge bases. Please try again later.")
             return await Settings(
                 request,
                 "knowledge-base",
@@ -733,65 +794,72 @@ def setup_routes(app, rt):
     @rt("/api/knowledge-base/{kb_id}", methods=["DELETE"])
     @login_required
     async def delete_knowledge_base(request: Request, kb_id: str):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         if not token:
-            return await Settings(
-                request,
-                "knowledge-base",
-                error_messages=["Authentication required"]
-            )
+            return mutation_failed("Authentication required")
 
         try:
             response = await app.client.delete_knowledge_bases(kb_id, token)
             if error_response := get_error_response(response):
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=[error_response.message]
-                )
-
-            try:
-                knowledge_bases_response = await app.client.get_knowledge_bases(token)
-                if error_response := get_error_response(knowledge_bases_response):
-                    return await Settings(
-                        request,
-                        "knowledge-base",
-                        error_messages=[error_response.message]
-                    )
+                return mutation_failed(error_response.message)
 
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    content=KnowledgeBaseSettings(
-                        knowledge_bases=knowledge_bases_response.knowledgeBases
-                    ),
-                    success_messages=["Knowledge base deleted successfully"]
-                )
-            except Exception as e:
-                logger.error(f"Error fetching knowledge bases after delete: {str(e)}")
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=["Knowledge base deleted but failed to refresh the list"]
-                )
+            return (
+                notify(success_messages=["Knowledge base deleted successfully"]),
+                await refreshed_pagination(request, "/settings/knowledge-base", fetch_knowledge_bases_page)
+            )
 
         except Exception as e:
             logger.error(f"Error deleting knowledge base: {str(e)}")
-            return await Settings(
-                request,
-                "knowledge-base",
-                error_messages=[f"Failed to delete knowledge base: {str(e)}"]
+            return mutation_failed(f"Failed to delete knowledge base: {str(e)}")
+
+    @rt("/api/knowledge-base/delete/all", methods=["DELETE"])
+    @login_required
+    async def delete_all_knowledge_bases(request: Request):
+        user = request.state.user
+        token = user.token
+
+        if not token:
+            return mutation_failed("Authentication required")
+
+        try:
+            knowledge_bases_response = await app.client.get_knowledge_bases(token)
+            if error_response := get_error_response(knowledge_bases_response):
+                return mutation_failed(error_response.message)
+
+            kb_ids = [kb.id for kb in knowledge_bases_response.knowledgeBases]
+            response = await app.client.delete_knowledge_bases_batch(kb_ids, token)
+            if error_response := get_error_response(response.error):
+                return mutation_failed(error_response.message)
+            failed = [item for item in response.results if item.status != "success"]
+
+            knowledge_bases_response, page = await fetch_knowledge_bases_page(request, token)
+            if error_response := get_error_response(knowledge_bases_response):
+                return mutation_failed(error_response.message)
+
+            table = KnowledgeBaseSettings(
+                knowledge_bases=knowledge_bases_response.knowledgeBases,
+                page=page,
+                total=knowledge_bases_response.total,
+                partial=True
             )
+            if failed:
+                logger.error(f"{len(failed)} of {len(kb_ids)} knowledge bases could not be deleted: {failed[0].message}")
+                return table, notify(error_messages=[
+                    f"{len(failed)} of {len(kb_ids)} knowledge bases could not be deleted: {failed[0].message}"
+                ])
+            return table, notify(success_messages=["All knowledge bases deleted successfully"])
+
+        except Exception as e:
+            logger.error(f"Error deleting all knowledge bases: {str(e)}")
+            return mutation_failed(f"Failed to delete knowledge bases: {str(e)}")
 
     @rt("/settings/knowledge-base/edit/{kb_id}")
     @login_required
     async def get_edit_knowledge_base(request: Request, kb_id: str):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         try:
             response = await app.client.get_knowledge_base(kb_id, token)
@@ -812,16 +880,11 @@ def setup_routes(app, rt):
     @rt("/api/knowledge-base/edit/{kb_id}", methods=["POST"])
     @login_required
     async def edit_knowledge_base(request: Request, kb_id: str):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         if not token:
-            return await Settings(
-                request,
-                "knowledge-base",
-                error_messages=["Authentication required"]
-            )
+            return mutation_failed("Authentication required")
 
         try:
             form_data = await request.form()
@@ -834,44 +897,22 @@ def setup_routes(app, rt):
             response = await app.client.edit_knowledge_base(kb_id, kb_data, token)
             if error_response := get_error_response(response):
                 logger.error(f"Error from edit knowledge base endpoint: {error_response.message}")
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=[error_response.message]
-                )
+                return mutation_failed(error_response.message)
 
-            try:
-                knowledge_bases_response = await app.client.get_knowledge_bases(token)
-                if error_response := get_error_response(knowledge_bases_response):
-                    return await Settings(
-                        request,
-                        "knowledge-base",
-                        error_messages=[error_response.message]
-                    )
+            # Re-read only the edited knowledge base to render its row
+            kb_response = await app.client.get_knowledge_base(kb_id, token)
+            if error_response := get_error_response(kb_response):
+                return mutation_failed(f"Knowledge base updated but failed to refresh it: {error_response.message}")
 
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    content=KnowledgeBaseSettings(
-                        knowledge_bases=knowledge_bases_response.knowledgeBases
-                    ),
-                    success_messages=["Knowledge base updated successfully"]
-                )
-            except Exception as e:
-                logger.error(f"Error fetching knowledge bases after edit: {str(e)}")
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=["Knowledge base updated but failed to refresh the list"]
-                )
+            return (
+                KnowledgeBaseRow(kb_response),
+                close_modal(),
+                notify(success_messages=["Knowledge base updated successfully"])
+            )
 
         except Exception as e:
             logger.error(f"Error editing knowledge base: {str(e)}")
-            return await Settings(
-                request,
-                "knowledge-base",
-                error_messages=[f"Failed to update knowledge base: {str(e)}"]
-            )
+            return mutation_failed(f"Failed to update knowledge base: {str(e)}")
 
     @rt("/settings/knowledge-base/new")
     @login_required
@@ -881,16 +922,11 @@ def setup_routes(app, rt):
     @rt("/api/knowledge-base/new", methods=["POST"])
     @login_required
     async def create_knowledge_base(request: Request):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         if not token:
-            return await Settings(
-                request,
-                "knowledge-base",
-                error_messages=["Authentication required"]
-            )
+            return mutation_failed("Authentication required")
 
         try:
             form_data = await request.form()
@@ -903,51 +939,33 @@ def setup_routes(app, rt):
             response = await app.client.create_knowledge_base(kb_data, token)
             if error_response := get_error_response(response):
                 logger.error(f"Error from create_knowledge_base endpoint: {error_response.message}")
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=[error_response.message]
-                )
+                return mutation_failed(error_response.message)
 
-            try:
-                knowledge_bases_response = await app.client.get_knowledge_bases(token)
-                if error_response := get_error_response(knowledge_bases_response):
-                    return await Settings(
-                        request,
-                        "knowledge-base",
-                        error_messages=[error_response.message]
-                    )
-
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    content=KnowledgeBaseSettings(
-                        knowledge_bases=knowledge_bases_response.knowledgeBases
-                    ),
-                    success_messages=["Knowledge base created successfully"]
-                )
-            except Exception as e:
-                logger.error(f"Error fetching knowledge bases after create: {str(e)}")
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=["Knowledge base created but failed to refresh the list"]
-                )
+            # Reload the current page of the table, where the new entry may now appear
+            knowledge_bases_response, page = await fetch_knowledge_bases_page(request, token)
+            if error_response := get_error_response(knowledge_bases_response):
+                return mutation_failed(f"Knowledge base created but failed to refresh the list: {error_response.message}")
+
+            return (
+                KnowledgeBaseSettings(
+                    knowledge_bases=knowledge_bases_response.knowledgeBases,
+                    page=page,
+                    total=knowledge_bases_response.total,
+                    partial=True
+                ),
+                close_modal(),
+                notify(success_messages=["Knowledge base created successfully"])
+            )
 
         except Exception as e:
             logger.error(f"Error creating knowledge base: {str(e)}")
-            return await Settings(
-                request,
-                "knowledge-base",
-                error_messages=[f"Failed to create knowledge base: {str(e)}"]
-            )
+            return mutation_failed(f"Failed to create knowledge base: {str(e)}")
 
     @rt("/api/knowledge-base/bulk", methods=["POST"])
     @login_required
     async def create_bulk_knowledge_base(request: Request):
-        user = request.session.get("user")
-        user = json.loads(user)
-        token = user.get("token")
+        user = request.state.user
+        token = user.token
 
         try:
             form = await request.form()
@@ -960,7 +978,7 @@ def setup_routes(app, rt):
                 )
 
             try:
-                knowledge_bases = await _process_csv_file(file)
+                knowledge_bases = await open_knowledge_base_csv(file)
             except ValueError as e:
                 return await Settings(
                     request,
@@ -968,50 +986,28 @@ def setup_routes(app, rt):
                     error_messages=[str(e)]
                 )
 
-            success_count = 0
-            error_messages = []
-
-            for kb_data in knowledge_bases:
-                try:
-                    response = await app.client.create_knowledge_base(kb_data, token)
-                    if error_response := get_error_response(response):
-                        error_messages.append(f"Failed to create knowledge base '{kb_data['title']}': {error_response.message}")
-                    else:
-                        success_count += 1
-                except Exception as e:
-                    error_messages.append(f"Failed to create knowledge base '{kb_data['title']}': {str(e)}")
-
-            try:
-                knowledge_bases_response = await app.client.get_knowledge_bases(token)
-                if error_response := get_error_response(knowledge_bases_response):
-                    error_messages.append(f"Failed to refresh knowledge bases list: {error_response.message}")
-                    return await Settings(
-                        request,
-                        "knowledge-base",
-                        error_messages=error_messages
-                    )
-
-                messages = []
-                if success_count > 0:
-                    messages.append(f"Successfully created {success_count} knowledge base(s)")
+            # The import runs in the background; the page polls its progress
+            job = app.bulk_imports.start(knowledge_bases, token, owner_id=user.id)
 
+            knowledge_bases_response, page = await fetch_knowledge_bases_page(request, token)
+            if error_response := get_error_response(knowledge_bases_response):
                 return await Settings(
                     request,
                     "knowledge-base",
-                    content=KnowledgeBaseSettings(
-                        knowledge_bases=knowledge_bases_response.knowledgeBases
-                    ),
-                    success_messages=messages if messages else None,
-                    error_messages=error_messages if error_messages else None
+                    content=KnowledgeBaseSettings(knowledge_bases=[], import_job=job),
+                    error_messages=[error_response.message]
                 )
-            except Exception as e:
-                logger.error(f"Error fetching knowledge bases after bulk create: {str(e)}")
-                error_messages.append("Failed to refresh knowledge bases list")
-                return await Settings(
-                    request,
-                    "knowledge-base",
-                    error_messages=error_messages
+
+            return await Settings(
+                request,
+                "knowledge-base",
+                content=KnowledgeBaseSettings(
+                    knowledge_bases=knowledge_bases_response.knowledgeBases,
+                    page=page,
+                    total=knowledge_bases_response.total,
+                    import_job=job
                 )
+            )
 
         except Exception as e:
             logger.error(f"Error creating bulk knowledge bases: {str(e)}")
@@ -1021,24 +1017,131 @@ def setup_routes(app, rt):
                 error_messages=[f"Failed to process bulk upload: {str(e)}"]
             )
 
-    async def _process_csv_file(file) -> List[Dict[str, str]]:
+    @rt("/api/knowledge-base/bulk/{job_id}", methods=["GET"])
+    @login_required
+    async def bulk_knowledge_base_progress(request: Request, job_id: str):
+        user = request.state.user
+        token = user.token
+
+        job = app.bulk_imports.get(job_id, owner_id=user.id)
+        if job is None:
+            return Div(id="bulk-import-progress")
+
+        if not job.finished:
+            return BulkImportProgress(job)
+
+        # Once finished, replace the whole page so the table shows the new rows
+        refresh_page = HtmxResponseHeaders(retarget="#settings-page", reswap="innerHTML")
+        success_messages = []
+        if job.created > 0:
+            success_messages.append(f"Successfully created {job.created} knowledge base(s)")
+
+        failures = job.failures()
+        error_messages = [
+            f"Failed to create knowledge base '{row.title}': {row.message}"
+            for row in failures[:MAX_REPORTED_IMPORT_ERRORS]
+        ]
+        if job.error:
+            error_messages.insert(0, f"The import stopped after {len(job.results)} row(s): {job.error}")
+        if len(failures) > MAX_REPORTED_IMPORT_ERRORS:
+            error_messages.append(f"... and {len(failures) - MAX_REPORTED_IMPORT_ERRORS} more failed row(s)")
+
         try:
-            content = await file.read()
-            content_str = content.decode()
-
-            knowledge_bases = []
-            csv_reader = csv.DictReader(io.StringIO(content_str))
-            for row in csv_reader:
-                if 'Title' not in row or 'Content' not in row:
-                    raise ValueError("CSV must have 'Title' and 'Content' columns")
-                knowledge_bases.append({
-                    "title": row["Title"],
-                    "content": row["Content"],
-                })
-            return knowledge_bases
+            knowledge_bases_response, page = await fetch_knowledge_bases_page(request, token)
+            if error_response := get_error_response(knowledge_bases_response):
+                error_messages.append(f"Failed to refresh knowledge bases list: {error_response.message}")
+                return await Settings(
+                    request,
+                    "knowledge-base",
+                    error_messages=error_messages
+                ), refresh_page
+
+            return await Settings(
+                request,
+                "knowledge-base",
+                content=KnowledgeBaseSettings(
+                    knowledge_bases=knowledge_bases_response.knowledgeBases,
+                    page=page,
+                    total=knowledge_bases_response.total
+                ),
+                success_messages=success_messages if success_messages else None,
+                error_messages=error_messages if error_messages else None
+            ), refresh_page
         except Exception as e:
-            logger.error(f"Error processing CSV file: {str(e)}")
-            raise
+            logger.error(f"Error fetching knowledge bases after bulk create: {str(e)}")
+            error_messages.append("Failed to refresh knowledge bases list")
+            return await Settings(
+                request,
+                "knowledge-base",
+                error_messages=error_messages
+            ), refresh_page
+
+    async def _load_chat_page(
+        request: Request,
+        token: str,
+        error_messages: List[str],
+        conversation_id: Optional[str] = None,
+        streaming_text: Optional[str] = None
+    ):
+        """
+        Fetch everything the chat page needs from the backend concurrently.
+        Returns (message history, chat history content, llm options); any call that
+        fails leaves its slot as None and appends its message to error_messages.
+        With streaming_text set, the turn asking it is left out of the history
+        as the page renders that answer from its live stream.
+        """
+        client = request.app.client
+        # Some call has to carry the token, or a revoked session would get a
+        # page rendered from the caches instead of the redirect to login
+        check_session = not conversation_id and client.conversations_cache.get(token) is not None
+        calls = [
+            client.get_conversations(token=token),
+            client.get_llms(token, check_session=check_session),
+        ]
+        if conversation_id:
+            calls.append(fetch_message_bubbles(conversation_id, token))
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        conversations_response, llms = results[0], results[1]
+        messages_result = results[2] if conversation_id else None
+
+        history = None
+        if conversation_id:
+            if isinstance(messages_result, Exception):
+                logger.error(f"Error getting conversation {conversation_id}: {messages_result}")
+                error_messages.append("Failed to load the conversation. Please try again later.")
+            elif error_response := get_error_response(messages_result[0]):
+                logger.error(f"Error getting conversation {conversation_id}: {error_response}")
+                error_messages.append(error_response.message)
+            else:
+                _, bubbles, older_cursor = messages_result
+                if streaming_text is not None:
+                    bubbles = drop_streaming_turn(bubbles, streaming_text)
+                history = MessageHistory(conversation_id, bubbles, older_cursor)
+
+        content = None
+        if isinstance(conversations_response, Exception):
+            logger.error(f"Error getting conversations: {conversations_response}")
+            error_messages.append("Failed to load recent chats. Please try again later.")
+        elif error_response := get_error_response(conversations_response):
+            logger.error(f"Error getting conversations: {error_response}")
+            error_messages.append(error_response.message)
+        else:
+            content = ChatHistory(
+                conversations=conversations_response.conversations
+            )
+
+        llm_options = None
+        if isinstance(llms, Exception):
+            logger.error(f"Error getting LLMs: {llms}")
+            error_messages.append("Failed to load the available LLMs. Please try again later.")
+        elif error_response := get_error_response(llms):
+            logger.error(f"Error getting LLMs: {error_response}")
+            error_messages.append(error_response.message)
+        else:
+            llm_options = _parse_llm_options(request, llms)
+
+        return history, content, llm_options
 
     def _parse_llm_options(request: Request, llms: LLMsResponse):
         selected_llm = request.session.get("selected-llm")
@@ -1055,15 +1158,104 @@ def setup_routes(app, rt):
 
         return llm_options
 
+    async def _on_config_change(config: dict):
+        if (config.get("connection_endpoint") or "http://localhost:8080") != app.client.base_url:
+            await app.client.update_base_url()
+
+    @app.on_event("startup")
+    async def startup_event():
+        # Created here rather than at import so every worker process gets its
+        # own connection pool and caches, even under a pre-forking server
+        app.client = VespaAgentClient(app.config_service)
+        app.bulk_imports = BulkImportManager(app.client)
+        app.chat_streams = ChatStreamManager(app.client)
+        app.config_service.on_change(_on_config_change)
+        app.config_watcher = asyncio.create_task(app.config_service.watch())
+        app.ready = True
+        _delay_exit_on_sigterm()
+
+    def _delay_exit_on_sigterm():
+        """
+        Fail readiness as soon as SIGTERM arrives and only pass the signal on
+        to uvicorn, which stops accepting connections, SHUTDOWN_DRAIN_DELAY
+        seconds later. A second signal exits right away.
+        """
+        # Signal handlers can only be set from the main thread, i.e. not in tests
+        if threading.current_thread() is not threading.main_thread() or SHUTDOWN_DRAIN_DELAY <= 0:
+            return
+        exit_handler = signal.getsignal(signal.SIGTERM)
+        if not callable(exit_handler):
+            return
+        loop = asyncio.get_running_loop()
+
+        def on_sigterm(sig, frame):
+            if not app.ready:
+                exit_handler(sig, frame)
+                return
+            app.ready = False
+            logger.info(f"Shutting down in {SHUTDOWN_DRAIN_DELAY:g}s; readiness now fails")
+            loop.call_soon_threadsafe(loop.call_later, SHUTDOWN_DRAIN_DELAY, exit_handler, sig, frame)
+
+        signal.signal(signal.SIGTERM, on_sigterm)
+
     @app.on_event("shutdown")
     async def shutdown_event():
+        app.ready = False
+        app.config_watcher.cancel()
+        await app.bulk_imports.close()
+        await app.chat_streams.close()
         await app.client.close()
 
+    @rt("/health/live")
+    async def liveness(request: Request):
+        return JSONResponse({"status": "ok"})
+
+    @rt("/health/ready")
+    async def readiness(request: Request):
+        if not app.ready:
+            return JSONResponse(status_code=503, content={"status": "unavailable"})
+        return JSONResponse({"status": "ready"})
+
+    @rt("/health/stats")
+    async def stats(request: Request):
+        # Counters are per worker process; pid tells the workers apart
+        return JSONResponse({
+            "pid": os.getpid(),
+            "pool": app.client.pool_stats(),
+            "caches": app.client.cache_stats(),
+            "resilience": app.client.resilience_stats(),
+            "chat_streams": app.chat_streams.stats(),
+        })
+
     return app
 
 def get_error_response(response: Any) -> ErrorResponse:
     if isinstance(response, ErrorResponse):
         if response.statusCode == 401:
             response.message = "UNAUTHORIZED"
+            mark_session_expired()
         return response
     return None
+
+def drop_streaming_turn(bubbles: List[Tuple[str, str]], text: str) -> List[Tuple[str, str]]:
+    """
+    Remove the latest turn from the bubbles if it asked `text`, along with
+    the part of its answer the backend has stored so far.
+    """
+    end = len(bubbles)
+    if end and bubbles[end - 1][0].lower() != "user":
+        end -= 1
+    if end and bubbles[end - 1][0].lower() == "user" and bubbles[end - 1][1] == text:
+        return bubbles[:end - 1]
+    return bubbles
+
+def notify(success_messages: List[str] = None, error_messages: List[str] = None):
+    """Notification cards for an HTMX response, swapped in out of band."""
+    return Notifications(success_messages=success_messages, error_messages=error_messages, oob=True)
+
+def mutation_failed(message: str):
+    """Leave the page as it is and only show the error."""
+    return notify(error_messages=[message]), HtmxResponseHeaders(reswap="none")
+
+def close_modal():
+    return Div(id="modal", hx_swap_oob="true")
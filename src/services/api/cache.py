@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger("vespa_app")
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+class AsyncTTLCache:
+    """
+    In-process LRU cache for backend responses.
+    Entries are fresh for `ttl` seconds, then served stale for another
+    `stale_ttl` seconds while a background refresh runs. Concurrent misses for
+    the same key share a single upstream call.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        # Bumped on invalidation so loads started before it are not stored
+        self._generation = 0
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True
+    ) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+        if entry is not None and now < entry.stale_until:
+            self.stale_hits += 1
+            self._entries.move_to_end(key)
+            if key not in self._inflight:
+                task = asyncio.create_task(self._refresh(key, loader, should_cache))
+                self._refreshes.add(task)
+                task.add_done_callback(self._refreshes.discard)
+            return entry.value
+
+        self.misses += 1
+        return await self._load(key, loader, should_cache)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value if it is still fresh, without loading."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry.expires_at:
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        self._entries[key] = CacheEntry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or every entry when no key is given."""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._entries),
+        }
+
+    async def _load(self, key, loader, should_cache) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(key, loader, should_cache))
+            self._inflight[key] = future
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled caller does not cancel the load for the others
+        return await asyncio.shield(future)
+
+    async def _run(self, key, loader, should_cache) -> Any:
+        generation = self._generation
+        try:
+            value = await loader()
+            if should_cache(value) and generation == self._generation:
+                self.set(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    async def _refresh(self, key, loader, should_cache):
+        try:
+            await self._load(key, loader, should_cache)
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {key}: {str(e)}")
@@ -1,8 +1,41 @@
+import asyncio
+import json
 import logging
 import os
+import time
+from collections import OrderedDict
+from datetime import datetime
 import httpx
 from services.config.config_service import ConfigService
-from src.services.api.types import AuthResult, AuthResponse, ErrorResponse, ConversationRequest, NewConversationResponse, ConversationResult, ConversationsResult, ConversationsResponse, UsersResponse, Conversation, NewConversationResult, LLMsResponse, LLMsResult, GenericActionResponse, GenericActionResult, UsersResult, User, UserResult, KnowledgeBase, KnowledgeBaseResult, KnowledgeBasesResponse
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from src.services.api.cache import AsyncTTLCache
+from src.services.api.pagination import paginate, KNOWLEDGE_BASE_SORT_KEYS, USER_SORT_KEYS
+from src.services.api.resilience import CircuitBreaker, HedgeBudget, LatencyTracker, HTTP_HEDGE_ENABLED, HTTP_HEDGE_MIN_DELAY, HTTP_HEDGE_PERCENTILE, HTTP_RETRY_ATTEMPTS, backoff_delay, is_failure, should_retry
+from src.services.api.sse import SSEParser
+from src.services.api.types import AuthResult, AuthResponse, ErrorResponse, ConversationRequest, NewConversationResponse, ConversationResult, ConversationsResult, ConversationsResponse, UsersResponse, Conversation, NewConversationResult, LLMsResponse, LLMsResult, GenericActionResponse, GenericActionResult, UsersResult, User, UserResult, KnowledgeBase, KnowledgeBaseResult, KnowledgeBasesResponse, KnowledgeBasesResult, BatchItemResult, BatchActionResponse, ChatMessage, MessagesResponse, MessagesResult
+
+# Connection pool tuning, shared by regular requests and chat streams
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "200"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+# Read timeout between chunks of a chat stream; LLMs can be slow to produce tokens
+HTTP_STREAM_READ_TIMEOUT = float(os.getenv("HTTP_STREAM_READ_TIMEOUT", "120"))
+# The LLM catalogue rarely changes; serve it from memory between refreshes
+LLMS_CACHE_TTL = float(os.getenv("LLMS_CACHE_TTL", "300"))
+LLMS_CACHE_STALE_TTL = float(os.getenv("LLMS_CACHE_STALE_TTL", "3600"))
+# Per-user conversation lists, kept up to date by this client's own writes
+CONVERSATIONS_CACHE_TTL = float(os.getenv("CONVERSATIONS_CACHE_TTL", "60"))
+CONVERSATIONS_CACHE_MAX_ENTRIES = int(os.getenv("CONVERSATIONS_CACHE_MAX_ENTRIES", "1024"))
+# Errors that depend on the token a request was made with
+AUTH_ERROR_STATUS_CODES = {401, 403}
+# Knowledge base batches are split into requests of at most this many items/bytes
+KB_BATCH_MAX_ITEMS = int(os.getenv("KB_BATCH_MAX_ITEMS", "500"))
+KB_BATCH_MAX_BYTES = int(os.getenv("KB_BATCH_MAX_BYTES", str(4 * 1024 * 1024)))
+# Batch bodies are written in pieces of about this size while streaming
+KB_BATCH_WRITE_SIZE = 64 * 1024
 
 class VespaAgentClient:
     def __init__(self, config_service: ConfigService):
@@ -12,18 +45,213 @@ class VespaAgentClient:
         self.config_service = config_service
         self.base_url = config_service.get_connection_endpoint() or default_url
         self.use_mock = use_mock
+        self.active_streams = 0
+        self.peak_active_streams = 0
+        self.pool_timeouts = 0
+        self.llms_cache = AsyncTTLCache(ttl=LLMS_CACHE_TTL, stale_ttl=LLMS_CACHE_STALE_TTL)
+        self.conversations_cache = AsyncTTLCache(
+            ttl=CONVERSATIONS_CACHE_TTL,
+            max_entries=CONVERSATIONS_CACHE_MAX_ENTRIES
+        )
+        # Conversations created here that have not had their first chat turn yet
+        self.untitled_conversations: "OrderedDict[str, None]" = OrderedDict()
+        # One circuit breaker per "METHOD /path/template"
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        # Recent latencies per "METHOD /path/template", for hedged reads
+        self.latencies: Dict[str, LatencyTracker] = {}
+        self.hedge_budget = HedgeBudget()
         self.client = self._create_client()
         self.logger = logging.getLogger("vespa_app")
 
     def _create_client(self) -> httpx.AsyncClient:
         return httpx.AsyncClient(
-            base_url=self.base_url if not self.use_mock else "http://localhost:8080"
+            base_url=self.base_url if not self.use_mock else "http://localhost:8080",
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                connect=HTTP_CONNECT_TIMEOUT,
+                read=HTTP_READ_TIMEOUT,
+                write=HTTP_READ_TIMEOUT,
+                pool=HTTP_POOL_TIMEOUT
+            )
         )
 
+    def pool_stats(self) -> Dict[str, int]:
+        """
+        Connection pool usage, used to tell when chat streams saturate the pool.
+        """
+        return {
+            "max_connections": HTTP_MAX_CONNECTIONS,
+            "active_streams": self.active_streams,
+            "peak_active_streams": self.peak_active_streams,
+            "pool_timeouts": self.pool_timeouts,
+        }
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters of the in-process response caches."""
+        return {
+            "llms": self.llms_cache.stats(),
+            "conversations": self.conversations_cache.stats(),
+        }
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Retries and hedges made, and the circuit breaker of every endpoint called so far."""
+        return {
+            "retries": self.retries,
+            "hedging": self.hedge_budget.stats(),
+            "breakers": {endpoint: breaker.stats() for endpoint, breaker in self.breakers.items()},
+        }
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        token: Optional[str] = None,
+        model=None,
+        endpoint: Optional[str] = None,
+        hedge: bool = False,
+        **kwargs
+    ) -> Union[Any, ErrorResponse]:
+        """
+        Send a request to the backend; every call goes through here.
+        Transient failures are retried with jittered exponential backoff when
+        the method is idempotent or the request was never sent, and each
+        endpoint (path with its IDs left as placeholders, e.g.
+        "/assistant/users/{id}") has a circuit breaker failing calls fast
+        while it is unhealthy. content may be a callable returning a fresh
+        body for every attempt. GETs with hedge set are sent a second time
+        when the first copy is slower than usual (see _send). Returns the
+        JSON body parsed into `model`, or as is without one, or an
+        ErrorResponse.
+        """
+        key = f"{method} {endpoint or path}"
+        breaker = self._breaker(key)
+
+        headers = dict(kwargs.pop("headers", {}))
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        content = kwargs.pop("content", None)
+        hedge = hedge and HTTP_HEDGE_ENABLED and method == "GET"
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                self.logger.warning(f"Circuit breaker open, not calling {key}")
+                return ErrorResponse(**{
+                    "error-code": "SERVICE_UNAVAILABLE",
+                    "message": "The assistant backend is unavailable. Please try again later.",
+                    "statusCode": 503
+                })
+
+            try:
+                response = await self._send(
+                    key,
+                    hedge,
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=headers,
+                    content=content() if callable(content) else content,
+                    **kwargs
+                )
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if attempt < HTTP_RETRY_ATTEMPTS and should_retry(method, error=e):
+                    await self._before_retry(key, attempt, e.__class__.__name__)
+                    continue
+                raise
+            except BaseException:
+                # Not the backend's fault, e.g. the call was cancelled
+                breaker.release()
+                raise
+
+            if is_failure(status_code=response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if attempt < HTTP_RETRY_ATTEMPTS and should_retry(method, status_code=response.status_code):
+                await self._before_retry(key, attempt, f"status {response.status_code}")
+                continue
+
+            return _parse_response(response, model)
+
+    async def _send(self, key: str, hedge: bool, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send one attempt of a request. A hedged one is sent again once it has
+        taken longer than HTTP_HEDGE_PERCENTILE of the endpoint's recent
+        latencies, budget permitting; the first copy to answer is used and
+        the other cancelled, which closes its connection.
+        """
+        latencies = self.latencies.get(key)
+        if latencies is None:
+            latencies = self.latencies[key] = LatencyTracker()
+
+        async def timed() -> httpx.Response:
+            started = time.monotonic()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.PoolTimeout:
+                self.pool_timeouts += 1
+                self.logger.warning(f"Connection pool exhausted calling {key}")
+                raise
+            latencies.record(time.monotonic() - started)
+            return response
+
+        if not hedge:
+            return await timed()
+
+        self.hedge_budget.deposit()
+        primary = asyncio.create_task(timed())
+        tasks = [primary]
+        try:
+            delay = latencies.percentile(HTTP_HEDGE_PERCENTILE)
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=max(delay, HTTP_HEDGE_MIN_DELAY))
+                if not done and self.hedge_budget.spend():
+                    self.logger.debug(f"Hedging {key} after {max(delay, HTTP_HEDGE_MIN_DELAY):.3f}s")
+                    tasks.append(asyncio.create_task(timed()))
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # A copy that failed leaves the answer to the other one, if any
+                answered = [task for task in done if task.exception() is None]
+                if answered:
+                    winner = primary if primary in answered else answered[0]
+                    if winner is not primary:
+                        self.hedge_budget.record_win()
+                    return winner.result()
+                if not pending:
+                    return primary.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _breaker(self, key: str) -> CircuitBreaker:
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = CircuitBreaker()
+        return breaker
+
+    async def _before_retry(self, key: str, attempt: int, reason: str):
+        self.retries += 1
+        delay = backoff_delay(attempt)
+        self.logger.warning(f"Retrying {key} in {delay:.2f}s after {reason} (attempt {attempt})")
+        await asyncio.sleep(delay)
+
     async def update_base_url(self):
         await self.client.aclose()
         self.base_url = self.config_service.get_connection_endpoint() or "http://localhost:8080"
         self.client = self._create_client()
+        # Failures and latencies of the previous backend say nothing about this one
+        self.breakers.clear()
+        self.latencies.clear()
+        self.llms_cache.invalidate()
+        self.conversations_cache.invalidate()
 
     async def authenticate(self, username: str, password: str) -> AuthResult:
         """
@@ -31,38 +259,50 @@ class VespaAgentClient:
         Returns a validated AuthResponse on success or ErrorResponse on failure.
         """
         self.logger.debug(f"Authenticating user: {username}")
-        response = await self.client.post(
-            f"{self.base_url}/assistant/auth",
+        return await self._request(
+            "POST",
+            "/assistant/auth",
+            model=AuthResponse,
             json={
                 "username": username,
                 "password": password
-            },
-            headers={
-                "Content-Type": "application/json"
             }
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return AuthResponse(**data)
-
-    async def get_llms(self, token: str) -> LLMsResult:
+    async def get_llms(self, token: str, check_session: bool = False) -> LLMsResult:
         """
         Fetch available LLM configurations
-        Returns the complete LLM information for each model
+        Returns the complete LLM information for each model.
+        Successful responses are cached per backend endpoint. With
+        check_session set the list is fetched with `token` even when cached,
+        so a rejected token is noticed; the answer refreshes the cache.
         """
-        response = await self.client.get(
-            f"{self.base_url}/assistant/llms",
-            headers={"Authorization": f"Bearer {token}"}
+        if check_session:
+            result = await self._fetch_llms(token)
+            if isinstance(result, LLMsResponse):
+                self.llms_cache.set(self.base_url, result)
+            return result
+
+        loaded = False
+
+        async def load() -> LLMsResult:
+            nonlocal loaded
+            loaded = True
+            return await self._fetch_llms(token)
+
+        result = await self.llms_cache.get_or_load(
+            self.base_url,
+            load,
+            should_cache=lambda result: isinstance(result, LLMsResponse)
         )
+        # Concurrent callers share one load, made with the first caller's
+        # token; whether that token was rejected says nothing about ours
+        if not loaded and isinstance(result, ErrorResponse) and result.statusCode in AUTH_ERROR_STATUS_CODES:
+            return await self._fetch_llms(token)
+        return result
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return LLMsResponse(**data)
+    async def _fetch_llms(self, token: str) -> LLMsResult:
+        return await self._request("GET", "/assistant/llms", token, model=LLMsResponse, hedge=True)
 
     async def close(self):
         await self.client.aclose()
@@ -74,100 +314,184 @@ class VespaAgentClient:
         """
         self.logger.debug(f"Creating conversation")
 
-        response = await self.client.post(
-            f"{self.base_url}/assistant/conversations",
-            headers={
-                "Authorization": f"Bearer {token}"
-            }
-        )
-
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        response_data = NewConversationResponse(**data)
+        response_data = await self._request("POST", "/assistant/conversations", token, model=NewConversationResponse)
+        if isinstance(response_data, ErrorResponse):
+            return response_data
 
         self.logger.info(f"Created conversation with ID: {response_data.conversationId}")
+        if cached := self.conversations_cache.get(token):
+            now = datetime.now().isoformat()
+            cached.conversations.append(Conversation(
+                conversationId=response_data.conversationId,
+                title=response_data.title,
+                createdAt=now,
+                updatedAt=now
+            ))
+        self.untitled_conversations[response_data.conversationId] = None
+        while len(self.untitled_conversations) > CONVERSATIONS_CACHE_MAX_ENTRIES:
+            self.untitled_conversations.popitem(last=False)
         return response_data
 
-    async def stream_conversation(self, llm_id: str, text: str, token: str, conversation_id: str):
+    async def stream_conversation(
+        self,
+        llm_id: str,
+        text: str,
+        token: str,
+        conversation_id: str,
+        passthrough: bool = False
+    ):
         """
         Stream a conversation with the given LLM using SSE.
         Transform form data into proper JSON request before sending to backend.
+        Yields one complete SSE event per item, decoded, or as raw bytes when
+        passthrough is set. Answers are not retried, as that would ask the LLM
+        twice, but they share the circuit breaker of the other calls.
         """
         request = ConversationRequest(
             llmId=llm_id,
             query=text,
             conversationId=conversation_id
         )
-
-        async with httpx.AsyncClient() as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/assistant/chat",
-                    json=request.model_dump(),
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Accept": "text/event-stream",
-                        "Content-Type": "application/json"
-                    }
-                ) as response:
-                    self.logger.debug(f"Response status: {response.status_code}")
-                    if response.status_code != 200:
-                        error_content = await response.aread()
-                        self.logger.error(f"Response error content: {error_content.decode()}")
-                        return
-
-                    buffer = []
-                    async for chunk in response.aiter_bytes():
-                        chunk_str = chunk.decode()
-                        buffer.append(chunk_str)
-
-                        # If we have a complete message (ends with double newline)
-                        if '\n\n' in chunk_str:
-                            message = ''.join(buffer)
-                            yield message
-                            buffer = []
-
-            except Exception as e:
-                self.logger.error(f"Error in stream_conversation: {str(e)}")
-                raise
+        breaker = self._breaker("POST /assistant/chat")
+        if not breaker.allow():
+            self.logger.warning("Circuit breaker open, not calling POST /assistant/chat")
+            return
+
+        self.active_streams += 1
+        self.peak_active_streams = max(self.peak_active_streams, self.active_streams)
+        if self.active_streams >= HTTP_MAX_CONNECTIONS:
+            self.logger.warning(f"Connection pool saturated: {self.active_streams} active chat streams")
+
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/assistant/chat",
+                json=request.model_dump(),
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Accept": "text/event-stream",
+                    "Content-Type": "application/json"
+                },
+                timeout=httpx.Timeout(
+                    connect=HTTP_CONNECT_TIMEOUT,
+                    read=HTTP_STREAM_READ_TIMEOUT,
+                    write=HTTP_READ_TIMEOUT,
+                    pool=HTTP_POOL_TIMEOUT
+                )
+            ) as response:
+                self.logger.debug(f"Response status: {response.status_code}")
+                if is_failure(status_code=response.status_code):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code != 200:
+                    error_content = await response.aread()
+                    self.logger.error(f"Response error content: {error_content.decode()}")
+                    return
+
+                self._touch_cached_conversation(token, conversation_id, text)
+
+                parser = SSEParser(passthrough=passthrough)
+                async for chunk in response.aiter_bytes():
+                    for frame in parser.feed(chunk):
+                        yield frame
+
+                if remainder := parser.flush():
+                    self.logger.warning(f"Discarding incomplete SSE frame of {len(remainder)} bytes")
+
+        except httpx.PoolTimeout as e:
+            self.pool_timeouts += 1
+            breaker.record_failure()
+            self.logger.error(f"Connection pool exhausted in stream_conversation: {str(e)}")
+            raise
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            self.logger.error(f"Error in stream_conversation: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error in stream_conversation: {str(e)}")
+            raise
+        finally:
+            breaker.release()
+            self.active_streams -= 1
+
+    def _touch_cached_conversation(self, token: str, conversation_id: str, text: str):
+        """
+        Mirror a chat turn in the cached conversation list: the backend bumps
+        updatedAt and titles a conversation after its first query.
+        """
+        cached = self.conversations_cache.get(token)
+        conversation = next(
+            (c for c in cached.conversations if c.conversationId == conversation_id),
+            None
+        ) if cached else None
+
+        if conversation_id in self.untitled_conversations:
+            del self.untitled_conversations[conversation_id]
+            if conversation:
+                conversation.title = text
+        if conversation:
+            conversation.updatedAt = datetime.now().isoformat()
 
     async def get_conversations(self, token: str) -> ConversationsResult:
         """
-        Get all conversations for a user
+        Get all conversations for a user.
+        Served from a per-user cache that this client's writes keep current.
         """
-        response = await self.client.get(
-            "/assistant/conversations",
-            headers={
-                "Authorization": f"Bearer {token}"
-            }
+        return await self.conversations_cache.get_or_load(
+            token,
+            lambda: self._fetch_conversations(token),
+            should_cache=lambda result: isinstance(result, ConversationsResponse)
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return ConversationsResponse(**data)
+    async def _fetch_conversations(self, token: str) -> ConversationsResult:
+        return await self._request("GET", "/assistant/conversations", token, model=ConversationsResponse, hedge=True)
 
     async def get_conversation(self, conversation_id: str, token: str) -> ConversationResult:
         """
         Get a conversation by its ID
         """
         self.logger.debug(f"Getting conversation with ID: {conversation_id}")
-        response = await self.client.get(
-            f"{self.base_url}/assistant/conversations/{conversation_id}",
-            headers={
-                "Authorization": f"Bearer {token}"
-            }
+        return await self._request(
+            "GET",
+            f"/assistant/conversations/{conversation_id}",
+            token,
+            model=Conversation,
+            endpoint="/assistant/conversations/{id}"
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return Conversation(**data)
+    async def get_conversation_messages(
+        self,
+        conversation_id: str,
+        token: str,
+        before: Optional[str] = None,
+        limit: int = 50
+    ) -> MessagesResult:
+        """
+        Get one page of a conversation's messages, newest first.
+        before is the ID of a message; only messages older than it are returned.
+        Backends without the messages endpoint answer 404; the page is then
+        cut from the whole conversation.
+        """
+        params = {"limit": str(limit)}
+        if before:
+            params["before"] = before
+
+        response = await self._request(
+            "GET",
+            f"/assistant/conversations/{conversation_id}/messages",
+            token,
+            model=MessagesResponse,
+            endpoint="/assistant/conversations/{id}/messages",
+            params=params
+        )
+        if not isinstance(response, ErrorResponse) or response.statusCode != 404:
+            return response
+
+        conversation = await self.get_conversation(conversation_id, token)
+        if isinstance(conversation, ErrorResponse):
+            return conversation
+        return _page_messages(conversation.messages or [], before, limit)
 
     async def delete_conversation(
         self,
@@ -177,74 +501,78 @@ class VespaAgentClient:
         """
         Delete a conversation by its ID
         """
-        response = await self.client.delete(
-            f"{self.base_url}/assistant/conversations/{conversation_id}",
-            headers={
-                "Authorization": f"Bearer {token}"
-            }
+        response = await self._request(
+            "DELETE",
+            f"/assistant/conversations/{conversation_id}",
+            token,
+            model=GenericActionResponse,
+            endpoint="/assistant/conversations/{id}"
         )
+        if isinstance(response, ErrorResponse):
+            return response
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-
-        return GenericActionResponse(**data)
+        if cached := self.conversations_cache.get(token):
+            cached.conversations = [
+                c for c in cached.conversations if c.conversationId != conversation_id
+            ]
+        self.untitled_conversations.pop(conversation_id, None)
+        return response
 
     async def delete_all_conversations(self, token: str) -> GenericActionResult:
         """
         Delete all conversations for a user
         """
-        response = await self.client.delete(
-            f"{self.base_url}/assistant/conversations/delete/all",
-            headers={"Authorization": f"Bearer {token}"}
+        response = await self._request(
+            "DELETE", "/assistant/conversations/delete/all", token, model=GenericActionResponse
         )
+        if isinstance(response, ErrorResponse):
+            return response
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
-
-    async def get_users(self, token: str) -> UsersResult:
-        """Get all users"""
-        response = await self.client.get(
-            f"{self.base_url}/assistant/users",
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        self.conversations_cache.set(token, ConversationsResponse(conversations=[]))
+        return response
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return UsersResponse(**data)
+    async def get_users(
+        self,
+        token: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> UsersResult:
+        """
+        Get users, optionally one page of them.
+        sort is a field name, prefixed with "-" for descending order, and query
+        filters on username and email.
+        """
+        users_response = await self._request(
+            "GET",
+            "/assistant/users",
+            token,
+            model=UsersResponse,
+            params=_page_params(offset, limit, sort, query)
+        )
+        if isinstance(users_response, ErrorResponse):
+            return users_response
+        if users_response.total is None and limit is not None:
+            # The backend ignored the paging parameters
+            users_response.users, users_response.total = paginate(
+                users_response.users, offset, limit, sort, USER_SORT_KEYS, query,
+                search=lambda user: f"{user.username} {user.email}"
+            )
+        return users_response
 
     async def get_user(self, user_id: str, token: str) -> UserResult:
         """Get a user by their ID"""
-        response = await self.client.get(
-            f"{self.base_url}/assistant/users/{user_id}",
-            headers={"Authorization": f"Bearer {token}"}
+        return await self._request(
+            "GET", f"/assistant/users/{user_id}", token, model=User, endpoint="/assistant/users/{id}"
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return User(**data)
-
     async def delete_user(self, user_id: str, token: str) -> GenericActionResponse:
         """Delete a user by their ID"""
-        response = await self.client.delete(
-            f"{self.base_url}/assistant/users/{user_id}",
-            headers={"Authorization": f"Bearer {token}"}
+        return await self._request(
+            "DELETE", f"/assistant/users/{user_id}", token, model=GenericActionResponse, endpoint="/assistant/users/{id}"
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
-
     async def edit_user(self, user_id: str, user_data: dict, token: str) -> GenericActionResult:
         """Edit a user by their ID"""
         roles = ["USER", "ADMIN"] if user_data.get("is_admin") else ["USER"]
@@ -257,21 +585,15 @@ class VespaAgentClient:
         if user_data.get("password"):
             payload["password"] = user_data["password"]
 
-        response = await self.client.put(
-            f"{self.base_url}/assistant/users/{user_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            },
+        return await self._request(
+            "PUT",
+            f"/assistant/users/{user_id}",
+            token,
+            model=GenericActionResponse,
+            endpoint="/assistant/users/{id}",
             json=payload
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
-
     async def create_user(self, user_data: dict, token: str) -> GenericActionResult:
         """Create a new user"""
         roles = ["USER", "ADMIN"] if user_data.get("is_admin") else ["USER"]
@@ -282,60 +604,54 @@ class VespaAgentClient:
             "roles": roles
         }
 
-        response = await self.client.post(
-            f"{self.base_url}/assistant/users",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            },
-            json=payload
-        )
+        return await self._request("POST", "/assistant/users", token, model=GenericActionResponse, json=payload)
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
-
-    async def get_knowledge_bases(self, token: str) -> KnowledgeBasesResponse:
-        """Get all knowledge bases"""
-        response = await self.client.get(
-            f"{self.base_url}/assistant/knowledge-base",
-            headers={"Authorization": f"Bearer {token}"}
+    async def get_knowledge_bases(
+        self,
+        token: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> KnowledgeBasesResult:
+        """
+        Get knowledge bases, optionally one page of them.
+        sort is a field name, prefixed with "-" for descending order, and query
+        filters on the title.
+        """
+        knowledge_bases_response = await self._request(
+            "GET",
+            "/assistant/knowledge-base",
+            token,
+            model=KnowledgeBasesResponse,
+            params=_page_params(offset, limit, sort, query)
         )
-
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return KnowledgeBasesResponse(**data)
+        if isinstance(knowledge_bases_response, ErrorResponse):
+            return knowledge_bases_response
+        if knowledge_bases_response.total is None and limit is not None:
+            # The backend ignored the paging parameters
+            knowledge_bases_response.knowledgeBases, knowledge_bases_response.total = paginate(
+                knowledge_bases_response.knowledgeBases, offset, limit, sort, KNOWLEDGE_BASE_SORT_KEYS, query,
+                search=lambda kb: kb.title
+            )
+        return knowledge_bases_response
 
     async def get_knowledge_base(self, kb_id: str, token: str) -> KnowledgeBaseResult:
         """Get a knowledge base by its ID"""
-        response = await self.client.get(
-            f"{self.base_url}/assistant/knowledge-base/{kb_id}",
-            headers={"Authorization": f"Bearer {token}"}
+        return await self._request(
+            "GET", f"/assistant/knowledge-base/{kb_id}", token, model=KnowledgeBase, endpoint="/assistant/knowledge-base/{id}"
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return KnowledgeBase(**data)
-
     async def delete_knowledge_bases(self, kb_id:str, token: str) -> GenericActionResult:
         """Delete a knowledge base by their ID"""
-        response = await self.client.delete(
-            f"{self.base_url}/assistant/knowledge-base/{kb_id}",
-            headers={"Authorization": f"Bearer {token}"}
+        return await self._request(
+            "DELETE",
+            f"/assistant/knowledge-base/{kb_id}",
+            token,
+            model=GenericActionResponse,
+            endpoint="/assistant/knowledge-base/{id}"
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
-
     async def edit_knowledge_base(self, kb_id: str, kb_data: dict, token: str) -> GenericActionResult:
         """Edit a knowledge base by its ID"""
         payload = {
@@ -343,21 +659,15 @@ class VespaAgentClient:
             "content": kb_data["content"],
         }
 
-        response = await self.client.put(
-            f"{self.base_url}/assistant/knowledge-base/{kb_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            },
+        return await self._request(
+            "PUT",
+            f"/assistant/knowledge-base/{kb_id}",
+            token,
+            model=GenericActionResponse,
+            endpoint="/assistant/knowledge-base/{id}",
             json=payload
         )
 
-        data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
-
     async def create_knowledge_base(self, kb_data: dict, token: str) -> GenericActionResult:
         """Create a new knowledge base"""
         payload = {
@@ -365,17 +675,152 @@ class VespaAgentClient:
             "content": kb_data["content"],
         }
 
-        response = await self.client.post(
-            f"{self.base_url}/assistant/knowledge-base",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            },
-            json=payload
-        )
+        return await self._request("POST", "/assistant/knowledge-base", token, model=GenericActionResponse, json=payload)
+
+    async def create_knowledge_bases_batch(self, kb_items: List[dict], token: str) -> BatchActionResponse:
+        """
+        Create many knowledge bases in as few requests as possible.
+        Returns one result per item, in input order; see _send_knowledge_base_batch.
+        """
+        records = [
+            {"title": kb_data["title"], "content": kb_data["content"]}
+            for kb_data in kb_items
+        ]
+        return await self._send_knowledge_base_batch("POST", "/assistant/knowledge-base/batch", records, token)
+
+    async def edit_knowledge_bases_batch(self, kb_items: List[dict], token: str) -> BatchActionResponse:
+        """
+        Edit many knowledge bases; each item needs an id, a title and a content.
+        Returns one result per item, in input order; see _send_knowledge_base_batch.
+        """
+        records = [
+            {"id": kb_data["id"], "title": kb_data["title"], "content": kb_data["content"]}
+            for kb_data in kb_items
+        ]
+        return await self._send_knowledge_base_batch("PUT", "/assistant/knowledge-base/batch", records, token)
+
+    async def delete_knowledge_bases_batch(self, kb_ids: List[str], token: str) -> BatchActionResponse:
+        """
+        Delete many knowledge bases by their IDs.
+        Returns one result per item, in input order; see _send_knowledge_base_batch.
+        """
+        records = [{"id": kb_id} for kb_id in kb_ids]
+        return await self._send_knowledge_base_batch("POST", "/assistant/knowledge-base/batch/delete", records, token)
 
+    async def _send_knowledge_base_batch(self, method: str, path: str, records: List[dict], token: str) -> BatchActionResponse:
+        """
+        Send the records in chunks. A chunk that fails is reported against each
+        of its items and the next one is still sent, unless the token was
+        rejected: the items not sent yet are then reported as errors too, and
+        the rejection is returned along with the results.
+        """
+        results: List[BatchItemResult] = []
+        for offset, lines in _chunk_ndjson(records, KB_BATCH_MAX_ITEMS, KB_BATCH_MAX_BYTES):
+            try:
+                data = await self._request(
+                    method,
+                    path,
+                    token,
+                    headers={"Content-Type": "application/x-ndjson"},
+                    # A fresh body generator for every attempt
+                    content=lambda lines=lines: _stream_lines(lines)
+                )
+            except Exception as e:
+                # Requests never sent were retried already; the items may exist
+                data = ErrorResponse(**{"error-code": "REQUEST_FAILED", "message": str(e) or e.__class__.__name__})
+
+            if isinstance(data, ErrorResponse):
+                error = data
+                if error.statusCode in AUTH_ERROR_STATUS_CODES:
+                    results.extend(
+                        BatchItemResult(index=index, status="error", message=f"Not sent: {error.message}")
+                        for index in range(offset, len(records))
+                    )
+                    return BatchActionResponse(results=results, error=error)
+                self.logger.error(f"Knowledge base batch {path} failed for items {offset}-{offset + len(lines) - 1}: {error.message}")
+                results.extend(
+                    BatchItemResult(index=offset + i, status="error", message=error.message)
+                    for i in range(len(lines))
+                )
+                continue
+
+            for item in BatchActionResponse(**data).results:
+                item.index += offset
+                results.append(item)
+
+        return BatchActionResponse(results=results)
+
+def _parse_response(response: httpx.Response, model=None):
+    try:
         data = response.json()
-        if "error-code" in data:
-            data["statusCode"] = response.status_code
-            return ErrorResponse(**data)
-        return GenericActionResponse(**data)
+    except ValueError:
+        return ErrorResponse(**{
+            "error-code": "BAD_RESPONSE",
+            "message": f"Unexpected response from the backend (HTTP {response.status_code})",
+            "statusCode": response.status_code
+        })
+
+    if isinstance(data, dict) and "error-code" in data:
+        data["statusCode"] = response.status_code
+        return ErrorResponse(**data)
+    if not response.is_success:
+        # e.g. a proxy's or framework's own error body
+        detail = data.get("message") or data.get("detail") if isinstance(data, dict) else None
+        return ErrorResponse(**{
+            "error-code": "HTTP_ERROR",
+            "message": detail if isinstance(detail, str) else f"The backend returned HTTP {response.status_code}",
+            "statusCode": response.status_code
+        })
+    return model(**data) if model is not None else data
+
+def _page_messages(messages: List[ChatMessage], before: Optional[str], limit: int) -> MessagesResult:
+    """One page of a conversation's messages (oldest first), newest first."""
+    if before:
+        end = next((i for i, message in enumerate(messages) if message.messageId == before), None)
+        if end is None:
+            return ErrorResponse(**{"error-code": "MESSAGE_NOT_FOUND", "message": "Message not found", "statusCode": 404})
+        messages = messages[:end]
+
+    page = messages[-limit:]
+    return MessagesResponse(messages=list(reversed(page)), hasMore=len(messages) > len(page))
+
+def _page_params(offset: int, limit: Optional[int], sort: Optional[str], query: Optional[str]) -> Dict[str, str]:
+    params = {}
+    if limit is not None:
+        params["offset"] = str(offset)
+        params["limit"] = str(limit)
+    if sort:
+        params["sort"] = sort
+    if query:
+        params["q"] = query
+    return params
+
+def _chunk_ndjson(records: List[dict], max_items: int, max_bytes: int):
+    """
+    Encode records as NDJSON lines and group them into chunks holding at most
+    max_items records and max_bytes bytes (a larger single record gets its own
+    chunk). Yields (index of the chunk's first record, encoded lines).
+    """
+    lines: List[bytes] = []
+    size = 0
+    offset = 0
+    for index, record in enumerate(records):
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        if lines and (len(lines) >= max_items or size + len(line) > max_bytes):
+            yield offset, lines
+            lines, size, offset = [], 0, index
+        lines.append(line)
+        size += len(line)
+    if lines:
+        yield offset, lines
+
+async def _stream_lines(lines: List[bytes]) -> AsyncIterator[bytes]:
+    """Request body for a batch, sent with chunked transfer encoding."""
+    piece = bytearray()
+    for line in lines:
+        piece += line
+        if len(piece) >= KB_BATCH_WRITE_SIZE:
+            yield bytes(piece)
+            piece.clear()
+    if piece:
+        yield bytes(piece)
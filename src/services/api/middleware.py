@@ -1,14 +1,22 @@
 import json
+from contextvars import ContextVar
 from fasthtml.common import RedirectResponse
 from functools import wraps
 from fastapi import Request
 from typing import Optional
 import logging
 from fasthtml.common import Redirect
+from src.services.api.session import SessionUser
 from src.services.api.types import ErrorResponse
 
 logger = logging.getLogger("vespa_app")
 
+# Set while handling a request once the backend rejects the session token
+session_expired: ContextVar[bool] = ContextVar("session_expired", default=False)
+
+def mark_session_expired():
+    session_expired.set(True)
+
 def login_required(route_handler):
     @wraps(route_handler)
     async def wrapper(request, *args, **kwargs):
@@ -20,10 +28,17 @@ def login_required(route_handler):
         if "user" not in session:
             return RedirectResponse("/login", status_code=303)
 
-        response = await route_handler(request, *args, **kwargs)
-        response_str = str(response)
+        if not isinstance(request, dict):
+            request.state.user = SessionUser.from_session(session["user"])
+
+        reset_token = session_expired.set(False)
+        try:
+            response = await route_handler(request, *args, **kwargs)
+            expired = session_expired.get()
+        finally:
+            session_expired.reset(reset_token)
 
-        if "UNAUTHORIZED" in response_str:
+        if expired:
             message = "Your session expired, please login again."
             return Redirect(f"/api/logout?message={message}")
 
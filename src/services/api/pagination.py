@@ -0,0 +1,104 @@
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit, parse_qs
+
+# Rows per page in the settings tables
+SETTINGS_PAGE_SIZE = int(os.getenv("SETTINGS_PAGE_SIZE", "50"))
+
+def _is_admin(user) -> bool:
+    return any(role.upper() == "ADMIN" for role in user.roles)
+
+# Sort keys accepted by each listing; "-key" sorts descending
+KNOWLEDGE_BASE_SORT_KEYS: Dict[str, Callable[[Any], Any]] = {
+    "title": lambda kb: kb.title.lower(),
+    "createdAt": lambda kb: kb.createdAt,
+}
+USER_SORT_KEYS: Dict[str, Callable[[Any], Any]] = {
+    # Admins first, then by username
+    "role": lambda user: ("0" if _is_admin(user) else "1", user.username.lower()),
+    "username": lambda user: user.username.lower(),
+}
+CONVERSATION_SORT_KEYS: Dict[str, Callable[[Any], Any]] = {
+    "title": lambda conversation: conversation.title.lower(),
+    "createdAt": lambda conversation: conversation.createdAt,
+    "updatedAt": lambda conversation: conversation.updatedAt,
+}
+
+KNOWLEDGE_BASE_DEFAULT_SORT = "title"
+USER_DEFAULT_SORT = "role"
+CONVERSATION_DEFAULT_SORT = "-createdAt"
+
+def parse_sort(sort: str) -> Tuple[str, bool]:
+    """Split "-title" into ("title", True)."""
+    return sort.lstrip("-"), sort.startswith("-")
+
+def paginate(
+    items: Sequence[Any],
+    offset: int,
+    limit: Optional[int],
+    sort: Optional[str],
+    sort_keys: Dict[str, Callable[[Any], Any]],
+    query: Optional[str] = None,
+    search: Callable[[Any], str] = lambda item: ""
+) -> Tuple[List[Any], int]:
+    """
+    Filter, sort and slice an in-memory listing.
+    Returns the requested page and the number of items matching the query.
+    """
+    if query:
+        needle = query.lower()
+        items = [item for item in items if needle in search(item).lower()]
+    if sort:
+        field, descending = parse_sort(sort)
+        if field in sort_keys:
+            items = sorted(items, key=sort_keys[field], reverse=descending)
+    total = len(items)
+    end = None if limit is None else offset + limit
+    return list(items[offset:end]), total
+
+@dataclass(frozen=True, slots=True)
+class PageRequest:
+    """Page, sort and filter of a settings table, read from the query string."""
+    page: int
+    sort: str
+    query: str = ""
+    page_size: int = SETTINGS_PAGE_SIZE
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.page_size
+
+    @classmethod
+    def from_request(cls, request, sort_keys: Dict[str, Callable[[Any], Any]], default_sort: str) -> "PageRequest":
+        """
+        Read page, sort and q from the request. Mutations (e.g. a row deleted
+        through HTMX) carry no query string, so fall back to the one of the
+        page they were made from.
+        """
+        params = {key: value for key, value in request.query_params.items()}
+        if not params and (current_url := request.headers.get("HX-Current-URL")):
+            params = {key: values[0] for key, values in parse_qs(urlsplit(current_url).query).items()}
+
+        try:
+            page = max(1, int(params.get("page", "1")))
+        except ValueError:
+            page = 1
+        sort = params.get("sort", default_sort)
+        if parse_sort(sort)[0] not in sort_keys:
+            sort = default_sort
+        return cls(page=page, sort=sort, query=params.get("q", "").strip())
+
+    def page_count(self, total: int) -> int:
+        return max(1, -(-total // self.page_size))
+
+    def last_page(self, total: int) -> "PageRequest":
+        return replace(self, page=self.page_count(total))
+
+    def url(self, endpoint: str, **changes) -> str:
+        """URL of this table state with some fields changed, e.g. url(endpoint, page=2)."""
+        target = replace(self, **changes)
+        params = {"page": target.page, "sort": target.sort}
+        if target.query:
+            params["q"] = target.query
+        return f"{endpoint}?{urlencode(params)}"
@@ -0,0 +1,180 @@
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("vespa_app")
+
+# Attempts per backend call, the first one included
+HTTP_RETRY_ATTEMPTS = int(os.getenv("HTTP_RETRY_ATTEMPTS", "3"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+HTTP_RETRY_MAX_BACKOFF = float(os.getenv("HTTP_RETRY_MAX_BACKOFF", "2"))
+# Consecutive failures of an endpoint after which calls to it fail fast...
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+# ...for this many seconds, before a single trial call is let through
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+# Hedged reads: a duplicate request is sent when the first has been waiting
+# longer than this percentile of the endpoint's recent latencies...
+HTTP_HEDGE_ENABLED = os.getenv("HTTP_HEDGE_ENABLED", "true").lower() == "true"
+HTTP_HEDGE_PERCENTILE = float(os.getenv("HTTP_HEDGE_PERCENTILE", "95"))
+# ...but never sooner than this many seconds...
+HTTP_HEDGE_MIN_DELAY = float(os.getenv("HTTP_HEDGE_MIN_DELAY", "0.05"))
+# ...and only once this many latencies have been seen
+HTTP_HEDGE_MIN_SAMPLES = int(os.getenv("HTTP_HEDGE_MIN_SAMPLES", "20"))
+# Hedges sent at most, as a fraction of hedgeable requests
+HTTP_HEDGE_BUDGET = float(os.getenv("HTTP_HEDGE_BUDGET", "0.05"))
+# Recent latencies kept per endpoint
+HEDGE_LATENCY_WINDOW = 256
+# Hedges that may be sent in a burst after a quiet period
+HEDGE_MAX_BURST = 10
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Safe to send twice (RFC 9110); other methods are only retried when the
+# request never reached the backend
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Failures where nothing was sent yet
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter before retry number `attempt` (1-based)."""
+    delay = min(HTTP_RETRY_MAX_BACKOFF, HTTP_RETRY_BACKOFF * (2 ** (attempt - 1)))
+    return random.uniform(0, delay)
+
+def should_retry(method: str, error: Exception = None, status_code: int = None) -> bool:
+    """Whether a failed attempt may be sent again."""
+    if isinstance(error, NOT_SENT_ERRORS):
+        return True
+    if method.upper() not in IDEMPOTENT_METHODS:
+        return False
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return status_code in TRANSIENT_STATUS_CODES
+
+def is_failure(error: Exception = None, status_code: int = None) -> bool:
+    """Whether an outcome says the backend is unhealthy, as opposed to the request being wrong."""
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return status_code is not None and status_code >= 500
+
+class CircuitBreaker:
+    """
+    Fails calls to an endpoint fast once it has failed repeatedly, instead of
+    making every page render wait for its timeouts. After reset_timeout one
+    trial call goes through; its outcome closes or reopens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == BREAKER_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = BREAKER_HALF_OPEN
+            self.trial_in_flight = False
+
+        if self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """End a call whose outcome says nothing about the backend's health."""
+        self.trial_in_flight = False
+
+    def record_success(self):
+        if self.state != BREAKER_CLOSED:
+            logger.info("Circuit breaker closed: backend endpoint recovered")
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != BREAKER_OPEN:
+                logger.warning(f"Circuit breaker opened after {self.failures} consecutive failures")
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+class LatencyTracker:
+    """Latencies of an endpoint's latest requests, to pick its hedge delay from."""
+
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW):
+        self.samples: "deque[float]" = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self.samples) < HTTP_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+class HedgeBudget:
+    """
+    Caps hedging at a fraction of the requests that could be hedged: each of
+    them earns `ratio` of a hedge, up to a small burst, and each hedge spends
+    one. While the backend is slow across the board nearly every request
+    would qualify, and hedging them all would double the load on it.
+    """
+
+    def __init__(self, ratio: float = HTTP_HEDGE_BUDGET, max_burst: float = HEDGE_MAX_BURST):
+        self.ratio = ratio
+        self.max_burst = max_burst
+        self.tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        # Hedges that answered before the request they duplicated
+        self.won = 0
+        # Hedges that were due but not sent for lack of budget
+        self.denied = 0
+
+    def deposit(self):
+        self.requests += 1
+        self.tokens = min(self.max_burst, self.tokens + self.ratio)
+
+    def spend(self) -> bool:
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.hedged += 1
+        return True
+
+    def record_win(self):
+        self.won += 1
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "won": self.won,
+            "denied": self.denied,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "win_rate": self.won / self.hedged if self.hedged else 0.0,
+        }
@@ -0,0 +1,47 @@
+import json
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional, Tuple
+
+@dataclass(frozen=True, slots=True)
+class SessionUser:
+    """The logged-in user as stored in the session cookie, parsed once."""
+    id: str
+    username: str
+    email: str
+    token: str
+    roles: Tuple[str, ...]
+    is_admin: bool
+
+    @classmethod
+    def from_session(cls, raw: Optional[str]) -> Optional["SessionUser"]:
+        if not raw:
+            return None
+        return _parse_session_user(raw)
+
+    def with_username(self, username: str) -> "SessionUser":
+        return replace(self, username=username)
+
+    def to_session(self) -> str:
+        return json.dumps({
+            "token": self.token,
+            "id": self.id,
+            "email": self.email,
+            "username": self.username,
+            "roles": list(self.roles),
+        })
+
+@lru_cache(maxsize=1024)
+def _parse_session_user(raw: str) -> SessionUser:
+    # The session cookie is the same string on every request of a session, and
+    # SessionUser is immutable, so parsed users are shared across requests
+    data = json.loads(raw)
+    roles = tuple(data.get("roles", []))
+    return SessionUser(
+        id=data.get("id"),
+        username=data.get("username"),
+        email=data.get("email"),
+        token=data.get("token"),
+        roles=roles,
+        is_admin=any(role.upper() == "ADMIN" for role in roles),
+    )
@@ -0,0 +1,78 @@
+from typing import List, Union
+
+# An event ends with a blank line; the spec allows LF, CRLF and CR line endings
+FRAME_DELIMITERS = (b"\r\n\r\n", b"\n\n", b"\r\r")
+
+# Sent ahead of the answer when the chat request created the conversation
+EVENT_CONVERSATION = "conversation"
+# Ends a stream whose answer could not be completed
+EVENT_ERROR = "error"
+# Comment frame keeping idle connections open; clients ignore it
+HEARTBEAT_FRAME = ": keep-alive\n\n"
+
+def format_event(event: str, data: str) -> str:
+    """Serialize one SSE event; multi-line data becomes one data field per line."""
+    lines = [f"event: {event}"]
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+class SSEParser:
+    """
+    Incremental Server-Sent Events framer.
+    Feed it raw byte chunks as they arrive and it returns every complete event
+    frame (including its trailing blank line), one item per event.
+
+    Framing is done on bytes before decoding. The delimiters are ASCII and never
+    occur inside a multi-byte UTF-8 sequence, so a character split across chunks
+    stays in the buffer until its frame is complete and is decoded in one piece.
+    With passthrough=True frames are returned as the untouched upstream bytes.
+    """
+
+    def __init__(self, passthrough: bool = False):
+        self.passthrough = passthrough
+        self._buffer = bytearray()
+        # Offset up to which the buffer is known not to contain a delimiter
+        self._scanned = 0
+
+    def feed(self, chunk: bytes) -> List[Union[str, bytes]]:
+        self._buffer += chunk
+        frames = []
+        start = 0
+        # Next position of each delimiter, reused until a frame consumes it
+        found = {}
+        while True:
+            end = self._find_frame_end(start, found)
+            if end < 0:
+                break
+            frame = memoryview(self._buffer)[start:end]
+            frames.append(bytes(frame) if self.passthrough else str(frame, "utf-8"))
+            frame.release()
+            start = end
+
+        if start:
+            del self._buffer[:start]
+        # A delimiter may straddle the next chunk, so rescan its last bytes
+        self._scanned = max(len(self._buffer) - 3, 0)
+        return frames
+
+    def flush(self) -> bytes:
+        """
+        Drop and return whatever incomplete frame is left at end of stream.
+        Per the SSE spec an event without its terminating blank line is discarded.
+        """
+        remainder = bytes(self._buffer)
+        self._buffer.clear()
+        self._scanned = 0
+        return remainder
+
+    def _find_frame_end(self, start: int, found: dict) -> int:
+        search_from = max(start, self._scanned)
+        end = -1
+        for delimiter in FRAME_DELIMITERS:
+            index = found.get(delimiter)
+            # -1 stays valid, as the buffer does not grow during a feed
+            if index is None or 0 <= index < start:
+                index = found[delimiter] = self._buffer.find(delimiter, search_from)
+            if index >= 0 and (end < 0 or index + len(delimiter) < end):
+                end = index + len(delimiter)
+        return end
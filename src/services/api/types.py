@@ -52,10 +52,18 @@ class Conversation(BaseModel):
 
 class ConversationsResponse(BaseModel):
     conversations: List[Conversation]
+    # Number of conversations matching the query, when the listing is paged
+    total: Optional[int] = None
+
+class MessagesResponse(BaseModel):
+    # Newest first
+    messages: List[ChatMessage]
+    hasMore: bool
 
 NewConversationResult = Union[NewConversationResponse, ErrorResponse]
 ConversationResult = Union[Conversation, ErrorResponse]
 ConversationsResult = Union[ConversationsResponse, ErrorResponse]
+MessagesResult = Union[MessagesResponse, ErrorResponse]
 
 class User(BaseModel):
     id: str
@@ -66,6 +74,8 @@ class User(BaseModel):
 
 class UsersResponse(BaseModel):
     users: List[User]
+    # Number of users matching the query, when the listing is paged
+    total: Optional[int] = None
 
 UserResult = Union[User, ErrorResponse]
 UsersResult = Union[UsersResponse, ErrorResponse]
@@ -83,6 +93,22 @@ class KnowledgeBase(BaseModel):
 
 class KnowledgeBasesResponse(BaseModel):
     knowledgeBases: List[KnowledgeBase]
+    # Number of knowledge bases matching the query, when the listing is paged
+    total: Optional[int] = None
 
 KnowledgeBasesResult = Union[KnowledgeBasesResponse, ErrorResponse]
 KnowledgeBaseResult = Union[KnowledgeBase, ErrorResponse]
+
+class BatchItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str
+    message: Optional[str] = None
+
+class BatchActionResponse(BaseModel):
+    results: List[BatchItemResult]
+    # Set when the token was rejected part way; the items not sent by then
+    # are reported as errors
+    error: Optional[ErrorResponse] = None
+
+BatchActionResult = Union[BatchActionResponse, ErrorResponse]
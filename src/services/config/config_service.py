@@ -1,23 +1,115 @@
+import asyncio
 import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Awaitable, Callable, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+logger = logging.getLogger("vespa_app")
+
+# How often the watcher checks config.json for writes made by other workers
+CONFIG_POLL_INTERVAL = float(os.getenv("CONFIG_POLL_INTERVAL", "2"))
+# Permissions of a newly created config.json; a rewrite keeps the file's own
+CONFIG_FILE_MODE = 0o644
 
 class ConfigService:
+    """
+    Application settings backed by config/config.json.
+    Reads are served from an in-memory snapshot; the file is only touched on
+    updates and by the watcher, which reloads the snapshot when another worker
+    process rewrites the file. Both take a file lock and run in a worker
+    thread, so waiting on another process never blocks the event loop.
+    """
+
     def __init__(self):
         self.config_file = Path("config/config.json")
+        self.lock_file = self.config_file.with_suffix(".lock")
         self.config_file.parent.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[dict], Awaitable[None]]] = []
         if not self.config_file.exists():
             self._save({"connection_endpoint": ""})
+        self._snapshot, self._mtime = self._load()
+
+    @contextmanager
+    def _file_lock(self):
+        with self._lock, open(self.lock_file, "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
 
     def _save(self, config: dict):
-        self.config_file.write_text(json.dumps(config, indent=2))
+        # Write to a temp file and rename it over the original so readers never
+        # see a partially written file
+        try:
+            mode = self.config_file.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = CONFIG_FILE_MODE
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as tmp:
+                tmp.write(json.dumps(config, indent=2))
+            # mkstemp creates the file readable by its owner only
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.config_file)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
 
-    def _load(self) -> dict:
-        return json.loads(self.config_file.read_text())
+    def _load(self):
+        mtime = self.config_file.stat().st_mtime_ns
+        return json.loads(self.config_file.read_text()), mtime
 
     def get_connection_endpoint(self) -> str:
-        return self._load().get("connection_endpoint", "")
+        return self._snapshot.get("connection_endpoint", "")
+
+    async def update_connection_endpoint(self, endpoint: str):
+        await asyncio.to_thread(self._update_connection_endpoint, endpoint)
+
+    def _update_connection_endpoint(self, endpoint: str):
+        with self._file_lock():
+            config, _ = self._load()
+            config["connection_endpoint"] = endpoint
+            self._save(config)
+            self._snapshot, self._mtime = config, self.config_file.stat().st_mtime_ns
+
+    def on_change(self, listener: Callable[[dict], Awaitable[None]]):
+        """Register a coroutine called with the new config after an external change."""
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtime = self.config_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        with self._file_lock():
+            previous = self._snapshot
+            self._snapshot, self._mtime = self._load()
+        return self._snapshot != previous
 
-    def update_connection_endpoint(self, endpoint: str):
-        config = self._load()
-        config["connection_endpoint"] = endpoint
-        self._save(config)
\ No newline at end of file
+    async def watch(self):
+        """Poll config.json and notify listeners when another process changed it."""
+        while True:
+            await asyncio.sleep(CONFIG_POLL_INTERVAL)
+            try:
+                if await asyncio.to_thread(self.reload_if_changed):
+                    logger.info("Configuration changed on disk, reloading")
+                    for listener in self._listeners:
+                        await listener(self._snapshot)
+            except Exception as e:
+                logger.error(f"Error reloading configuration: {str(e)}")
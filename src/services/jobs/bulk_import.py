@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger("vespa_app")
+
+# Batches being sent at once, and rows read from the upload per batch
+BULK_IMPORT_CONCURRENCY = int(os.getenv("BULK_IMPORT_CONCURRENCY", "4"))
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "200"))
+# Finished jobs kept around so their results can still be polled
+BULK_IMPORT_MAX_JOBS = int(os.getenv("BULK_IMPORT_MAX_JOBS", "100"))
+
+ROW_PENDING = "pending"
+ROW_CREATED = "created"
+ROW_FAILED = "failed"
+
+JOB_RUNNING = "running"
+JOB_FINISHED = "finished"
+
+class RowResult:
+    __slots__ = ("index", "title", "status", "message")
+
+    def __init__(self, index: int, title: str):
+        self.index = index
+        self.title = title
+        self.status = ROW_PENDING
+        self.message = None
+
+class BulkImportJob:
+    def __init__(self, job_id: str, owner_id: str):
+        self.id = job_id
+        self.owner_id = owner_id
+        self.status = JOB_RUNNING
+        self.results: List[RowResult] = []
+        # Unknown while rows are still being read from the upload
+        self.total: Optional[int] = None
+        self.created = 0
+        self.failed = 0
+        # Set when the upload itself could not be read to its end
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.failed
+
+    @property
+    def finished(self) -> bool:
+        return self.status == JOB_FINISHED
+
+    def failures(self) -> List[RowResult]:
+        return [row for row in self.results if row.status == ROW_FAILED]
+
+class BulkImportManager:
+    """
+    Runs knowledge base bulk imports as background jobs.
+    Rows are read in batches and created with the client's batch call, a
+    bounded number of batches at a time. Creating rows is not idempotent, so
+    the client only retries requests that were never sent, and a batch is not
+    sent again. Every row's outcome is kept on the job.
+    """
+
+    def __init__(
+        self,
+        client,
+        concurrency: int = BULK_IMPORT_CONCURRENCY,
+        batch_size: int = BULK_IMPORT_BATCH_SIZE
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self._jobs: "OrderedDict[str, BulkImportJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(
+        self,
+        rows: Union[Iterable[Dict[str, str]], AsyncIterable[Dict[str, str]]],
+        token: str,
+        owner_id: str
+    ) -> BulkImportJob:
+        """
+        Start importing rows in the background. Rows may be an async iterator,
+        which is only advanced when a worker is free to create the next row.
+        """
+        job = BulkImportJob(os.urandom(8).hex(), owner_id)
+        if isinstance(rows, list):
+            job.total = len(rows)
+        self._jobs[job.id] = job
+        while len(self._jobs) > BULK_IMPORT_MAX_JOBS:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.finished:
+                break
+            del self._jobs[oldest_id]
+
+        task = asyncio.create_task(self._run(job, rows, token))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        logger.info(f"Started bulk import job {job.id}")
+        return job
+
+    def get(self, job_id: str, owner_id: str) -> Optional[BulkImportJob]:
+        job = self._jobs.get(job_id)
+        if job is None or job.owner_id != owner_id:
+            return None
+        return job
+
+    async def close(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    async def _run(self, job: BulkImportJob, rows, token: str):
+        pending = rows.__aiter__() if hasattr(rows, "__aiter__") else _as_async_iterator(rows)
+        read_lock = asyncio.Lock()
+
+        async def worker():
+            # Workers pull batches from one shared iterator, so at most
+            # `concurrency` batches are in flight and the source is read no
+            # faster than that
+            while True:
+                rows: List[RowResult] = []
+                batch: List[Dict[str, str]] = []
+                async with read_lock:
+                    while job.error is None and len(batch) < self.batch_size:
+                        try:
+                            kb_data = await pending.__anext__()
+                        except StopAsyncIteration:
+                            break
+                        except Exception as e:
+                            # The rest of the upload is unreadable; rows already
+                            # read are still sent
+                            logger.error(f"Bulk import job {job.id} stopped reading its upload: {str(e)}")
+                            job.error = str(e)
+                            break
+                        row = RowResult(len(job.results), kb_data["title"])
+                        job.results.append(row)
+                        rows.append(row)
+                        batch.append(kb_data)
+                if not batch:
+                    return
+                await self._create_batch(job, rows, batch, token)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            job.total = len(job.results)
+        except Exception as e:
+            logger.error(f"Bulk import job {job.id} failed: {str(e)}")
+            job.error = str(e)
+        finally:
+            # No worker may touch the job once it is reported finished
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for row in job.results:
+                if row.status == ROW_PENDING:
+                    row.status = ROW_FAILED
+                    row.message = "The import stopped before this row was confirmed"
+                    job.failed += 1
+            job.status = JOB_FINISHED
+            job.finished_at = time.time()
+            logger.info(
+                f"Bulk import job {job.id} finished: {job.created} created, {job.failed} failed "
+                f"in {job.finished_at - job.started_at:.1f}s"
+            )
+
+    async def _create_batch(self, job: BulkImportJob, rows: List[RowResult], batch: List[Dict[str, str]], token: str):
+        try:
+            response = await self.client.create_knowledge_bases_batch(batch, token)
+        except Exception as e:
+            # The rows may have been created; they are not sent again
+            self._fail_rows(job, rows, str(e) or e.__class__.__name__)
+            return
+
+        for item in response.results:
+            if not 0 <= item.index < len(rows) or rows[item.index].status != ROW_PENDING:
+                continue
+            row = rows[item.index]
+            if item.status == "success":
+                row.status = ROW_CREATED
+                job.created += 1
+            else:
+                row.status = ROW_FAILED
+                row.message = item.message
+                job.failed += 1
+        self._fail_rows(job, rows, "The backend returned no result for this row")
+
+        if response.error is not None:
+            # The token was rejected; the other batches would be too
+            logger.error(f"Bulk import job {job.id} stopped: {response.error.message}")
+            job.error = response.error.message
+
+    @staticmethod
+    def _fail_rows(job: BulkImportJob, rows: List[RowResult], message: str):
+        """Mark the rows of a batch still pending as failed."""
+        for row in rows:
+            if row.status == ROW_PENDING:
+                row.status = ROW_FAILED
+                row.message = message
+                job.failed += 1
+
+async def _as_async_iterator(rows: Iterable[Dict[str, str]]):
+    for row in rows:
+        yield row
@@ -0,0 +1,335 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.services.api.sse import EVENT_ERROR, HEARTBEAT_FRAME, format_event
+
+logger = logging.getLogger("vespa_app")
+
+# Frames of each answer kept for replay; older ones can no longer be resumed from
+CHAT_STREAM_BUFFER_SIZE = int(os.getenv("CHAT_STREAM_BUFFER_SIZE", "2048"))
+# Seconds a finished answer stays available to clients reconnecting late
+CHAT_STREAM_RETENTION = float(os.getenv("CHAT_STREAM_RETENTION", "60"))
+# Conversations with a buffered answer kept at most
+CHAT_STREAM_MAX_STREAMS = int(os.getenv("CHAT_STREAM_MAX_STREAMS", "1000"))
+# Seconds an answer keeps being generated with nobody reading it, so that a
+# client that lost its connection has time to resume before it is cancelled
+CHAT_STREAM_DISCONNECT_GRACE = float(os.getenv("CHAT_STREAM_DISCONNECT_GRACE", "10"))
+# How often a subscriber waiting for frames checks that its client is still there
+CHAT_STREAM_DISCONNECT_POLL = float(os.getenv("CHAT_STREAM_DISCONNECT_POLL", "1"))
+# Seconds without frames after which a keep-alive comment is sent, so load
+# balancers do not drop connections waiting for a slow first token
+CHAT_STREAM_HEARTBEAT_INTERVAL = float(os.getenv("CHAT_STREAM_HEARTBEAT_INTERVAL", "15"))
+# An answer is given up when the backend sends no event for this long...
+CHAT_STREAM_IDLE_TIMEOUT = float(os.getenv("CHAT_STREAM_IDLE_TIMEOUT", "120"))
+# ...or has not finished after this long
+CHAT_STREAM_MAX_DURATION = float(os.getenv("CHAT_STREAM_MAX_DURATION", "600"))
+
+def parse_event_id(event_id: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Split a "<turn>-<sequence>" event id; None if it is not one of ours."""
+    if not event_id:
+        return None
+    turn_id, _, seq = event_id.strip().rpartition("-")
+    if not turn_id or not seq.isdigit():
+        return None
+    return turn_id, int(seq)
+
+class ChatStream:
+    """
+    One answer being streamed from the backend. Every frame gets an SSE id of
+    the form "<turn>-<sequence>" and the latest ones are kept in a ring
+    buffer, so a client that lost its connection can pick up where it was
+    and other tabs on the conversation can follow the same answer.
+    """
+
+    def __init__(
+        self,
+        conversation_id: str,
+        owner_id: str,
+        text: str,
+        buffer_size: int = CHAT_STREAM_BUFFER_SIZE
+    ):
+        self.id = os.urandom(8).hex()
+        self.conversation_id = conversation_id
+        self.owner_id = owner_id
+        # The prompt being answered
+        self.text = text
+        # (sequence, frame) pairs, oldest first
+        self.frames: "deque[Tuple[int, str]]" = deque(maxlen=buffer_size)
+        self.next_seq = 0
+        self.finished = False
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.subscribers = 0
+        # Set when the answer is being cancelled, see ChatStreamManager._pump
+        self.cancelled = False
+        self.idle_since: Optional[float] = time.monotonic()
+        # Called when the last subscriber leaves an unfinished answer
+        self.on_idle: Optional[Callable[["ChatStream"], None]] = None
+        self._changed = asyncio.Condition()
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.id}-{seq}"
+
+    async def append(self, frame: str):
+        seq = self.next_seq
+        self.next_seq += 1
+        self.frames.append((seq, f"id: {self.event_id(seq)}\n{frame}"))
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def finish(self):
+        self.finished = True
+        self.finished_at = time.time()
+        async with self._changed:
+            self._changed.notify_all()
+
+    def can_resume_after(self, seq: int) -> bool:
+        """Whether every frame after seq is still buffered."""
+        oldest = self.frames[0][0] if self.frames else self.next_seq
+        return oldest <= seq + 1 <= self.next_seq
+
+    async def subscribe(
+        self,
+        after: int = -1,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield the buffered frames following sequence number `after`, then new
+        ones as they arrive, until the answer is complete. Ends early if the
+        subscriber falls so far behind that frames it has not seen yet were
+        dropped from the buffer; it can then resume from the last one it got.
+        While waiting, is_disconnected is polled so that a client that went
+        away is noticed even when no frame is being written to it, and
+        keep-alive comments are sent between frames when they are far apart.
+        """
+        self.subscribers += 1
+        self.idle_since = None
+        last_write = time.monotonic()
+        try:
+            next_seq = after + 1
+            while True:
+                heartbeat = False
+                async with self._changed:
+                    while next_seq >= self.next_seq and not self.finished:
+                        try:
+                            await asyncio.wait_for(self._changed.wait(), CHAT_STREAM_DISCONNECT_POLL)
+                        except asyncio.TimeoutError:
+                            if is_disconnected is not None and await is_disconnected():
+                                logger.debug(f"Client of chat stream {self.id} disconnected")
+                                return
+                            if time.monotonic() - last_write >= CHAT_STREAM_HEARTBEAT_INTERVAL:
+                                heartbeat = True
+                                break
+
+                if heartbeat:
+                    yield HEARTBEAT_FRAME
+                    last_write = time.monotonic()
+                    continue
+
+                oldest = self.frames[0][0] if self.frames else self.next_seq
+                if next_seq < oldest:
+                    logger.warning(f"Subscriber of chat stream {self.id} fell behind its buffer")
+                    return
+                pending = list(itertools.islice(self.frames, next_seq - oldest, None))
+                if not pending:
+                    return
+
+                for seq, frame in pending:
+                    yield frame
+                next_seq = pending[-1][0] + 1
+                last_write = time.monotonic()
+        finally:
+            self.subscribers -= 1
+            if not self.subscribers:
+                self.idle_since = time.monotonic()
+                if not self.finished and self.on_idle is not None:
+                    self.on_idle(self)
+
+class ChatStreamManager:
+    """
+    Runs each chat answer as a background task pumping the backend stream
+    into a ChatStream, independently of the HTTP responses reading from it.
+    A dropped connection no longer abandons the backend call, and the client
+    can reconnect and have the missed frames replayed. The streams are kept
+    per conversation, so every tab showing one shares a single backend call:
+    the first request starts it and later ones attach to it.
+    """
+
+    def __init__(
+        self,
+        client,
+        buffer_size: int = CHAT_STREAM_BUFFER_SIZE,
+        disconnect_grace: float = CHAT_STREAM_DISCONNECT_GRACE
+    ):
+        self.client = client
+        self.buffer_size = buffer_size
+        self.disconnect_grace = disconnect_grace
+        # Latest answer of each conversation, least recently started first
+        self._streams: "OrderedDict[str, ChatStream]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        # Requests served from an answer another one had already started
+        self.attached = 0
+        self.completed = 0
+        self.failed = 0
+        # Answers stopped because no client was reading them any more
+        self.cancelled = 0
+        # Answers given up on for exceeding the idle or total deadline
+        self.timed_out = 0
+
+    def start(
+        self,
+        conversation_id: str,
+        owner_id: str,
+        llm_id: str,
+        text: str,
+        token: str,
+        preamble: Iterable[str] = ()
+    ) -> Optional[ChatStream]:
+        """
+        Start streaming an answer; preamble frames are sent ahead of it.
+        The same prompt sent again while it is being answered, e.g. from
+        another tab, gets the running stream instead of a second backend call.
+        Returns None if the conversation is receiving an answer to another one.
+        """
+        self._prune()
+        current = self._streams.get(conversation_id)
+        if current is not None and not current.finished:
+            if current.owner_id == owner_id and current.text == text:
+                logger.debug(f"Attaching to chat stream {current.id} for conversation {conversation_id}")
+                self.attached += 1
+                return current
+            return None
+
+        stream = ChatStream(conversation_id, owner_id, text, self.buffer_size)
+        stream.on_idle = self._schedule_cancel
+        self._streams[conversation_id] = stream
+        self._streams.move_to_end(conversation_id)
+
+        task = asyncio.create_task(self._pump(stream, llm_id, text, token, list(preamble)))
+        self._tasks[stream.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(stream.id, None))
+        self.started += 1
+        logger.debug(f"Started chat stream {stream.id} for conversation {conversation_id}")
+        return stream
+
+    def get(self, conversation_id: str, owner_id: str) -> Optional[ChatStream]:
+        stream = self._streams.get(conversation_id)
+        if stream is None or stream.owner_id != owner_id:
+            return None
+        return stream
+
+    def active(self, conversation_id: str, owner_id: str) -> Optional[ChatStream]:
+        """The answer still being generated for a conversation, if any."""
+        stream = self.get(conversation_id, owner_id)
+        if stream is None or stream.finished:
+            return None
+        return stream
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of chat answers, by how they ended."""
+        return {
+            "active": len(self._tasks),
+            "started": self.started,
+            "attached": self.attached,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "timed_out": self.timed_out,
+        }
+
+    async def close(self):
+        for stream in list(self._streams.values()):
+            self._cancel(stream)
+
+    def _cancel(self, stream: ChatStream):
+        task = self._tasks.get(stream.id)
+        if task is None:
+            return
+        stream.cancelled = True
+        task.cancel()
+
+    def _schedule_cancel(self, stream: ChatStream):
+        asyncio.get_running_loop().call_later(self.disconnect_grace, self._cancel_if_idle, stream)
+
+    def _cancel_if_idle(self, stream: ChatStream):
+        # A client may have resumed, or left again later, in the meantime
+        if stream.finished or stream.idle_since is None:
+            return
+        if time.monotonic() - stream.idle_since < self.disconnect_grace:
+            return
+
+        if stream.id not in self._tasks:
+            return
+        logger.info(f"Cancelling chat stream {stream.id}: no client for {self.disconnect_grace:g}s")
+        self.cancelled += 1
+        self._cancel(stream)
+
+    def _prune(self):
+        now = time.time()
+        for conversation_id, stream in list(self._streams.items()):
+            expired = stream.finished and now - stream.finished_at > CHAT_STREAM_RETENTION
+            if expired or (len(self._streams) > CHAT_STREAM_MAX_STREAMS and stream.finished):
+                del self._streams[conversation_id]
+
+    async def _pump(self, stream: ChatStream, llm_id: str, text: str, token: str, preamble):
+        upstream = self.client.stream_conversation(
+            llm_id=llm_id,
+            text=text,
+            token=token,
+            conversation_id=stream.conversation_id
+        )
+        deadline = time.monotonic() + CHAT_STREAM_MAX_DURATION
+        try:
+            for frame in preamble:
+                await stream.append(frame)
+            received = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    frame = await asyncio.wait_for(
+                        upstream.__anext__(),
+                        min(CHAT_STREAM_IDLE_TIMEOUT, max(remaining, 0))
+                    )
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    self.timed_out += 1
+                    if remaining <= CHAT_STREAM_IDLE_TIMEOUT:
+                        logger.warning(f"Chat stream {stream.id} exceeded {CHAT_STREAM_MAX_DURATION:g}s")
+                        message = "The answer took too long and was stopped."
+                    else:
+                        logger.warning(f"Chat stream {stream.id} received nothing for {CHAT_STREAM_IDLE_TIMEOUT:g}s")
+                        message = "The assistant stopped responding. Please try again."
+                    await stream.append(format_event(EVENT_ERROR, message))
+                    return
+                # Before Python 3.12, wait_for returns the frame and drops the
+                # cancellation when both happen at once; the answer would then
+                # be read from the backend to the end
+                if stream.cancelled:
+                    raise asyncio.CancelledError()
+                received += 1
+                await stream.append(frame)
+
+            # The client logs and returns nothing when the backend refuses the request
+            if not received:
+                self.failed += 1
+                await stream.append(format_event(EVENT_ERROR, "The assistant could not answer. Please try again."))
+            else:
+                self.completed += 1
+        except asyncio.CancelledError:
+            await stream.append(format_event(EVENT_ERROR, "The answer was cancelled."))
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Chat stream {stream.id} failed: {str(e)}")
+            await stream.append(format_event(EVENT_ERROR, "The assistant stopped responding. Please try again."))
+        finally:
+            # Closing the generator closes the backend response and its connection
+            await upstream.aclose()
+            await stream.finish()
@@ -0,0 +1,116 @@
+import codecs
+import csv
+import re
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional
+
+CSV_READ_CHUNK_SIZE = 64 * 1024
+REQUIRED_COLUMNS = ("Title", "Content")
+# Splits after each line break. Only CRLF, LF and CR end a CSV line; str.splitlines
+# would also break on characters like U+2028 or form feeds inside a field
+LINE_BREAK = re.compile(r"(?<=\r\n)|(?<=\n)|(?<=\r)(?!\n)")
+
+class _LineFeed:
+    """Iterator handed to csv.reader; it only ever holds complete records."""
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+class CsvRecordStream:
+    """
+    Reads CSV records from an upload in fixed-size chunks.
+    Bytes go through an incremental UTF-8 decoder and lines are grouped into
+    records (a quoted field may span lines) before being parsed, so only the
+    current chunk and record are held in memory.
+    """
+
+    def __init__(self, file, chunk_size: int = CSV_READ_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._feed = _LineFeed()
+        self._reader = csv.reader(self._feed)
+        self._partial_line = ""
+        self._record_lines: List[str] = []
+        self._record_quotes = 0
+        self._records = deque()
+        self._eof = False
+
+    async def next_record(self) -> Optional[List[str]]:
+        """The next record, or None at the end; ValueError if the file is malformed."""
+        while not self._records:
+            if self._eof:
+                return None
+            try:
+                await self._read_chunk()
+            except UnicodeDecodeError:
+                raise ValueError("The file is not valid UTF-8 text")
+            except csv.Error as e:
+                raise ValueError(f"The file is not valid CSV: {str(e)}")
+        return self._records.popleft()
+
+    async def _read_chunk(self):
+        chunk = await self.file.read(self.chunk_size)
+        if chunk:
+            text = self._partial_line + self._decoder.decode(chunk)
+            lines = LINE_BREAK.split(text)
+            # The last line may continue in the next chunk, and so may a CR
+            # ending the chunk, as the first half of a CRLF
+            self._partial_line = lines.pop()
+            if not self._partial_line and lines and lines[-1].endswith("\r"):
+                self._partial_line = lines.pop()
+        else:
+            self._eof = True
+            lines = [self._partial_line + self._decoder.decode(b"", final=True)]
+            self._partial_line = ""
+
+        for line in lines:
+            if not line:
+                continue
+            self._record_lines.append(line)
+            # A record ends at a line break outside quotes; escaped quotes come
+            # in pairs, so an even quote count means no field is left open
+            self._record_quotes += line.count('"')
+            if self._record_quotes % 2 == 0:
+                self._parse_record()
+
+        if self._eof and self._record_lines:
+            self._parse_record()
+
+    def _parse_record(self):
+        self._feed.lines.extend(self._record_lines)
+        self._record_lines = []
+        self._record_quotes = 0
+        for record in self._reader:
+            if record:
+                self._records.append(record)
+
+async def open_knowledge_base_csv(file) -> AsyncIterator[Dict[str, str]]:
+    """
+    Validate the CSV header and return an async iterator over knowledge base rows.
+    Raises ValueError right away if the required columns are missing.
+    """
+    stream = CsvRecordStream(file)
+    header = await stream.next_record()
+    if not header or any(column not in header for column in REQUIRED_COLUMNS):
+        raise ValueError("CSV must have 'Title' and 'Content' columns")
+    title_index = header.index("Title")
+    content_index = header.index("Content")
+
+    async def rows():
+        while (record := await stream.next_record()) is not None:
+            record += [""] * (len(header) - len(record))
+            yield {
+                "title": record[title_index],
+                "content": record[content_index],
+            }
+
+    return rows()
@@ -1,12 +1,14 @@
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, Header, Path, Body
+from fastapi import FastAPI, HTTPException, Header, Path, Body, Request, Query
 from fastapi.responses import StreamingResponse, JSONResponse
 from typing import Dict, Optional
 import uvicorn
 import os
 import logging
 import asyncio
-from src.services.api.types import AuthResponse, AuthResult, ErrorResponse, User, ConversationRequest, NewConversationResponse, Conversation, ChatMessage, ConversationsResponse, UsersResponse, User, ConversationResult, ConversationsResult, LLM, LLMsResponse, LLMsResult, NewConversationResult, UserResult, GenericActionResponse, GenericActionResult, UsersResult, KnowledgeBase, KnowledgeBasesResponse, KnowledgeBasesResult, KnowledgeBaseResult
+import json
+from src.services.api.pagination import paginate, KNOWLEDGE_BASE_SORT_KEYS, USER_SORT_KEYS
+from src.services.api.types import AuthResponse, AuthResult, ErrorResponse, User, ConversationRequest, NewConversationResponse, Conversation, ChatMessage, ConversationsResponse, UsersResponse, User, ConversationResult, ConversationsResult, LLM, LLMsResponse, LLMsResult, NewConversationResult, UserResult, GenericActionResponse, GenericActionResult, UsersResult, KnowledgeBase, KnowledgeBasesResponse, KnowledgeBasesResult, KnowledgeBaseResult, BatchItemResult, BatchActionResponse, BatchActionResult, MessagesResponse, MessagesResult
 
 app = FastAPI(title="Mock Vespa Agent API")
 logger = logging.getLogger("vespa_app")
@@ -176,6 +178,30 @@ async def get_conversation(
     logger.debug(f"Mock: [GET_CONVERSATION] {conversation.conversationId}")
     return conversation
 
+@app.get("/assistant/conversations/{conversation_id}/messages")
+async def get_conversation_messages(
+    conversation_id: str = Path(...),
+    before: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    authorization: str = Header(None)
+) -> MessagesResult:
+    if not verify_token(authorization):
+        return raise_error("UNAUTHORIZED", "Cannot get messages: Missing or invalid authorization token", 401)
+
+    conversation = next((c for c in mock_conversations if c.conversationId == conversation_id), None)
+    if not conversation:
+        return raise_error("CONVERSATION_NOT_FOUND", "Conversation not found", 404)
+
+    messages = conversation.messages or []
+    if before:
+        end = next((i for i, message in enumerate(messages) if message.messageId == before), None)
+        if end is None:
+            return raise_error("MESSAGE_NOT_FOUND", "Message not found", 404)
+        messages = messages[:end]
+
+    page = messages[-limit:]
+    return MessagesResponse(messages=list(reversed(page)), hasMore=len(messages) > len(page))
+
 @app.delete("/assistant/conversations/{conversation_id}")
 async def delete_conversation(
     conversation_id: str = Path(...),
@@ -210,7 +236,13 @@ async def delete_all_conversations(authorization: str = Header(None)) -> Generic
     )
 
 @app.get("/assistant/users")
-async def get_users(authorization: Optional[str] = Header(None)) -> UsersResult:
+async def get_users(
+    authorization: Optional[str] = Header(None),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    sort: Optional[str] = Query(None),
+    q: Optional[str] = Query(None)
+) -> UsersResult:
     global mock_users
 
     if not verify_token(authorization):
@@ -225,7 +257,11 @@ async def get_users(authorization: Optional[str] = Header(None)) -> UsersResult:
             createdAt=user.get("createdAt", "2024-01-01T00:00:00Z")
         ) for user in mock_users
     ]
-    return UsersResponse(users=users)
+    users, total = paginate(
+        users, offset, limit, sort, USER_SORT_KEYS, q,
+        search=lambda user: f"{user.username} {user.email}"
+    )
+    return UsersResponse(users=users, total=total)
 
 @app.get("/assistant/users/{user_id}")
 async def get_user(
@@ -274,7 +310,7 @@ async def delete_user(
 @app.put("/assistant/users/{user_id}")
 async def edit_user(
     user_id: str = Path(...),
-    user_data: str = Body(...),
+    user_data: dict = Body(...),
     authorization: str = Header(None)
 ) -> GenericActionResult:
     global mock_users
@@ -354,11 +390,110 @@ def get_knowledge_base_by_id(kb_id: str) -> Optional[KnowledgeBase]:
     return knowledge_base
 
 @app.get("/assistant/knowledge-base")
-async def get_knowledge_bases(authorization: Optional[str] = Header(None)) -> KnowledgeBasesResult:
+async def get_knowledge_bases(
+    authorization: Optional[str] = Header(None),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    sort: Optional[str] = Query(None),
+    q: Optional[str] = Query(None)
+) -> KnowledgeBasesResult:
     if not verify_token(authorization):
         return raise_error("UNAUTHORIZED", "Cannot get knowledge base: Missing or invalid authorization token", 401)
 
-    return KnowledgeBasesResponse(knowledgeBases=mock_knowledge_bases)
+    knowledge_bases, total = paginate(
+        mock_knowledge_bases, offset, limit, sort, KNOWLEDGE_BASE_SORT_KEYS, q,
+        search=lambda kb: kb.title
+    )
+    return KnowledgeBasesResponse(knowledgeBases=knowledge_bases, total=total)
+
+async def read_ndjson(request: Request):
+    """Parse an NDJSON request body as it arrives."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        yield json.loads(buffer)
+
+@app.post("/assistant/knowledge-base/batch")
+async def create_knowledge_bases_batch(
+    request: Request,
+    authorization: str = Header(None)
+) -> BatchActionResult:
+    if not verify_token(authorization):
+        return raise_error("UNAUTHORIZED", "Cannot create knowledge bases: Missing or invalid authorization token", 401)
+
+    results = []
+    index = 0
+    async for kb_data in read_ndjson(request):
+        missing_fields = [field for field in ["title", "content"] if field not in kb_data]
+        if missing_fields:
+            results.append(BatchItemResult(index=index, status="error", message=f"Missing required fields: {', '.join(missing_fields)}"))
+        else:
+            new_mock_kb = KnowledgeBase(
+                id=get_random_id(),
+                title=kb_data["title"],
+                content=kb_data["content"],
+                createdAt="2024-03-01T10:00:00Z"
+            )
+            mock_knowledge_bases.append(new_mock_kb)
+            results.append(BatchItemResult(index=index, id=new_mock_kb.id, status="success"))
+        index += 1
+
+    return BatchActionResponse(results=results)
+
+@app.put("/assistant/knowledge-base/batch")
+async def edit_knowledge_bases_batch(
+    request: Request,
+    authorization: str = Header(None)
+) -> BatchActionResult:
+    if not verify_token(authorization):
+        return raise_error("UNAUTHORIZED", "Cannot edit knowledge bases: Missing or invalid authorization token", 401)
+
+    knowledge_bases_by_id = {kb.id: kb for kb in mock_knowledge_bases}
+    results = []
+    index = 0
+    async for kb_data in read_ndjson(request):
+        kb = knowledge_bases_by_id.get(kb_data.get("id"))
+        if not kb:
+            results.append(BatchItemResult(index=index, id=kb_data.get("id"), status="error", message="Knowledge base not found"))
+        else:
+            kb.title = kb_data["title"]
+            kb.content = kb_data["content"]
+            results.append(BatchItemResult(index=index, id=kb.id, status="success"))
+        index += 1
+
+    return BatchActionResponse(results=results)
+
+@app.post("/assistant/knowledge-base/batch/delete")
+async def delete_knowledge_bases_batch(
+    request: Request,
+    authorization: str = Header(None)
+) -> BatchActionResult:
+    global mock_knowledge_bases
+
+    if not verify_token(authorization):
+        return raise_error("UNAUTHORIZED", "Cannot delete knowledge bases: Missing or invalid authorization token", 401)
+
+    existing_ids = {kb.id for kb in mock_knowledge_bases}
+    deleted_ids = set()
+    results = []
+    index = 0
+    async for kb_data in read_ndjson(request):
+        kb_id = kb_data.get("id")
+        if kb_id not in existing_ids or kb_id in deleted_ids:
+            results.append(BatchItemResult(index=index, id=kb_id, status="error", message="Knowledge base not found"))
+        else:
+            deleted_ids.add(kb_id)
+            results.append(BatchItemResult(index=index, id=kb_id, status="success"))
+        index += 1
+
+    mock_knowledge_bases = [kb for kb in mock_knowledge_bases if kb.id not in deleted_ids]
+
+    return BatchActionResponse(results=results)
 
 @app.get("/assistant/knowledge-base/{kb_id}")
 async def get_knowledge_base(
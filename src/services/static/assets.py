@@ -0,0 +1,162 @@
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("vespa_app")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Files smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+# Already fingerprinted by build_assets.py, e.g. app.0123456789ab.css
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^.]+$")
+
+class StaticAsset:
+    __slots__ = ("content_type", "etag", "variants", "immutable")
+
+    def __init__(self, content_type: str, etag: str, variants: Dict[str, bytes], immutable: bool):
+        self.content_type = content_type
+        self.etag = etag
+        # Encoding ("identity", "gzip", "br") -> body
+        self.variants = variants
+        self.immutable = immutable
+
+class AssetIndex:
+    """
+    Every file under the static directory, loaded into memory at startup.
+    Each asset is reachable under its plain path, which browsers revalidate
+    with ETags, and under a content-hashed path that is cached forever.
+    """
+
+    def __init__(self, static_dir: Path, prefix: str = "/static/"):
+        self.static_dir = static_dir
+        self.prefix = prefix
+        self._assets: Dict[str, StaticAsset] = {}
+        self._hashed_names: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        for path in sorted(self.static_dir.rglob("*")):
+            if not path.is_file() or path.suffix in (".gz", ".br"):
+                continue
+            name = path.relative_to(self.static_dir).as_posix()
+            body = path.read_bytes()
+            digest = hashlib.sha256(body).hexdigest()
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type == "application/javascript":
+                content_type += "; charset=utf-8"
+
+            variants = {"identity": body}
+            variants.update(self._compressed_variants(path, body, content_type))
+
+            if HASHED_NAME.search(name):
+                self._assets[name] = StaticAsset(content_type, f'"{digest[:16]}"', variants, True)
+                self._hashed_names[name] = name
+                continue
+
+            stem, dot, suffix = name.rpartition(".")
+            hashed_name = f"{stem}.{digest[:12]}.{suffix}" if dot else f"{name}.{digest[:12]}"
+            self._assets[name] = StaticAsset(content_type, f'"{digest[:16]}"', variants, False)
+            self._assets[hashed_name] = StaticAsset(content_type, f'"{digest[:16]}"', variants, True)
+            self._hashed_names[name] = hashed_name
+
+        logger.info(f"Indexed {len(self._hashed_names)} static assets")
+
+    def _compressed_variants(self, path: Path, body: bytes, content_type: str) -> Dict[str, bytes]:
+        variants = {}
+        # Prefer variants precompressed at build time, if any
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            precompressed = path.with_name(path.name + suffix)
+            if precompressed.exists():
+                variants[encoding] = precompressed.read_bytes()
+
+        if len(body) < MIN_COMPRESS_SIZE or not content_type.startswith(COMPRESSIBLE_TYPES):
+            return variants
+        if "gzip" not in variants:
+            variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if "br" not in variants and brotli is not None:
+            variants["br"] = brotli.compress(body, quality=11)
+        # Keep only encodings that actually save bytes
+        return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+    def url(self, name: str) -> str:
+        """Content-hashed URL for a static file, e.g. url("js/chat.js")."""
+        return f"{self.prefix}{self._hashed_names.get(name, name)}"
+
+    def import_map(self) -> str:
+        """
+        Import map pointing the plain module paths used in JS imports at their
+        hashed URLs, so each module is loaded once and cached immutably.
+        """
+        return json.dumps({
+            "imports": {
+                f"{self.prefix}{name}": f"{self.prefix}{hashed_name}"
+                for name, hashed_name in self._hashed_names.items()
+                if name.endswith(".js") and name != hashed_name
+            }
+        })
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        if not path.startswith(self.prefix):
+            return None
+        return self._assets.get(path[len(self.prefix):])
+
+def _accepted_encodings(accept_encoding: str) -> Iterable[str]:
+    for part in accept_encoding.split(","):
+        encoding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        yield encoding.strip().lower()
+
+class StaticAssetsMiddleware:
+    """Serves indexed static assets before requests reach the router."""
+
+    def __init__(self, app, index: AssetIndex):
+        self.app = app
+        self.index = index
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        asset = self.index.lookup(scope["path"])
+        if asset is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        accepted = set(_accepted_encodings(request_headers.get("accept-encoding", "")))
+        encoding = next(
+            (e for e in ("br", "gzip") if e in asset.variants and e in accepted),
+            "identity"
+        )
+        etag = asset.etag if encoding == "identity" else f'{asset.etag[:-1]}-{encoding}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request_headers.get("if-none-match", "")
+        if if_none_match == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+            response = Response(status_code=304, headers=headers)
+        else:
+            if encoding != "identity":
+                headers["Content-Encoding"] = encoding
+            response = Response(asset.variants[encoding], headers=headers, media_type=asset.content_type)
+        await response(scope, receive, send)
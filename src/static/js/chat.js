@@ -1,4 +1,6 @@
 import { createErrorNotification, initializeNotifications } from '/static/js/messages.js';
+import { StreamRenderer, scrollToBottom } from '/static/js/stream_renderer.js';
+import { readEventStream } from '/static/js/sse.js';
 
 const messageClasses = {
   base: "max-w-[70%] p-4 rounded-[20px] mb-4",
@@ -9,47 +11,27 @@ const messageClasses = {
 
 document.addEventListener('DOMContentLoaded', function() {
     const messagesContainer = document.getElementById('chat-messages');
-    const initialText = localStorage.getItem('initial_text');
-    const conversationData = messagesContainer?.dataset?.conversation;
+    const chatInput = document.getElementById('chat-input');
 
     initializeNotifications();
 
-    if (messagesContainer && conversationData) {
-        const conversation = JSON.parse(conversationData);
-        if (conversation.messages && conversation.messages.length > 0) {
-            renderExistingMessages(conversation.messages);
-        }
-    }
-
-    if (initialText) {
-        const chatInput = document.getElementById('chat-input');
-        if (chatInput) {
-            const userMessage = document.createElement('div');
-            userMessage.className = `${messageClasses.base} ${messageClasses.user}`;
-            userMessage.textContent = initialText;
-            messagesContainer.appendChild(userMessage);
-
-            const assistantMessage = document.createElement('div');
-            assistantMessage.className = `${messageClasses.base} ${messageClasses.assistant}`;
+    // The latest messages are rendered by the server; start at the bottom
+    scrollToBottom(messagesContainer);
 
-            const textContainer = document.createElement('div');
-            textContainer.className = 'inline';
-            assistantMessage.appendChild(textContainer);
+    if (chatInput) {
+        chatInput.addEventListener('keydown', function(evt) {
+            if (evt.key !== 'Enter' || evt.isComposing) return;
+            const text = chatInput.value;
+            if (text.trim() === '' || chatInput.disabled) return;
 
-            const typingIndicator = createTypingIndicator();
-            assistantMessage.appendChild(typingIndicator);
+            evt.preventDefault();
+            chatInput.value = '';
+            sendMessage(text);
+        });
 
-            messagesContainer.appendChild(assistantMessage);
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-
-            currentAssistantMessage = assistantMessage;
-            currentTextContainer = textContainer;
-            currentTypingIndicator = typingIndicator;
-            accumulatedContent = '';
-
-            setupSSE(initialText);
-
-            localStorage.removeItem('initial_text');
+        // Another tab, or an earlier visit, is still receiving an answer here
+        if (chatInput.dataset.streamingText) {
+            sendMessage(chatInput.dataset.streamingText, true);
         }
     }
 });
@@ -68,208 +50,191 @@ function createTypingIndicator() {
     return indicator;
 }
 
-let currentAssistantMessage = null;
-let currentTextContainer = null;
-let currentTypingIndicator = null;
-let accumulatedContent = '';
-let eventSource = null;
+// Reconnections attempted when a chat stream drops, with doubling delays
+const CHAT_RESUME_ATTEMPTS = 3;
+const CHAT_RESUME_DELAY_MS = 1000;
+
+let streamController = null;
+
+// Errors that reconnecting cannot fix, e.g. a rejected request
+function fatalError(message) {
+    const error = new Error(message);
+    error.fatal = true;
+    return error;
+}
+
+async function errorMessage(response) {
+    try {
+        return (await response.json()).message || 'Failed to send the message';
+    } catch (e) {
+        // Not a JSON error body
+        return 'Failed to send the message';
+    }
+}
 
 window.addEventListener('beforeunload', function() {
-    if (eventSource) {
-        eventSource.close();
+    if (streamController) {
+        streamController.abort();
     }
 });
 
-function setupSSE(text) {
-    if (eventSource) eventSource.close();
+// pushState only changed the URL; going back needs the page it points at
+window.addEventListener('popstate', function() {
+    window.location.reload();
+});
 
-    const url = new URL(window.location.href);
-    const conversationId = url.pathname.split('/conversation/')[1];
-    const sseUrl = `/api/chat?text=${encodeURIComponent(text)}${conversationId ? `&conversation_id=${conversationId}` : ''}`;
+function setInputBusy(busy) {
     const chatInput = document.getElementById('chat-input');
+    chatInput.disabled = busy;
+    chatInput.placeholder = busy ? "AI is thinking..." : "Ask me anything...";
+    if (!busy) chatInput.focus();
+}
 
-    chatInput.disabled = true;
-    chatInput.placeholder = "AI is thinking...";
-
-    eventSource = new EventSource(sseUrl);
-    console.log('SSE connection established');
-
-    eventSource.onopen = function() {
-        console.log('SSE connection opened');
-    };
+// The request created the conversation: give the page its URL and list it in
+// the sidebar, as the full page load used to
+function adoptConversation(conversationId, title) {
+    const chatInput = document.getElementById('chat-input');
+    // Replays of the answer, e.g. in another tab, repeat the event
+    if (chatInput.dataset.conversationId === conversationId) return;
+    chatInput.dataset.conversationId = conversationId;
+    history.pushState({ conversationId }, '', `/conversation/${conversationId}`);
+
+    const chatHistory = document.getElementById('chat-history');
+    if (!chatHistory) return;
+    document.getElementById('chat-history-empty')?.remove();
+
+    const link = document.createElement('a');
+    link.href = `/conversation/${conversationId}`;
+    link.className = 'block px-4 py-2 text-sm text-gray-600 dark:text-gray-300 hover:bg-gray-200 dark:hover:bg-gray-800 rounded-lg truncate';
+    link.textContent = title;
+    chatHistory.firstElementChild.after(link);
+}
 
-    eventSource.onmessage = function(event) {
-        console.log('Message received:', event);
-        if (!currentTextContainer) return;
+// Send a prompt and stream its answer. With attach set the prompt was already
+// sent, and the answer being generated for it is followed from its start.
+async function sendMessage(text, attach = false) {
+    const chatInput = document.getElementById('chat-input');
+    const messagesContainer = document.getElementById('chat-messages');
 
-        accumulatedContent += event.data;
-        currentTextContainer.innerHTML = accumulatedContent;
+    const userMessage = document.createElement('div');
+    userMessage.className = `${messageClasses.base} ${messageClasses.user}`;
+    userMessage.textContent = text;
+    messagesContainer.appendChild(userMessage);
 
-        const messagesContainer = document.getElementById('chat-messages');
-        if (messagesContainer) {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }
-    };
+    const assistantMessage = document.createElement('div');
+    assistantMessage.className = `${messageClasses.base} ${messageClasses.assistant}`;
 
-    eventSource.addEventListener('content', function(event) {
-        console.log('Content event received:', event);
-        if (!currentTextContainer) return;
+    const textContainer = document.createElement('div');
+    textContainer.className = 'inline';
+    assistantMessage.appendChild(textContainer);
 
-        accumulatedContent += event.data;
-        currentTextContainer.innerHTML = accumulatedContent;
+    const typingIndicator = createTypingIndicator();
+    assistantMessage.appendChild(typingIndicator);
 
-        const messagesContainer = document.getElementById('chat-messages');
-        if (messagesContainer) {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }
-    });
+    messagesContainer.appendChild(assistantMessage);
+    scrollToBottom(messagesContainer);
 
-    eventSource.addEventListener('end_of_response', function(event) {
-        console.log('End of response received');
-        if (currentTypingIndicator) {
-            currentTypingIndicator.remove();
-        }
+    const renderer = new StreamRenderer(textContainer, messagesContainer);
+    let ended = false;
+    let failed = false;
+    let lastEventId = null;
+    let attempts = 0;
 
-        const messagesContainer = document.getElementById('chat-messages');
-        if (messagesContainer) {
-            messagesContainer.scrollTop = messagesContainer.scrollHeight;
-        }
+    setInputBusy(true);
+    streamController = new AbortController();
+    const signal = streamController.signal;
 
-        const chatInput = document.getElementById('chat-input');
-        chatInput.disabled = false;
-        chatInput.placeholder = "Ask me anything...";
+    // Replays the answer after lastEventId, or all of it without one
+    const followAnswer = () => fetch(`/api/conversations/${chatInput.dataset.conversationId}/stream`, {
+        headers: lastEventId === null
+            ? { 'Accept': 'text/event-stream' }
+            : { 'Accept': 'text/event-stream', 'Last-Event-ID': lastEventId },
+        signal
+    });
 
-        currentAssistantMessage = null;
-        currentTextContainer = null;
-        currentTypingIndicator = null;
-        eventSource.close();
+    // The prompt travels in the body, never in the URL
+    const body = new URLSearchParams({ text });
+    if (chatInput.dataset.conversationId) {
+        body.set('conversation_id', chatInput.dataset.conversationId);
+    }
+    let request = attach ? followAnswer : () => fetch('/api/chat', {
+        method: 'POST',
+        headers: { 'Accept': 'text/event-stream' },
+        body,
+        signal
     });
 
-    eventSource.onerror = function(error) {
-        console.error('SSE error:', error);
-        // Only show error if we haven't received any content
-        if (currentTextContainer && !accumulatedContent) {
-            currentTextContainer.textContent = 'Error: Could not connect to the assistant.';
-        }
-        if (currentTypingIndicator) {
-            currentTypingIndicator.remove();
+    // Tokens are appended incrementally and drawn once per animation frame
+    function handleEvent(event) {
+        if (event.id !== null) {
+            lastEventId = event.id;
+            attempts = 0;
         }
-        if (!accumulatedContent) {
-            currentAssistantMessage = null;
-            currentTextContainer = null;
-            currentTypingIndicator = null;
+        if (event.event === 'conversation') {
+            adoptConversation(JSON.parse(event.data).conversationId, text);
+        } else if (event.event === 'content' || event.event === 'message') {
+            renderer.push(event.data);
+        } else if (event.event === 'end_of_response') {
+            ended = true;
+        } else if (event.event === 'error') {
+            throw fatalError(event.data);
         }
-        const chatInput = document.getElementById('chat-input');
-        chatInput.disabled = false;
-        chatInput.placeholder = "Ask me anything...";
-        eventSource.close();
-    };
-}
-
-document.addEventListener('htmx:afterRequest', function(evt) {
-    if (evt.detail.elt.id === 'chat-input') {
-        const chatInput = document.getElementById('chat-input');
-        const messagesContainer = document.getElementById('chat-messages');
-        const text = chatInput.value;
-
-        chatInput.value = '';
-
-        if (!evt.detail.successful) {
-            createErrorNotification('Failed to create conversation');
-            return;
-        }
-
-        if (evt.detail.xhr.response) {
-            if (evt.detail.xhr.response.includes("'status': 'error'")) {
-                const errorMatch = evt.detail.xhr.response.match(/'message': '([^']+)'/);
-                const errorMessage = errorMatch ? errorMatch[1] : 'An error occurred';
-                createErrorNotification(errorMessage);
-                return;
-            }
+    }
 
+    try {
+        while (!ended) {
             try {
-                const response = JSON.parse(evt.detail.xhr.response);
-
-                if (response.status === 'error') {
-                    createErrorNotification(response.message || 'An error occurred');
-                    return;
+                const response = await request();
+                if (!response.ok) {
+                    throw fatalError(await errorMessage(response));
                 }
-
-                if (response.conversation_id) {
-                    localStorage.setItem('initial_text', response.initial_text);
-                    window.location.href = `/conversation/${response.conversation_id}`;
-                    return;
+                await readEventStream(response, handleEvent);
+                if (!ended) {
+                    throw new Error('The answer was interrupted');
                 }
-            } catch (e) {
-                console.error('Error parsing response:', e);
+            } catch (error) {
+                const resumable = !error.fatal && error.name !== 'AbortError' && lastEventId !== null;
+                if (!resumable || attempts >= CHAT_RESUME_ATTEMPTS) throw error;
+
+                // Reconnect and have the server replay what was missed
+                console.warn('Chat stream interrupted, resuming:', error);
+                await new Promise(resolve => setTimeout(resolve, CHAT_RESUME_DELAY_MS * 2 ** attempts));
+                attempts += 1;
+                request = followAnswer;
             }
         }
+    } catch (error) {
+        if (error.name !== 'AbortError') {
+            console.error('Chat stream error:', error);
+            createErrorNotification(error.message);
+            failed = true;
+        }
+    } finally {
+        renderer.finish();
+        // Keep whatever part of the answer did arrive
+        if (failed && !renderer.text) {
+            textContainer.textContent = 'Error: Could not connect to the assistant.';
+        }
+        typingIndicator.remove();
+        streamController = null;
+        setInputBusy(false);
+    }
+}
 
-        // If we get here, proceed with creating the message UI
-        const userMessage = document.createElement('div');
-        userMessage.className = `${messageClasses.base} ${messageClasses.user}`;
-        userMessage.textContent = text;
-        messagesContainer.appendChild(userMessage);
-
-        const assistantMessage = document.createElement('div');
-        assistantMessage.className = `${messageClasses.base} ${messageClasses.assistant}`;
-
-        const textContainer = document.createElement('div');
-        textContainer.className = 'inline';
-        assistantMessage.appendChild(textContainer);
-
-        const typingIndicator = createTypingIndicator();
-        assistantMessage.appendChild(typingIndicator);
-
-        messagesContainer.appendChild(assistantMessage);
-        messagesContainer.scrollTop = messagesContainer.scrollHeight;
-
-        currentAssistantMessage = assistantMessage;
-        currentTextContainer = textContainer;
-        currentTypingIndicator = typingIndicator;
-        accumulatedContent = '';
+// Older messages are inserted above the ones being read; keep those in place
+let scrollFromBottom = null;
 
-        setupSSE(text);
+document.addEventListener('htmx:beforeSwap', function(evt) {
+    if (evt.detail.target.id === 'older-messages-loader') {
+        const messagesContainer = document.getElementById('chat-messages');
+        scrollFromBottom = messagesContainer.scrollHeight - messagesContainer.scrollTop;
     }
 });
 
-function renderExistingMessages(messages) {
-    const messagesContainer = document.getElementById('chat-messages');
-    let currentSenderType = null;
-    let currentMessageContent = '';
-
-    function createMessageBubble(content, senderType) {
-        const messageDiv = document.createElement('div');
-        messageDiv.className = `${messageClasses.base} ${senderType.toLowerCase() === 'user' ? messageClasses.user : messageClasses.assistant}`;
-
-        if (senderType.toLowerCase() === 'user') {
-            messageDiv.textContent = content;
-        } else {
-            const textContainer = document.createElement('div');
-            textContainer.className = 'inline';
-            textContainer.innerHTML = content;
-            messageDiv.appendChild(textContainer);
-        }
-
-        return messageDiv;
+document.addEventListener('htmx:afterSwap', function() {
+    if (scrollFromBottom !== null) {
+        const messagesContainer = document.getElementById('chat-messages');
+        messagesContainer.scrollTop = messagesContainer.scrollHeight - scrollFromBottom;
+        scrollFromBottom = null;
     }
-
-    messages.forEach((message, index) => {
-        if (currentSenderType === null) {
-            currentSenderType = message.senderType;
-            currentMessageContent = message.content;
-        } else if (currentSenderType === message.senderType) {
-            currentMessageContent += message.content;
-        } else {
-            messagesContainer.appendChild(createMessageBubble(currentMessageContent, currentSenderType));
-            currentSenderType = message.senderType;
-            currentMessageContent = message.content;
-        }
-
-        if (index === messages.length - 1) {
-            messagesContainer.appendChild(createMessageBubble(currentMessageContent, currentSenderType));
-        }
-    });
-
-    messagesContainer.scrollTop = messagesContainer.scrollHeight;
-}
+});
@@ -58,6 +58,9 @@ export function createSuccessNotification(message) {
     createNotification(message, 'success');
 }
 
+// Cards can arrive with any HTMX response, including out-of-band swaps
+document.addEventListener('htmx:load', () => initializeNotifications());
+
 export function initializeNotifications() {
     document.querySelectorAll('[id^="notification-card-"]').forEach((card) => {
         if (processedNotifications.has(card.id)) {
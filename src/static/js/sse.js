@@ -0,0 +1,69 @@
+/**
+ * Incremental Server-Sent Events parser for streams read with fetch.
+ * Feed it decoded text as it arrives; it returns every complete event as
+ * { event, data, id }. Lines may end in LF, CRLF or CR, as the spec allows.
+ */
+export class SSEDecoder {
+    constructor() {
+        this.buffer = '';
+        this.skipLF = false;
+        this.reset();
+    }
+
+    reset() {
+        this.event = '';
+        this.data = [];
+        this.id = null;
+    }
+
+    feed(text) {
+        // A CR ending the previous chunk may be the first half of a CRLF
+        if (this.skipLF && text.startsWith('\n')) text = text.slice(1);
+        this.skipLF = text.endsWith('\r');
+
+        this.buffer += text;
+        const events = [];
+        const lines = this.buffer.split(/\r\n|\n|\r/);
+        // The last piece is a line not terminated yet
+        this.buffer = lines.pop();
+
+        for (const line of lines) {
+            if (line === '') {
+                if (this.data.length) {
+                    events.push({ event: this.event || 'message', data: this.data.join('\n'), id: this.id });
+                }
+                this.reset();
+                continue;
+            }
+            if (line.startsWith(':')) continue;
+
+            const colon = line.indexOf(':');
+            const field = colon < 0 ? line : line.slice(0, colon);
+            let value = colon < 0 ? '' : line.slice(colon + 1);
+            if (value.startsWith(' ')) value = value.slice(1);
+
+            if (field === 'event') this.event = value;
+            else if (field === 'data') this.data.push(value);
+            else if (field === 'id') this.id = value;
+        }
+        return events;
+    }
+}
+
+/**
+ * Reads an event-stream response body to its end, calling onEvent for each
+ * event. Resolves once the stream is closed; rejects if reading fails.
+ */
+export async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const textDecoder = new TextDecoder();
+    const decoder = new SSEDecoder();
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        for (const event of decoder.feed(textDecoder.decode(value, { stream: true }))) {
+            onEvent(event);
+        }
+    }
+}
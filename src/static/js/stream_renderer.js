@@ -0,0 +1,193 @@
+// Elements that never have a closing tag
+const VOID_ELEMENTS = new Set([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr'
+]);
+
+// Within this distance of the bottom the view follows new content
+const PINNED_THRESHOLD_PX = 32;
+
+/**
+ * Splits streamed HTML into balanced fragments. Text is committed as soon as
+ * it is outside any tag or element; an element is committed once its closing
+ * tag arrives. Whatever follows the last commit point stays pending.
+ * Each character is scanned once, however many chunks the answer arrives in,
+ * and only the pending HTML is kept in the buffer: indexing a string grown
+ * with += makes the engine flatten, i.e. copy, all of it.
+ * No DOM access, so it also runs outside the browser.
+ */
+export class HtmlChunker {
+    constructor() {
+        // Committed fragments, only joined when the whole text is asked for
+        this.fragments = [];
+        this.buffer = '';
+        this.scanned = 0;
+        this.depth = 0;
+        this.tagStart = -1;
+        this.quote = null;
+        this.inEntity = false;
+    }
+
+    /** Adds a chunk; returns the newly balanced HTML, possibly empty. */
+    push(chunk) {
+        this.buffer += chunk;
+        let safe = 0;
+
+        for (let i = this.scanned; i < this.buffer.length; i++) {
+            const ch = this.buffer[i];
+
+            if (this.tagStart >= 0) {
+                if (this.quote) {
+                    if (ch === this.quote) this.quote = null;
+                } else if (ch === '"' || ch === "'") {
+                    this.quote = ch;
+                } else if (ch === '>') {
+                    this.closeTag(this.buffer.slice(this.tagStart, i + 1));
+                    this.tagStart = -1;
+                    if (this.depth === 0) safe = i + 1;
+                }
+                continue;
+            }
+
+            if (this.inEntity) {
+                if (/[A-Za-z0-9#]/.test(ch)) continue;
+                this.inEntity = false;
+                if (ch === ';') {
+                    if (this.depth === 0) safe = i + 1;
+                    continue;
+                }
+            }
+
+            if (ch === '<' && /[A-Za-z\/!]/.test(this.buffer[i + 1] ?? 'a')) {
+                this.tagStart = i;
+            } else if (ch === '&') {
+                this.inEntity = true;
+            } else if (this.depth === 0) {
+                safe = i + 1;
+            }
+        }
+
+        // "<" as the last character may still turn out to be plain text
+        if (this.tagStart >= 0 && this.tagStart === this.buffer.length - 1) {
+            this.scanned = this.tagStart;
+            this.tagStart = -1;
+        } else {
+            this.scanned = this.buffer.length;
+        }
+
+        return this.commit(safe);
+    }
+
+    commit(end) {
+        const balanced = this.buffer.slice(0, end);
+        if (balanced) {
+            this.fragments.push(balanced);
+            this.buffer = this.buffer.slice(end);
+            this.scanned = Math.max(0, this.scanned - end);
+            if (this.tagStart >= 0) this.tagStart -= end;
+        }
+        return balanced;
+    }
+
+    closeTag(tag) {
+        if (tag.startsWith('<!') || tag.endsWith('/>')) return;
+
+        const name = tag.match(/^<\/?([A-Za-z][\w-]*)/)?.[1]?.toLowerCase();
+        if (!name || VOID_ELEMENTS.has(name)) return;
+
+        if (tag.startsWith('</')) {
+            this.depth = Math.max(0, this.depth - 1);
+        } else {
+            this.depth += 1;
+        }
+    }
+
+    /** Commits and returns everything pending, at the end of the stream. */
+    flush() {
+        return this.commit(this.buffer.length);
+    }
+
+    /** HTML received but not committed yet, e.g. inside an open <details>. */
+    get pending() {
+        return this.buffer;
+    }
+
+    get text() {
+        return this.fragments.join('') + this.buffer;
+    }
+}
+
+/**
+ * Renders a streamed answer into a container. Committed fragments are parsed
+ * once and appended; only the pending tail is re-rendered. DOM writes are
+ * batched to one per animation frame, and the view follows the answer only
+ * while the user is at the bottom.
+ */
+export class StreamRenderer {
+    constructor(container, scrollContainer) {
+        this.container = container;
+        this.scrollContainer = scrollContainer;
+        this.chunker = new HtmlChunker();
+        this.queued = '';
+        this.frame = null;
+        this.renderedTail = '';
+
+        this.tail = document.createElement('div');
+        this.tail.className = 'contents';
+        this.container.appendChild(this.tail);
+    }
+
+    push(chunk) {
+        this.queued += this.chunker.push(chunk);
+        if (this.frame === null) {
+            this.frame = requestAnimationFrame(() => this.render());
+        }
+    }
+
+    /** Renders everything received, balanced or not. */
+    finish() {
+        if (this.frame !== null) {
+            cancelAnimationFrame(this.frame);
+        }
+        this.queued += this.chunker.flush();
+        this.render();
+        this.tail.remove();
+    }
+
+    render() {
+        this.frame = null;
+        const pinned = isPinned(this.scrollContainer);
+
+        if (this.queued) {
+            const template = document.createElement('template');
+            template.innerHTML = this.queued;
+            this.container.insertBefore(template.content, this.tail);
+            this.queued = '';
+        }
+
+        const pending = this.chunker.pending;
+        if (pending !== this.renderedTail) {
+            this.tail.innerHTML = pending;
+            this.renderedTail = pending;
+        }
+
+        if (pinned) {
+            scrollToBottom(this.scrollContainer);
+        }
+    }
+
+    get text() {
+        return this.chunker.text;
+    }
+}
+
+export function isPinned(scrollContainer) {
+    if (!scrollContainer) return false;
+    return scrollContainer.scrollHeight - scrollContainer.scrollTop - scrollContainer.clientHeight <= PINNED_THRESHOLD_PX;
+}
+
+export function scrollToBottom(scrollContainer) {
+    if (scrollContainer) {
+        scrollContainer.scrollTop = scrollContainer.scrollHeight;
+    }
+}
@@ -7,9 +7,11 @@ function filterDefault(values) {
 /** @type {import('tailwindcss').Config} */
 export default {
     darkMode: ["selector"],
+    // build_assets.py replaces these with --content, adding the installed
+    // shad4fast package and checking that every path matches a file
     content: [
         "./**/*.py",
-        "./.venv/lib/python3.12/site-packages/shad4fast/**/*.{py,js}",
+        "./static/js/**/*.js",
     ],
     theme: {
         container: {
@@ -0,0 +1,90 @@
+"""
+Bytes transferred to load a page with the built CSS bundle and vendored
+hyperscript, against the CDN fallback used when no build exists (the Tailwind
+compiler script, which then compiles the CSS in the browser, and hyperscript
+from unpkg). Counts the compressed size of the page and of every script and
+stylesheet it references; CDN files are downloaded. Build the assets first,
+then run from the repository root:
+
+    python tests/benchmarks/bench_page_bytes.py
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Run in a fresh interpreter per mode, as main.py reads the manifest at import
+MEASURE = r"""
+import json, re, sys
+import httpx
+from starlette.testclient import TestClient
+import main
+
+headers = {"Accept-Encoding": "br, gzip"}
+sizes = {}
+with TestClient(main.app) as client:
+    page = client.get(sys.argv[1], headers=headers)
+    sizes[sys.argv[1]] = page.num_bytes_downloaded
+    urls = re.findall(r'<script[^>]*\ssrc="([^"]+)"', page.text)
+    for link in re.findall(r'<link[^>]*>', page.text):
+        if 'rel="stylesheet"' in link:
+            urls += re.findall(r'\shref="([^"]+)"', link)
+    for url in urls:
+        if url.startswith("/"):
+            sizes[url] = client.get(url, headers=headers).num_bytes_downloaded
+        else:
+            try:
+                sizes[url] = httpx.get(url, headers=headers, follow_redirects=True, timeout=10).num_bytes_downloaded
+            except httpx.HTTPError:
+                sizes[url] = None
+print(json.dumps(sizes))
+"""
+
+def measure(src_dir: Path, path: str) -> dict:
+    # The app keeps its config and session key in the working directory
+    workdir = tempfile.mkdtemp()
+    try:
+        shutil.copy(src_dir / "icons.py", workdir)
+        result = subprocess.run(
+            [sys.executable, "-c", MEASURE, path],
+            cwd=workdir,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join([str(src_dir.parent), str(src_dir)]), "LOG_LEVEL": "ERROR"},
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    finally:
+        shutil.rmtree(workdir)
+    return json.loads(result.stdout.splitlines()[-1])
+
+def report(mode: str, sizes: dict):
+    print(mode)
+    for url, size in sizes.items():
+        print(f"  {size if size is not None else 'unreachable':>12}  {url}")
+    known = [size for size in sizes.values() if size is not None]
+    unreachable = " (without unreachable files)" if len(known) < len(sizes) else ""
+    print(f"  {sum(known):>12}  total{unreachable}")
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--path", default="/login", help="page to load; it must not need a login")
+    options = args.parse_args()
+
+    if not (ROOT / "src" / "static" / "manifest.json").exists():
+        sys.exit("No build found; run python build_assets.py in src first")
+    report("bundle", measure(ROOT / "src", options.path))
+
+    # A copy of the app without the build falls back to the CDNs
+    with tempfile.TemporaryDirectory() as copy:
+        src_copy = Path(copy) / "src"
+        shutil.copytree(ROOT / "src", src_copy, ignore=shutil.ignore_patterns("manifest.json", "__pycache__"))
+        report("CDN", measure(src_copy, options.path))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+p50/p99 render latency of the conversation page against the mock API, with
+the backend calls made concurrently (as the app does) and one after another
+(as it used to). Every backend request gets an added latency, and the
+caches are cleared before each render so all the calls are made. Run from
+the repository root:
+
+    python tests/benchmarks/bench_pages.py
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+import uvicorn
+from starlette.testclient import TestClient
+
+from src.services.mock.api import app as mock_app, mock_conversations
+
+def with_latency(app, seconds: float):
+    async def delayed(scope, receive, send):
+        if scope["type"] == "http":
+            await asyncio.sleep(seconds)
+        await app(scope, receive, send)
+    return delayed
+
+def serve_mock(latency: float) -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(with_latency(mock_app, latency), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+async def gather_in_order(*calls, return_exceptions=False):
+    results = []
+    for call in calls:
+        try:
+            results.append(await call)
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            results.append(e)
+    return results
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--requests", type=int, default=200)
+    args.add_argument("--latency", type=float, default=0.02, help="seconds added to each backend request")
+    options = args.parse_args()
+
+    backend_url = serve_mock(options.latency)
+    # The app keeps its config and session key in the working directory
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    os.makedirs("config")
+    Path("config/config.json").write_text(f'{{"connection_endpoint": "{backend_url}"}}')
+    shutil.copy(ROOT / "src" / "icons.py", workdir)
+
+    import main as web
+    import src.services.api.api as api_module
+
+    url = f"/conversation/{mock_conversations[0].conversationId}"
+    with TestClient(web.app) as client:
+        client.post("/api/login", data={"username": "alice", "password": "1"})
+        for mode, gather in (("concurrent", asyncio.gather), ("sequential", gather_in_order)):
+            api_module.asyncio = types.SimpleNamespace(**{**vars(asyncio), "gather": gather})
+            samples = []
+            for _ in range(options.requests):
+                web.app.client.llms_cache.invalidate()
+                web.app.client.conversations_cache.invalidate()
+                started = time.perf_counter()
+                response = client.get(url)
+                samples.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.status_code
+            print(
+                f"{mode:<11} p50 {percentile(samples, 50) * 1000:7.1f} ms"
+                f"   p99 {percentile(samples, 99) * 1000:7.1f} ms"
+            )
+        api_module.asyncio = asyncio
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Render time of settings pages with large tables, and the time saved per
+request by detecting expired sessions through a context variable instead
+of rendering the page a second time with str() to look for "UNAUTHORIZED",
+as login_required used to. Run from the repository root:
+
+    python tests/benchmarks/bench_render.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+# Icons are read from icons.py in the working directory, or else downloaded
+os.chdir(ROOT / "src")
+
+from fasthtml.common import to_xml
+
+from pages.settings import Settings
+from src.components.layout.chat_history_settings import ChatHistorySettings
+from src.components.layout.knowledge_base_settings import KnowledgeBaseSettings
+from src.components.layout.users_settings import UsersSettings
+from src.services.api.session import SessionUser
+from src.services.api.types import Conversation, KnowledgeBase, User
+
+CREATED_AT = "2024-01-01T00:00:00Z"
+ROW_COUNTS = (100, 500, 2000)
+
+def tables(rows: int):
+    yield "chat-history", ChatHistorySettings([
+        Conversation(conversationId=f"c{i}", title=f"Conversation {i}", createdAt=CREATED_AT, updatedAt=CREATED_AT)
+        for i in range(rows)
+    ])
+    yield "knowledge-base", KnowledgeBaseSettings([
+        KnowledgeBase(id=f"kb{i}", title=f"Knowledge base {i}", content="", createdAt=CREATED_AT)
+        for i in range(rows)
+    ])
+    yield "users", UsersSettings([
+        User(id=f"u{i}", username=f"user{i}", email=f"user{i}@example.com", roles=["USER"], createdAt=CREATED_AT)
+        for i in range(rows)
+    ])
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--repeat", type=int, default=5)
+    options = args.parse_args()
+
+    user = SessionUser.from_session(json.dumps({
+        "token": "token", "id": "admin", "email": "admin@example.com", "username": "admin", "roles": ["ADMIN"]
+    }))
+    request = types.SimpleNamespace(state=types.SimpleNamespace(user=user))
+
+    print(f"{'table':<15} {'rows':>5} {'render':>10} {'str() scan saved':>17}")
+    for rows in ROW_COUNTS:
+        for section, content in tables(rows):
+            page = asyncio.run(Settings(request, section, content=content))
+            render = best_time(lambda: to_xml(page), options.repeat)
+            scan = best_time(lambda: "UNAUTHORIZED" in str(page), options.repeat)
+            print(f"{section:<15} {rows:>5} {render * 1000:>8.1f}ms {scan * 1000:>15.1f}ms")
+
+if __name__ == "__main__":
+    main()
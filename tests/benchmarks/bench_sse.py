@@ -0,0 +1,47 @@
+"""
+Throughput of SSEParser, in events per second, for a recorded-like answer
+fed in network chunks of several sizes. Run from the repository root:
+
+    python tests/benchmarks/bench_sse.py
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.services.api.sse import SSEParser, format_event
+
+CHUNK_SIZES = (64, 1024, 16 * 1024)
+
+def make_stream(events: int) -> bytes:
+    """Token-sized content events, with some multi-byte characters."""
+    frames = [format_event("content", f"token {i} — ünïcödé 👋") for i in range(events)]
+    return "".join(frames).encode("utf-8")
+
+def run(data: bytes, chunk_size: int, passthrough: bool) -> float:
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    parser = SSEParser(passthrough=passthrough)
+    frames = 0
+    started = time.perf_counter()
+    for chunk in chunks:
+        frames += len(parser.feed(chunk))
+    return frames / (time.perf_counter() - started)
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--events", type=int, default=200_000)
+    args.add_argument("--repeat", type=int, default=3)
+    options = args.parse_args()
+
+    data = make_stream(options.events)
+    print(f"{options.events} events, {len(data) / 1e6:.1f} MB")
+    for passthrough in (False, True):
+        for chunk_size in CHUNK_SIZES:
+            best = max(run(data, chunk_size, passthrough) for _ in range(options.repeat))
+            mode = "passthrough" if passthrough else "decoded"
+            print(f"{mode:<12} {chunk_size:>6} B chunks: {best:>12,.0f} events/s")
+
+if __name__ == "__main__":
+    main()
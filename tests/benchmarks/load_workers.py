@@ -0,0 +1,128 @@
+"""
+Load test of the app with a growing number of uvicorn workers, against the
+mock API. For each worker count it serves the app, logs in and keeps
+--concurrency requests for a page in flight for --duration seconds, then
+reports throughput and latency. Run from the repository root on a machine
+with at least as many cores as the largest worker count:
+
+    python tests/benchmarks/load_workers.py --workers 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start(args, cwd, port: int, env=None) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", *args, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn {' '.join(args)} exited with {process.returncode}")
+        try:
+            # The mock has no health route; any answer means it is up
+            httpx.get(f"http://127.0.0.1:{port}/health/ready")
+            return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"uvicorn {' '.join(args)} did not start")
+
+def stop(process: subprocess.Popen):
+    process.send_signal(signal.SIGTERM)
+    process.wait()
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def load(base_url: str, path: str, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await client.post("/api/login", data={"username": "alice", "password": "1"})
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+    return latencies, errors, elapsed
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    args.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args.add_argument("--concurrency", type=int, default=32)
+    args.add_argument("--duration", type=float, default=15)
+    args.add_argument("--path", default="/settings/chat-history", help="page requested")
+    options = args.parse_args()
+    if max(options.workers) > (os.cpu_count() or 1):
+        print(f"Warning: {os.cpu_count()} core(s) only; more workers than cores cannot add throughput")
+
+    mock_port = free_port()
+    mock = start(["src.services.mock.api:app"], ROOT, mock_port)
+    # The app keeps its config and session key in the working directory;
+    # the key is written up front so all the workers share it
+    workdir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(workdir, "config"))
+    Path(workdir, "config", "config.json").write_text(f'{{"connection_endpoint": "http://127.0.0.1:{mock_port}"}}')
+    Path(workdir, ".sesskey").write_text(os.urandom(16).hex())
+    shutil.copy(ROOT / "src" / "icons.py", workdir)
+
+    try:
+        print(f"{options.concurrency} concurrent requests for {options.path}, {options.duration:g}s each")
+        for workers in options.workers:
+            port = free_port()
+            server = start(
+                ["main:app", "--app-dir", str(ROOT / "src"), "--workers", str(workers)],
+                workdir,
+                port,
+                env={"SHUTDOWN_DRAIN_DELAY": "0", "PYTHONPATH": str(ROOT)},
+            )
+            try:
+                latencies, errors, elapsed = asyncio.run(
+                    load(f"http://127.0.0.1:{port}", options.path, options.concurrency, options.duration)
+                )
+            finally:
+                stop(server)
+            print(
+                f"{workers} worker(s): {len(latencies) / elapsed:8.1f} req/s"
+                f"   p50 {percentile(latencies, 50) * 1000:7.1f} ms"
+                f"   p99 {percentile(latencies, 99) * 1000:7.1f} ms"
+                f"   {errors} errors"
+            )
+    finally:
+        stop(mock)
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
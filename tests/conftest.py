@@ -0,0 +1,95 @@
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app imports its modules both as "src.services..." and as "services..."
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+
+from src.services.api.client import VespaAgentClient
+
+BACKEND_URL = "http://backend"
+
+class StaticConfig:
+    def __init__(self, url: str = BACKEND_URL):
+        self.url = url
+
+    def get_connection_endpoint(self):
+        return self.url
+
+@pytest.fixture
+def make_client():
+    """Build a VespaAgentClient whose requests are answered by `handler`."""
+    def build(handler) -> VespaAgentClient:
+        client = VespaAgentClient(StaticConfig())
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+    return build
+
+def stub_backend(request: httpx.Request) -> httpx.Response:
+    """Just enough of the assistant API for pages to render."""
+    path = request.url.path
+    if path == "/assistant/auth":
+        return httpx.Response(200, json={
+            "token": "token_alice", "id": "alice", "email": "alice@example.com",
+            "username": "alice", "roles": ["USER", "ADMIN"]
+        })
+    if path == "/assistant/llms":
+        return httpx.Response(200, json={"llms": [{
+            "id": "llm1", "name": "LLM 1", "type": "openai", "description": "", "createdAt": "2024-01-01T00:00:00"
+        }]})
+    if path == "/assistant/conversations":
+        return httpx.Response(200, json={"conversations": []})
+    if path.endswith("/messages"):
+        return httpx.Response(200, json={"messages": [], "hasMore": False})
+    return httpx.Response(404, json={"error-code": "NOT_FOUND", "message": "Not found"})
+
+@pytest.fixture
+def backend():
+    """Handler answering the app's backend requests; override it per test module."""
+    return stub_backend
+
+@pytest.fixture
+def app_client(tmp_path, monkeypatch, backend):
+    """
+    The whole app, served in-process and logged in as alice against
+    `backend`. Its event loop runs in another thread; run coroutines on it
+    with app_client.portal.call.
+    """
+    from starlette.testclient import TestClient
+
+    # The app keeps its config and session key in the working directory, and
+    # lucide looks up icons there
+    shutil.copy(os.path.join(ROOT, "src", "icons.py"), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    with TestClient(main.app) as client:
+        main.app.client.client = httpx.AsyncClient(transport=httpx.MockTransport(backend))
+        client.post("/api/login", data={"username": "alice", "password": "secret"})
+        client.post("/api/set-llm", json={"model": "llm1"})
+        yield client
+
+@pytest.fixture(scope="session")
+def mock_backend_url():
+    """The mock assistant API (src/services/mock), served on a free local port."""
+    import uvicorn
+    from src.services.mock.api import app as mock_app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(mock_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
@@ -0,0 +1,50 @@
+/**
+ * Replays a recorded chat answer through SSEDecoder and HtmlChunker and
+ * reports events per second. It also counts the HTML characters the browser
+ * parses: re-rendering the whole answer on every event, as chat.js used to,
+ * against appending committed fragments and re-rendering the pending tail.
+ *
+ *     node tests/js/bench_replay.mjs [transcript copies per answer] [chunk bytes]
+ */
+import { loadModule, loadTranscript, replay } from './replay.mjs';
+
+const copies = Number(process.argv[2] ?? 50);
+const chunkSize = Number(process.argv[3] ?? 1024);
+
+const modules = {
+    ...await loadModule('sse.js'),
+    ...await loadModule('stream_renderer.js'),
+};
+
+// A long answer: the recorded one repeated
+const recorded = loadTranscript('chat_answer.sse');
+const transcript = new Uint8Array(recorded.length * copies);
+for (let i = 0; i < copies; i++) transcript.set(recorded, i * recorded.length);
+
+const chunks = [];
+for (let start = 0; start < transcript.length; start += chunkSize) {
+    chunks.push(transcript.subarray(start, start + chunkSize));
+}
+
+let best = 0;
+let result;
+for (let run = 0; run < 5; run++) {
+    const started = performance.now();
+    result = replay(chunks, modules);
+    best = Math.max(best, result.events.length / ((performance.now() - started) / 1000));
+}
+
+let rerendered = 0;
+let incremental = 0;
+let received = 0;
+const chunker = new modules.HtmlChunker();
+for (const event of result.events) {
+    if (event.event !== 'content') continue;
+    received += event.data.length;
+    rerendered += received;
+    incremental += chunker.push(event.data).length + chunker.pending.length;
+}
+
+console.log(`${result.events.length} events, ${(transcript.length / 1024).toFixed(0)} KiB in ${chunkSize} B chunks`);
+console.log(`replay: ${Math.round(best).toLocaleString()} events/s`);
+console.log(`HTML parsed per answer: ${rerendered.toLocaleString()} chars re-rendering everything, ${incremental.toLocaleString()} incrementally`);
@@ -0,0 +1,59 @@
+/**
+ * Browser-free replay of recorded chat streams through the same modules the
+ * chat page uses: bytes are decoded and framed by SSEDecoder as in
+ * readEventStream, and content events go through HtmlChunker as in
+ * StreamRenderer.
+ */
+import { readFileSync } from 'node:fs';
+
+const STATIC_JS = new URL('../../src/static/js/', import.meta.url);
+const FIXTURES = new URL('./fixtures/', import.meta.url);
+
+/** Imports a module from src/static/js; they are ES modules without a package.json. */
+export async function loadModule(name) {
+    const source = readFileSync(new URL(name, STATIC_JS));
+    return import(`data:text/javascript;base64,${source.toString('base64')}`);
+}
+
+export function loadTranscript(name) {
+    return new Uint8Array(readFileSync(new URL(name, FIXTURES)));
+}
+
+/** The transcript with its LF line endings replaced. */
+export function withLineEnding(transcript, lineEnding) {
+    const text = new TextDecoder().decode(transcript).replaceAll('\n', lineEnding);
+    return new TextEncoder().encode(text);
+}
+
+/** Splits bytes at the given offsets. */
+export function splitAt(bytes, offsets) {
+    const chunks = [];
+    let start = 0;
+    for (const offset of [...offsets, bytes.length]) {
+        chunks.push(bytes.subarray(start, offset));
+        start = offset;
+    }
+    return chunks;
+}
+
+/** Replays byte chunks; returns the events and the HTML fragments committed. */
+export function replay(chunks, { SSEDecoder, HtmlChunker }) {
+    const textDecoder = new TextDecoder();
+    const decoder = new SSEDecoder();
+    const chunker = new HtmlChunker();
+    const events = [];
+    const fragments = [];
+
+    for (const chunk of chunks) {
+        for (const event of decoder.feed(textDecoder.decode(chunk, { stream: true }))) {
+            events.push(event);
+            if (event.event === 'content' || event.event === 'message') {
+                const fragment = chunker.push(event.data);
+                if (fragment) fragments.push(fragment);
+            }
+        }
+    }
+    const rest = chunker.flush();
+    if (rest) fragments.push(rest);
+    return { events, fragments, html: chunker.text };
+}
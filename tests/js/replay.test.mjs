@@ -0,0 +1,78 @@
+import assert from 'node:assert/strict';
+import { test } from 'node:test';
+
+import { loadModule, loadTranscript, replay, splitAt, withLineEnding } from './replay.mjs';
+
+const modules = {
+    ...await loadModule('sse.js'),
+    ...await loadModule('stream_renderer.js'),
+};
+const transcript = loadTranscript('chat_answer.sse');
+const expected = replay([transcript], modules);
+
+const VOID_ELEMENTS = /^(area|base|br|col|embed|hr|img|input|link|meta|source|track|wbr)$/i;
+
+function isBalanced(fragment) {
+    let depth = 0;
+    for (const [, closing, name] of fragment.matchAll(/<(\/?)([A-Za-z][\w-]*)[^>]*>/g)) {
+        if (VOID_ELEMENTS.test(name)) continue;
+        depth += closing ? -1 : 1;
+        if (depth < 0) return false;
+    }
+    return depth === 0;
+}
+
+test('the recorded answer is decoded into its events', () => {
+    const { events, html } = expected;
+    assert.equal(events.length, 20);
+    assert.deepEqual(events.map((event) => Number(event.id.split('-').pop())), [...Array(20).keys()]);
+    assert.equal(events.at(-1).event, 'end_of_response');
+    assert.equal(html, events.filter((event) => event.event === 'content').map((event) => event.data).join(''));
+    assert.match(html, /👋/);
+});
+
+test('events are the same however the bytes are split', () => {
+    for (const lineEnding of ['\n', '\r\n', '\r']) {
+        const bytes = withLineEnding(transcript, lineEnding);
+        for (let offset = 0; offset <= bytes.length; offset++) {
+            const { events, html } = replay(splitAt(bytes, [offset]), modules);
+            assert.deepEqual(events, expected.events, `${JSON.stringify(lineEnding)} split at byte ${offset}`);
+            assert.equal(html, expected.html);
+        }
+    }
+});
+
+test('events are the same when read one byte at a time', () => {
+    const offsets = [...Array(transcript.length).keys()].slice(1);
+    assert.deepEqual(replay(splitAt(transcript, offsets), modules).events, expected.events);
+});
+
+test('only balanced HTML is committed', () => {
+    const { fragments, html } = expected;
+    assert.equal(fragments.join(''), html);
+    for (const fragment of fragments) {
+        assert.ok(isBalanced(fragment), fragment);
+    }
+    // A <details> block arrives over two events and is committed in one piece
+    assert.ok(fragments.some((fragment) => fragment.startsWith('<details>') && fragment.includes('</details>')));
+});
+
+test('HTML pushed one character at a time commits the same text', () => {
+    const chunker = new modules.HtmlChunker();
+    let committed = '';
+    for (const ch of expected.html) {
+        const fragment = chunker.push(ch);
+        assert.ok(isBalanced(fragment), fragment);
+        committed += fragment;
+    }
+    assert.equal(committed + chunker.flush(), expected.html);
+});
+
+test('a "<" that starts no tag is committed as text', () => {
+    const chunker = new modules.HtmlChunker();
+    assert.equal(chunker.push('1 <'), '1 ');
+    assert.equal(chunker.push(' 2 &amp; 3'), '< 2 &amp; 3');
+    assert.equal(chunker.push('<b>bo'), '');
+    assert.equal(chunker.pending, '<b>bo');
+    assert.equal(chunker.push('ld</b>'), '<b>bold</b>');
+});
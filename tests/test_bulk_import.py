@@ -0,0 +1,122 @@
+import asyncio
+import io
+
+import httpx
+
+from conftest import StaticConfig
+from src.services.api.client import VespaAgentClient
+from src.services.api.types import BatchActionResponse, BatchItemResult, ErrorResponse
+from src.services.jobs.bulk_import import BulkImportManager, ROW_CREATED, ROW_FAILED
+from src.services.jobs.csv_stream import open_knowledge_base_csv
+
+class Upload:
+    """The read() side of an uploaded file."""
+
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.data.read(size)
+
+class FakeClient:
+    """Answers each batch with the next response, or creates all its rows."""
+
+    def __init__(self, responses=None, delay: float = 0.001):
+        self.responses = responses or []
+        self.delay = delay
+        self.calls = []
+
+    async def create_knowledge_bases_batch(self, kb_items, token):
+        self.calls.append([kb_data["title"] for kb_data in kb_items])
+        await asyncio.sleep(self.delay)
+        if self.responses:
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return BatchActionResponse(results=[
+            BatchItemResult(index=index, status="success") for index in range(len(kb_items))
+        ])
+
+async def run_job(manager, rows, token: str = "token"):
+    job = manager.start(rows, token, owner_id="alice")
+    while not job.finished:
+        await asyncio.sleep(0.01)
+    return job
+
+def test_unreadable_upload_stops_the_job_once():
+    # Valid rows fill the first read chunks; the bytes after them are not UTF-8
+    rows = "".join(f"title {i},content {i}\n" for i in range(8000))
+    data = b"Title,Content\n" + rows.encode() + b"\xe9\xe9,broken\n"
+    client = FakeClient()
+
+    async def run():
+        manager = BulkImportManager(client)
+        job = await run_job(manager, await open_knowledge_base_csv(Upload(data)))
+        calls = sum(len(batch) for batch in client.calls)
+        # Nothing keeps creating rows after the job reported finished
+        await asyncio.sleep(0.1)
+        return job, calls
+
+    job, calls = asyncio.run(run())
+    sent = [title for batch in client.calls for title in batch]
+    assert job.error == "The file is not valid UTF-8 text"
+    assert len(sent) == calls == len(job.results)
+    assert job.created + job.failed == len(job.results)
+    assert all(row.status in (ROW_CREATED, ROW_FAILED) for row in job.results)
+
+def test_rows_are_sent_in_batches_and_never_resent():
+    request = httpx.Request("POST", "http://backend/assistant/knowledge-base/batch")
+    client = FakeClient([
+        BatchActionResponse(results=[
+            BatchItemResult(index=0, status="success"),
+            BatchItemResult(index=1, status="error", message="Duplicate title"),
+        ]),
+        httpx.ReadTimeout("timed out", request=request),
+    ])
+    rows = [{"title": title, "content": ""} for title in "abcde"]
+
+    job = asyncio.run(run_job(BulkImportManager(client, concurrency=1, batch_size=2), rows))
+    # The batch that timed out may have been created, so it is not sent again
+    assert client.calls == [["a", "b"], ["c", "d"], ["e"]]
+    assert [row.status for row in job.results] == [ROW_CREATED, ROW_FAILED, ROW_FAILED, ROW_FAILED, ROW_CREATED]
+    assert [row.message for row in job.results[1:4]] == ["Duplicate title", "timed out", "timed out"]
+    assert (job.created, job.failed) == (2, 3)
+
+def test_rows_missing_from_the_results_fail():
+    client = FakeClient([BatchActionResponse(results=[BatchItemResult(index=1, status="success")])])
+    rows = [{"title": title, "content": ""} for title in "ab"]
+
+    job = asyncio.run(run_job(BulkImportManager(client, batch_size=2), rows))
+    assert [row.status for row in job.results] == [ROW_FAILED, ROW_CREATED]
+
+def test_rejected_token_stops_the_import():
+    expired = ErrorResponse(**{"error-code": "UNAUTHORIZED", "message": "Token expired", "statusCode": 401})
+    client = FakeClient([
+        BatchActionResponse(results=[
+            BatchItemResult(index=0, status="success"),
+            BatchItemResult(index=1, status="error", message="Not sent: Token expired"),
+        ], error=expired),
+    ])
+    rows = [{"title": title, "content": ""} for title in "abcdef"]
+
+    job = asyncio.run(run_job(BulkImportManager(client, concurrency=1, batch_size=2), rows))
+    assert client.calls == [["a", "b"]]
+    assert job.error == "Token expired"
+    assert [row.status for row in job.results] == [ROW_CREATED, ROW_FAILED]
+
+def test_import_against_the_mock_backend(mock_backend_url):
+    rows = [{"title": f"imported {i}", "content": f"content {i}"} for i in range(450)]
+
+    async def run():
+        client = VespaAgentClient(StaticConfig(mock_backend_url))
+        auth = await client.authenticate("alice", "1")
+        job = await run_job(BulkImportManager(client, batch_size=200), rows, auth.token)
+        listed = await client.get_knowledge_bases(auth.token)
+        await client.close()
+        return job, listed
+
+    job, listed = asyncio.run(run())
+    assert (job.created, job.failed, job.error) == (450, 0, None)
+    titles = {kb.title for kb in listed.knowledgeBases}
+    assert all(row["title"] in titles for row in rows)
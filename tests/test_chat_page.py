@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from conftest import stub_backend
+
+# Backend latency of each call the conversation page makes
+DELAY = 0.3
+SLOW_PATHS = ("/assistant/conversations", "/assistant/llms", "/assistant/conversations/c1/messages")
+
+async def slow_backend(request: httpx.Request) -> httpx.Response:
+    if request.url.path in SLOW_PATHS:
+        await asyncio.sleep(DELAY)
+    return stub_backend(request)
+
+async def no_llms_backend(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/assistant/llms":
+        return httpx.Response(404, json={"error-code": "NOT_FOUND", "message": "No LLMs are configured"})
+    return await slow_backend(request)
+
+@pytest.fixture
+def backend():
+    return slow_backend
+
+def clear_caches():
+    """Drop what rendering the home page after login cached."""
+    import main
+    main.app.client.llms_cache.invalidate()
+    main.app.client.conversations_cache.invalidate()
+
+def test_conversation_page_loads_backend_data_concurrently(app_client):
+    clear_caches()
+
+    started = time.monotonic()
+    page = app_client.get("/conversation/c1")
+    elapsed = time.monotonic() - started
+
+    assert page.status_code == 200
+    # Three calls one after another would take 3 * DELAY
+    assert DELAY <= elapsed < 2 * DELAY
+
+@pytest.mark.parametrize("backend", [no_llms_backend])
+def test_a_failed_call_still_renders_the_rest_of_the_page(app_client):
+
+    page = app_client.get("/conversation/c1")
+    assert page.status_code == 200
+    assert "No LLMs are configured" in page.text
+    assert 'id="chat-history' in page.text
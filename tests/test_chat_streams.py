@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import src.services.jobs.chat_streams as chat_streams
+from conftest import StaticConfig
+from src.services.api.client import VespaAgentClient
+from src.services.jobs.chat_streams import ChatStreamManager
+
+def endless_answer(frames: int):
+    """A stand-in for client.stream_conversation sending frames, then stalling."""
+    def stream_conversation(**kwargs):
+        async def generate():
+            for i in range(frames):
+                yield f"event: content\ndata: token {i}\n\n"
+            await asyncio.Event().wait()
+        return generate()
+    return stream_conversation
+
+def start_overflowing_answer(app_client, conversation_id: str):
+    """Start an answer longer than the replay buffer in the app."""
+    import main
+
+    manager = main.app.chat_streams
+    main.app.client.stream_conversation = endless_answer(manager.buffer_size * 2)
+
+    async def start():
+        stream = manager.start(conversation_id, "alice", "llm1", "long question", "token_alice")
+        while stream.next_seq < manager.buffer_size * 2:
+            await asyncio.sleep(0.01)
+        return stream
+
+    return app_client.portal.call(start)
+
+def test_attaching_past_the_replay_buffer_is_refused(app_client):
+    start_overflowing_answer(app_client, "c1")
+
+    response = app_client.post("/api/chat", data={"text": "long question", "conversation_id": "c1"})
+    assert response.status_code == 410
+    assert "Reload the conversation" in response.json()["message"]
+
+    response = app_client.get("/api/conversations/c1/stream")
+    assert response.status_code == 410
+
+def test_page_does_not_follow_an_answer_past_the_replay_buffer(app_client):
+    start_overflowing_answer(app_client, "c1")
+
+    page = app_client.get("/conversation/c1")
+    assert page.status_code == 200
+    assert "data-streaming-text" not in page.text
+
+def test_upstream_is_closed_soon_after_the_client_disconnects(mock_backend_url, monkeypatch):
+    # The mock sends a frame every 0.5s, so the cancellation often lands as one arrives
+    grace = 0.5
+    monkeypatch.setattr(chat_streams, "CHAT_STREAM_DISCONNECT_POLL", 0.1)
+
+    async def run():
+        client = VespaAgentClient(StaticConfig(mock_backend_url))
+        auth = await client.authenticate("alice", "1")
+        conversation = await client.create_conversation(auth.token)
+        manager = ChatStreamManager(client, disconnect_grace=grace)
+        stream = manager.start(conversation.conversationId, "alice", "llm1", "hello", auth.token)
+        task = manager._tasks[stream.id]
+
+        frames = stream.subscribe()
+        await frames.__anext__()
+        # What the response does when the browser goes away
+        await frames.aclose()
+        disconnected = time.monotonic()
+
+        await asyncio.wait([task], timeout=5)
+        closed_after = time.monotonic() - disconnected
+        stats = manager.stats()
+
+        # The mock stores every part of the answer it sends; none may follow
+        answered = await client.get_conversation(conversation.conversationId, auth.token)
+        await asyncio.sleep(1.5)
+        later = await client.get_conversation(conversation.conversationId, auth.token)
+        await client.close()
+        return task, closed_after, stats, client, len(answered.messages), len(later.messages)
+
+    task, closed_after, stats, client, answered, later = asyncio.run(run())
+    assert task.done()
+    assert closed_after < grace + 1
+    assert stats["cancelled"] == 1 and stats["completed"] == 0 and stats["active"] == 0
+    assert client.active_streams == 0
+    assert answered == later
@@ -0,0 +1,41 @@
+import asyncio
+
+import httpx
+
+from src.services.api.types import ErrorResponse, LLMsResponse
+
+LLMS = {"llms": []}
+
+def test_llms_auth_error_is_not_shared_between_tokens(make_client):
+    async def handler(request):
+        # Slow enough for both callers to join the same load
+        await asyncio.sleep(0.05)
+        if request.headers["Authorization"] == "Bearer stale_token":
+            return httpx.Response(401, json={"error-code": "UNAUTHORIZED", "message": "Token expired"})
+        return httpx.Response(200, json=LLMS)
+
+    client = make_client(handler)
+
+    async def run():
+        return await asyncio.gather(client.get_llms("stale_token"), client.get_llms("valid_token"))
+
+    stale, valid = asyncio.run(run())
+    assert isinstance(stale, ErrorResponse) and stale.statusCode == 401
+    assert isinstance(valid, LLMsResponse)
+
+def test_llms_concurrent_loads_are_coalesced(make_client):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=LLMS)
+
+    client = make_client(handler)
+
+    async def run():
+        return await asyncio.gather(*(client.get_llms(f"token_{i}") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, LLMsResponse) for result in results)
+    assert len(calls) == 1
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from src.services.config.config_service import CONFIG_FILE_MODE, ConfigService
+
+@pytest.fixture
+def config_service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return ConfigService()
+
+def file_mode(service: ConfigService) -> int:
+    return stat.S_IMODE(os.stat(service.config_file).st_mode)
+
+def test_new_config_file_is_not_private(config_service):
+    assert file_mode(config_service) == CONFIG_FILE_MODE
+
+def test_update_keeps_the_file_mode(config_service):
+    os.chmod(config_service.config_file, 0o640)
+    asyncio.run(config_service.update_connection_endpoint("http://backend"))
+    assert file_mode(config_service) == 0o640
+    assert json.loads(config_service.config_file.read_text()) == {"connection_endpoint": "http://backend"}
+    assert config_service.get_connection_endpoint() == "http://backend"
+
+def test_update_writes_off_the_event_loop(config_service, monkeypatch):
+    threads = []
+    save = config_service._save
+
+    def recording_save(config):
+        threads.append(threading.get_ident())
+        save(config)
+
+    monkeypatch.setattr(config_service, "_save", recording_save)
+
+    async def run():
+        # Another worker holding the file lock must not stall this loop
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        with ConfigService()._file_lock():
+            update = asyncio.create_task(config_service.update_connection_endpoint("http://backend"))
+            await asyncio.sleep(0.1)
+            assert not update.done()
+        await update
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(run()) >= 5
+    assert threads and threads[0] != threading.get_ident()
+
+def test_change_from_another_worker_is_picked_up(config_service):
+    other_worker = ConfigService()
+    asyncio.run(other_worker.update_connection_endpoint("http://elsewhere"))
+    # Same-second rewrites can share an mtime on coarse file systems
+    os.utime(other_worker.config_file, ns=(0, config_service._mtime + 1))
+    assert config_service.reload_if_changed()
+    assert config_service.get_connection_endpoint() == "http://elsewhere"
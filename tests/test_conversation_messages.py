@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+
+from src.services.api.types import ErrorResponse, MessagesResponse
+
+def message(i: int) -> dict:
+    return {
+        "messageId": f"m{i}",
+        "sender": "alice" if i % 2 == 0 else "assistant",
+        "senderType": "USER" if i % 2 == 0 else "ASSISTANT",
+        "content": f"message {i}",
+        "timestamp": "2024-01-01T00:00:00",
+    }
+
+CONVERSATION = {
+    "conversationId": "c1",
+    "title": "Test",
+    "messages": [message(i) for i in range(7)],
+    "createdAt": "2024-01-01T00:00:00",
+    "updatedAt": "2024-01-01T00:00:00",
+}
+
+def legacy_backend(request):
+    """A backend that has no messages endpoint."""
+    if request.url.path == "/assistant/conversations/c1":
+        return httpx.Response(200, json=CONVERSATION)
+    if request.url.path == "/assistant/conversations/missing":
+        return httpx.Response(404, json={"error-code": "CONVERSATION_NOT_FOUND", "message": "Conversation not found"})
+    return httpx.Response(404, json={"detail": "Not Found"})
+
+def test_messages_are_paged_from_the_conversation_without_the_endpoint(make_client):
+    client = make_client(legacy_backend)
+
+    first = asyncio.run(client.get_conversation_messages("c1", "token", limit=3))
+    assert isinstance(first, MessagesResponse)
+    assert [m.messageId for m in first.messages] == ["m6", "m5", "m4"]
+    assert first.hasMore
+
+    last = asyncio.run(client.get_conversation_messages("c1", "token", before="m4", limit=5))
+    assert [m.messageId for m in last.messages] == ["m3", "m2", "m1", "m0"]
+    assert not last.hasMore
+
+def test_missing_conversation_is_still_an_error(make_client):
+    client = make_client(legacy_backend)
+    result = asyncio.run(client.get_conversation_messages("missing", "token"))
+    assert isinstance(result, ErrorResponse) and result.statusCode == 404
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from src.services.jobs.csv_stream import CsvRecordStream, open_knowledge_base_csv
+from test_bulk_import import Upload
+
+def read_records(data: bytes, chunk_size: int):
+    async def run():
+        stream = CsvRecordStream(Upload(data), chunk_size=chunk_size)
+        records = []
+        while (record := await stream.next_record()) is not None:
+            records.append(record)
+        return records
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("separator", ["\u2028", "\u2029", "\x85", "\x0b", "\x0c", "\x1c"])
+def test_unicode_line_separators_stay_inside_unquoted_fields(separator):
+    data = f"Title,Content\nFirst,one{separator}two\nSecond,three\n".encode("utf-8")
+
+    async def run():
+        return [row async for row in await open_knowledge_base_csv(Upload(data))]
+
+    assert asyncio.run(run()) == [
+        {"title": "First", "content": f"one{separator}two"},
+        {"title": "Second", "content": "three"},
+    ]
+    for chunk_size in range(1, len(data) + 1):
+        assert read_records(data, chunk_size)[1] == ["First", f"one{separator}two"], chunk_size
+
+@pytest.mark.parametrize("line_ending", ["\r\n", "\n", "\r"])
+def test_records_are_the_same_at_every_chunk_size(line_ending):
+    text = 'Title,Content\n"A","multi\nline"\nB,plain\n"C","with ""quotes"""\n'.replace("\n", line_ending)
+    data = text.encode("utf-8")
+    expected = [
+        ["Title", "Content"],
+        ["A", f"multi{line_ending}line"],
+        ["B", "plain"],
+        ["C", 'with "quotes"'],
+    ]
+    # Small chunks put a CRLF across a chunk boundary at every position
+    for chunk_size in range(1, len(data) + 1):
+        assert read_records(data, chunk_size) == expected, chunk_size
@@ -0,0 +1,16 @@
+from starlette.testclient import TestClient
+
+def test_stats_report_every_component(tmp_path, monkeypatch):
+    # The app keeps its config and session key in the working directory
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    with TestClient(main.app) as client:
+        response = client.get("/health/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert set(stats) == {"pid", "pool", "caches", "resilience", "chat_streams"}
+    assert "active_streams" in stats["pool"]
+    assert set(stats["caches"]) == {"llms", "conversations"}
+    assert {"retries", "hedging", "breakers"} <= set(stats["resilience"])
+    assert "cancelled" in stats["chat_streams"]
@@ -0,0 +1,147 @@
+import asyncio
+
+import httpx
+import pytest
+
+import src.services.api.client as client_module
+from src.services.api.resilience import HTTP_HEDGE_MIN_DELAY, HTTP_HEDGE_MIN_SAMPLES, HedgeBudget, LatencyTracker
+from src.services.api.types import LLMsResponse
+
+KEY = "GET /assistant/llms"
+LLMS = {"llms": [{"id": "llm1", "name": "LLM 1", "type": "openai", "description": "", "createdAt": "2024-01-01T00:00:00"}]}
+# Long enough that a copy this slow is never the one that answers
+SLOW = 5.0
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(client_module, "backoff_delay", lambda attempt: 0)
+
+class ScriptedCopies:
+    """
+    Answers the n-th request after script[n][0] seconds with script[n][1]: a
+    status code or an exception class. Records which copies were cancelled.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.sent = 0
+        self.cancelled = []
+        self.cancelled_event = asyncio.Event()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        copy = self.sent
+        self.sent += 1
+        delay, outcome = self.script[copy]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(copy)
+            self.cancelled_event.set()
+            raise
+        if isinstance(outcome, type) and issubclass(outcome, Exception):
+            raise outcome("injected", request=request)
+        return httpx.Response(outcome, json=LLMS if outcome == 200 else {"error-code": "X", "message": "injected"})
+
+def hedging_client(make_client, handler, budget: HedgeBudget = None):
+    """A client that hedges the LLM list after HTTP_HEDGE_MIN_DELAY, with a hedge to spend."""
+    client = make_client(handler)
+    latencies = client.latencies[KEY] = LatencyTracker()
+    # Enough fast samples that the requests made here do not move the percentile
+    for _ in range(HTTP_HEDGE_MIN_SAMPLES * 5):
+        latencies.record(0.001)
+    client.hedge_budget = budget or HedgeBudget(ratio=1, max_burst=1)
+    return client
+
+def fetch(client, handler=None):
+    async def run():
+        result = await client._fetch_llms("token")
+        if handler is not None:
+            # The loser is cancelled on the way out; let the cancellation land
+            await asyncio.wait_for(handler.cancelled_event.wait(), timeout=1)
+        return result
+    return asyncio.run(run())
+
+def test_fast_primary_is_not_hedged(make_client):
+    handler = ScriptedCopies([(0, 200)])
+    client = hedging_client(make_client, handler)
+    assert isinstance(fetch(client), LLMsResponse)
+    assert handler.sent == 1
+    assert client.hedge_budget.stats()["hedged"] == 0
+
+def test_hedge_answers_and_primary_is_cancelled(make_client):
+    handler = ScriptedCopies([(SLOW, 200), (0, 200)])
+    client = hedging_client(make_client, handler)
+    assert isinstance(fetch(client, handler), LLMsResponse)
+    assert handler.cancelled == [0]
+    stats = client.hedge_budget.stats()
+    assert (stats["hedged"], stats["won"]) == (1, 1)
+
+def test_primary_answers_and_hedge_is_cancelled(make_client):
+    handler = ScriptedCopies([(HTTP_HEDGE_MIN_DELAY * 2, 200), (SLOW, 200)])
+    client = hedging_client(make_client, handler)
+    assert isinstance(fetch(client, handler), LLMsResponse)
+    assert handler.cancelled == [1]
+    stats = client.hedge_budget.stats()
+    assert (stats["hedged"], stats["won"]) == (1, 0)
+
+def test_primary_failing_first_leaves_the_answer_to_the_hedge(make_client):
+    handler = ScriptedCopies([(HTTP_HEDGE_MIN_DELAY * 2, httpx.ReadError), (HTTP_HEDGE_MIN_DELAY * 4, 200)])
+    client = hedging_client(make_client, handler)
+    assert isinstance(fetch(client), LLMsResponse)
+    assert handler.sent == 2
+    assert client.retries == 0
+    assert client.hedge_budget.stats()["won"] == 1
+
+def test_hedge_failing_first_waits_for_the_primary(make_client):
+    handler = ScriptedCopies([(HTTP_HEDGE_MIN_DELAY * 4, 200), (0, httpx.ReadError)])
+    client = hedging_client(make_client, handler)
+    assert isinstance(fetch(client), LLMsResponse)
+    assert handler.sent == 2
+    assert client.retries == 0
+    assert client.hedge_budget.stats()["won"] == 0
+
+def test_both_copies_failing_is_retried(make_client):
+    handler = ScriptedCopies([
+        (HTTP_HEDGE_MIN_DELAY * 2, httpx.ReadError),
+        (0, httpx.ReadError),
+        (0, 200),
+    ])
+    client = hedging_client(make_client, handler)
+    assert isinstance(fetch(client), LLMsResponse)
+    assert handler.sent == 3
+    assert client.retries == 1
+
+def test_hedges_are_denied_once_the_budget_is_spent(make_client):
+    handler = ScriptedCopies([(HTTP_HEDGE_MIN_DELAY * 2, 200)] * 4)
+    client = hedging_client(make_client, handler, HedgeBudget(ratio=0.5, max_burst=1))
+
+    async def run():
+        return [await client._fetch_llms("token") for _ in range(3)]
+
+    assert all(isinstance(result, LLMsResponse) for result in asyncio.run(run()))
+    # Half a hedge earned per request: the first is denied, the second hedged
+    # and the third denied again
+    assert handler.sent == 4
+    stats = client.resilience_stats()["hedging"]
+    assert (stats["requests"], stats["hedged"], stats["denied"], stats["won"]) == (3, 1, 2, 0)
+
+def test_budget_refills_up_to_its_burst():
+    budget = HedgeBudget(ratio=0.25, max_burst=2)
+    for _ in range(20):
+        budget.deposit()
+    assert budget.spend() and budget.spend()
+    assert not budget.spend()
+    for _ in range(3):
+        budget.deposit()
+    assert not budget.spend()
+    budget.deposit()
+    assert budget.spend()
+    budget.record_win()
+    assert budget.stats() == {
+        "requests": 24,
+        "hedged": 3,
+        "won": 1,
+        "denied": 2,
+        "hedge_rate": 3 / 24,
+        "win_rate": 1 / 3,
+    }
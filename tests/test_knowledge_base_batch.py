@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import src.services.api.client as client_module
+from conftest import stub_backend
+from src.services.api.client import _chunk_ndjson
+
+def records(count: int, content: str = ""):
+    return [{"title": f"kb{i}", "content": content} for i in range(count)]
+
+def test_chunks_hold_at_most_max_items():
+    chunks = list(_chunk_ndjson(records(7), max_items=3, max_bytes=10_000))
+    assert [(offset, len(lines)) for offset, lines in chunks] == [(0, 3), (3, 3), (6, 1)]
+    assert json.loads(chunks[1][1][0]) == {"title": "kb3", "content": ""}
+
+def test_chunks_hold_at_most_max_bytes():
+    line_size = len(json.dumps(records(1, "x" * 50)[0]).encode()) + 1
+    chunks = list(_chunk_ndjson(records(5, "x" * 50), max_items=100, max_bytes=2 * line_size + 1))
+    assert [(offset, len(lines)) for offset, lines in chunks] == [(0, 2), (2, 2), (4, 1)]
+    assert all(sum(map(len, lines)) <= 2 * line_size + 1 for _, lines in chunks)
+
+def test_a_record_larger_than_max_bytes_gets_its_own_chunk():
+    items = records(1) + records(1, "x" * 500) + records(1)
+    chunks = list(_chunk_ndjson(items, max_items=100, max_bytes=100))
+    assert [(offset, len(lines)) for offset, lines in chunks] == [(0, 1), (1, 1), (2, 1)]
+
+def test_lines_are_utf8_ndjson():
+    (_, lines), = _chunk_ndjson([{"title": "ünïcödé", "content": "a\nb"}], max_items=10, max_bytes=1000)
+    assert lines == ['{"title": "ünïcödé", "content": "a\\nb"}\n'.encode("utf-8")]
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(client_module, "KB_BATCH_MAX_ITEMS", 2)
+
+def batch_backend(answer):
+    """Backend answering each batch request with answer(chunk number, titles)."""
+    requests = []
+
+    async def handler(request):
+        titles = [json.loads(line)["title"] for line in (await request.aread()).decode().splitlines()]
+        requests.append(titles)
+        return answer(len(requests) - 1, titles)
+
+    return handler, requests
+
+def all_created(chunk, titles):
+    return httpx.Response(200, json={"results": [
+        {"index": index, "id": title, "status": "success"} for index, title in enumerate(titles)
+    ]})
+
+def test_result_indexes_are_offset_across_chunks(make_client, small_chunks):
+    handler, requests = batch_backend(all_created)
+    response = asyncio.run(make_client(handler).create_knowledge_bases_batch(records(5), "token"))
+
+    assert requests == [["kb0", "kb1"], ["kb2", "kb3"], ["kb4"]]
+    assert [(item.index, item.id) for item in response.results] == [(i, f"kb{i}") for i in range(5)]
+    assert response.error is None
+
+def test_a_rejected_chunk_fails_its_items_and_the_next_is_sent(make_client, small_chunks):
+    def answer(chunk, titles):
+        if chunk == 1:
+            return httpx.Response(422, json={"error-code": "INVALID", "message": "Bad chunk"})
+        return all_created(chunk, titles)
+
+    handler, requests = batch_backend(answer)
+    response = asyncio.run(make_client(handler).create_knowledge_bases_batch(records(5), "token"))
+
+    assert len(requests) == 3
+    assert [(item.index, item.status, item.message) for item in response.results] == [
+        (0, "success", None), (1, "success", None),
+        (2, "error", "Bad chunk"), (3, "error", "Bad chunk"),
+        (4, "success", None),
+    ]
+    assert response.error is None
+
+def test_a_rejected_token_keeps_the_results_of_earlier_chunks(make_client, small_chunks):
+    def answer(chunk, titles):
+        if chunk == 1:
+            return httpx.Response(401, json={"error-code": "UNAUTHORIZED", "message": "Token expired"})
+        return all_created(chunk, titles)
+
+    handler, requests = batch_backend(answer)
+    response = asyncio.run(make_client(handler).create_knowledge_bases_batch(records(5), "token"))
+
+    # Nothing is sent after the token was rejected
+    assert len(requests) == 2
+    assert response.error.statusCode == 401
+    assert [(item.index, item.status) for item in response.results] == [
+        (0, "success"), (1, "success"), (2, "error"), (3, "error"), (4, "error")
+    ]
+    assert response.results[4].message == "Not sent: Token expired"
+
+class KnowledgeBaseBackend:
+    """Lists knowledge bases and deletes them in batches, failing on "locked"."""
+
+    def __init__(self, ids):
+        self.ids = list(ids)
+        self.batches = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/assistant/knowledge-base":
+            return httpx.Response(200, json={"knowledgeBases": [
+                {"id": kb_id, "title": kb_id, "content": "", "createdAt": "2024-01-01T00:00:00"} for kb_id in self.ids
+            ]})
+        if request.url.path == "/assistant/knowledge-base/batch/delete":
+            ids = [json.loads(line)["id"] for line in (await request.aread()).decode().splitlines()]
+            self.batches.append(ids)
+            results = []
+            for index, kb_id in enumerate(ids):
+                if kb_id == "locked":
+                    results.append({"index": index, "id": kb_id, "status": "error", "message": "Locked"})
+                else:
+                    self.ids.remove(kb_id)
+                    results.append({"index": index, "id": kb_id, "status": "success"})
+            return httpx.Response(200, json={"results": results})
+        return stub_backend(request)
+
+@pytest.fixture
+def backend():
+    return KnowledgeBaseBackend([f"kb{i}" for i in range(5)] + ["locked"])
+
+def test_delete_all_knowledge_bases_uses_batches(app_client, backend):
+    response = app_client.delete("/api/knowledge-base/delete/all", headers={"HX-Request": "true"})
+
+    assert response.status_code == 200
+    assert backend.batches == [[f"kb{i}" for i in range(5)] + ["locked"]]
+    assert backend.ids == ["locked"]
+    assert "1 of 6 knowledge bases could not be deleted: Locked" in response.text
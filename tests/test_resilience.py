@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+import pytest
+
+from conftest import StaticConfig
+import src.services.api.client as client_module
+from src.services.api.resilience import BREAKER_FAILURE_THRESHOLD, BREAKER_OPEN, CircuitBreaker, HTTP_RETRY_ATTEMPTS
+from src.services.api.types import ErrorResponse, GenericActionResponse, User
+
+USER = {"id": "u1", "username": "alice", "email": "alice@example.com", "roles": ["admin"]}
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(client_module, "backoff_delay", lambda attempt: 0)
+
+def scripted(outcomes, calls):
+    """A handler answering with each outcome in turn, then 200s."""
+    def handler(request):
+        calls.append(request.method)
+        outcome = outcomes.pop(0) if outcomes else 200
+        if isinstance(outcome, type) and issubclass(outcome, Exception):
+            raise outcome("injected", request=request)
+        if outcome == 200:
+            return httpx.Response(200, json=USER)
+        return httpx.Response(outcome, json={"error-code": "X", "message": "injected"})
+    return handler
+
+def test_get_is_retried_on_transient_status(make_client):
+    calls = []
+    client = make_client(scripted([503, 502], calls))
+    result = asyncio.run(client.get_user("u1", "token"))
+    assert isinstance(result, User)
+    assert len(calls) == 3
+    assert client.retries == 2
+
+def test_get_gives_up_after_the_last_attempt(make_client):
+    calls = []
+    client = make_client(scripted([503] * 10, calls))
+    result = asyncio.run(client.get_user("u1", "token"))
+    assert isinstance(result, ErrorResponse) and result.statusCode == 503
+    assert len(calls) == HTTP_RETRY_ATTEMPTS
+
+def test_post_is_not_retried_once_sent(make_client):
+    calls = []
+    client = make_client(scripted([503], calls))
+    result = asyncio.run(client.create_user({"username": "bob", "email": "e", "password": "p"}, "token"))
+    assert isinstance(result, ErrorResponse)
+    assert calls == ["POST"]
+
+def test_post_is_retried_when_never_sent(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) == 1:
+            raise httpx.ConnectError("injected", request=request)
+        return httpx.Response(200, json={"status": "success", "message": "created"})
+
+    client = make_client(handler)
+    result = asyncio.run(client.create_user({"username": "bob", "email": "e", "password": "p"}, "token"))
+    assert isinstance(result, GenericActionResponse)
+    assert calls == ["POST", "POST"]
+
+def test_breaker_fails_fast_once_open(make_client):
+    calls = []
+    client = make_client(scripted([500] * 100, calls))
+
+    async def run():
+        return [await client.get_user("u1", "token") for _ in range(4)]
+
+    results = asyncio.run(run())
+    assert len(calls) == BREAKER_FAILURE_THRESHOLD
+    assert results[-1].errorCode == "SERVICE_UNAVAILABLE"
+    assert client.resilience_stats()["breakers"]["GET /assistant/users/{id}"]["state"] == BREAKER_OPEN
+
+def test_breaker_lets_one_trial_through_after_reset_timeout(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("src.services.api.resilience.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 31
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+def test_breakers_are_reset_for_a_new_backend(make_client):
+    calls = []
+    client = make_client(scripted([500] * 100, calls))
+    asyncio.run(client.get_user("u1", "token"))
+    asyncio.run(client.get_user("u1", "token"))
+    assert client.breakers["GET /assistant/users/{id}"].state == BREAKER_OPEN
+
+    async def switch():
+        await client.update_base_url()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(scripted([], calls)))
+        return await client.get_user("u1", "token")
+
+    assert isinstance(asyncio.run(switch()), User)
+
+def test_error_status_without_error_code_is_an_error(make_client):
+    client = make_client(lambda request: httpx.Response(404, json={"detail": "Not Found"}))
+    result = asyncio.run(client.get_user("u1", "token"))
+    assert isinstance(result, ErrorResponse)
+    assert result.statusCode == 404 and result.message == "Not Found"
+
+def test_non_json_error_body_is_an_error(make_client):
+    client = make_client(lambda request: httpx.Response(502, text="<html>Bad Gateway</html>"))
+    result = asyncio.run(client.get_user("u1", "token"))
+    assert isinstance(result, ErrorResponse) and result.errorCode == "BAD_RESPONSE"
+
+def test_pool_timeouts_are_counted_for_every_attempt(make_client):
+    calls = []
+    client = make_client(scripted([httpx.PoolTimeout] * 10, calls))
+    with pytest.raises(httpx.PoolTimeout):
+        asyncio.run(client.get_user("u1", "token"))
+    assert client.pool_stats()["pool_timeouts"] == HTTP_RETRY_ATTEMPTS
+
+def test_pool_timeout_of_a_saturated_pool_is_counted(mock_backend_url):
+    client = client_module.VespaAgentClient(StaticConfig(mock_backend_url))
+    client.client = httpx.AsyncClient(limits=httpx.Limits(max_connections=1), timeout=httpx.Timeout(5, pool=0.05))
+
+    async def run():
+        # An unread response keeps the only connection checked out
+        async with client.client.stream("GET", f"{mock_backend_url}/assistant/llms"):
+            with pytest.raises(httpx.PoolTimeout):
+                await client.get_user("u1", "token")
+        await client.close()
+
+    asyncio.run(run())
+    assert client.pool_stats()["pool_timeouts"] == HTTP_RETRY_ATTEMPTS
@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+from conftest import stub_backend
+
+class ExpiringBackend:
+    """Rejects the session token once `expired` is set."""
+
+    def __init__(self):
+        self.expired = False
+        self.paths = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if self.expired and request.url.path != "/assistant/auth":
+            return httpx.Response(401, json={"error-code": "UNAUTHORIZED", "message": "Token expired"})
+        return stub_backend(request)
+
+@pytest.fixture
+def backend():
+    return ExpiringBackend()
+
+@pytest.mark.parametrize("path", ["/settings/chat-history", "/conversation/c1"])
+def test_expired_session_redirects_to_logout(app_client, backend, path):
+    import main
+    main.app.client.llms_cache.invalidate()
+    main.app.client.conversations_cache.invalidate()
+    backend.expired = True
+
+    response = app_client.get(path, follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"].startswith("/api/logout?message=")
+
+def test_valid_session_is_not_redirected(app_client):
+    response = app_client.get("/settings/chat-history", follow_redirects=False)
+    assert response.status_code == 200
+
+def test_expiry_does_not_leak_into_later_requests(app_client, backend):
+    import main
+    main.app.client.conversations_cache.invalidate()
+    backend.expired = True
+    assert app_client.get("/settings/chat-history", follow_redirects=False).status_code == 303
+
+    backend.expired = False
+    assert app_client.get("/settings/chat-history", follow_redirects=False).status_code == 200
+
+def test_expired_session_redirects_from_cached_chat_page(app_client, backend):
+    assert app_client.get("/", follow_redirects=False).status_code == 200
+    backend.expired = True
+
+    response = app_client.get("/", follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"].startswith("/api/logout?message=")
+
+def test_cached_chat_page_checks_the_session_with_one_call(app_client, backend):
+    assert app_client.get("/", follow_redirects=False).status_code == 200
+    backend.paths.clear()
+
+    assert app_client.get("/", follow_redirects=False).status_code == 200
+    assert backend.paths == ["/assistant/llms"]
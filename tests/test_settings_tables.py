@@ -0,0 +1,43 @@
+import httpx
+import pytest
+
+from conftest import stub_backend
+
+def conversation(i: int) -> dict:
+    return {
+        "conversationId": f"c{i}",
+        "title": f"Conversation {i}",
+        "createdAt": f"2024-01-0{i}T00:00:00",
+        "updatedAt": f"2024-01-0{i}T00:00:00",
+    }
+
+def conversations_backend(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/assistant/conversations":
+        return httpx.Response(200, json={"conversations": [conversation(i) for i in range(1, 4)]})
+    if request.method == "DELETE":
+        return httpx.Response(200, json={"status": "success", "message": "Deleted"})
+    return stub_backend(request)
+
+@pytest.fixture
+def backend():
+    return conversations_backend
+
+def test_deleting_a_row_updates_the_table_footer(app_client):
+    assert "1-3 of 3" in app_client.get("/settings/chat-history").text
+
+    response = app_client.delete(
+        "/api/conversations/c2",
+        headers={"HX-Request": "true", "HX-Current-URL": "http://testserver/settings/chat-history"}
+    )
+    assert response.status_code == 200
+    assert 'id="settings-table-pagination"' in response.text
+    assert 'hx-swap-oob="true"' in response.text
+    assert "1-2 of 2" in response.text
+
+def test_deleting_from_elsewhere_sends_no_footer(app_client):
+    response = app_client.delete(
+        "/api/conversations/c2",
+        headers={"HX-Request": "true", "HX-Current-URL": "http://testserver/conversation/c1"}
+    )
+    assert response.status_code == 200
+    assert "settings-table-pagination" not in response.text
@@ -0,0 +1,54 @@
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from conftest import ROOT
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        assert process.poll() is None, process.stdout.read()
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("the server did not become ready")
+
+def test_readiness_fails_before_the_server_stops_accepting(tmp_path):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health/ready"
+    shutil.copy(os.path.join(ROOT, "src", "icons.py"), tmp_path)
+    process = subprocess.Popen(
+        [sys.executable, "-c", f"import uvicorn, main; uvicorn.run(main.app, host='127.0.0.1', port={port})"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([ROOT, os.path.join(ROOT, "src")]), "SHUTDOWN_DRAIN_DELAY": "2"},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+    try:
+        wait_until_ready(url, process)
+        process.send_signal(signal.SIGTERM)
+        signalled = time.monotonic()
+        time.sleep(0.3)
+
+        # Still serving, but telling load balancers to go elsewhere
+        assert httpx.get(url).status_code == 503
+        # uvicorn re-raises the signal once it has shut down cleanly
+        assert process.wait(timeout=10) == -signal.SIGTERM
+        assert time.monotonic() - signalled >= 2
+    finally:
+        process.kill()
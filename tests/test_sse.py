@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from src.services.api.sse import SSEParser
+
+EVENTS = [
+    "event: content\ndata: Hello! 👋 I'm your Vespa AI assistant.\n",
+    "event: content\ndata: <p>Ünïcödé, 中文 and 𝔐𝔞𝔱𝔥</p>\ndata: second line\n",
+    ": keep-alive\n",
+    "id: a1b2-3\nevent: conversation\ndata: {\"conversationId\": \"c1\"}\n",
+]
+
+def transcript(line_ending: str) -> bytes:
+    """The events framed with the given line ending, blank line included."""
+    frames = [event.replace("\n", line_ending) + line_ending for event in EVENTS]
+    return "".join(frames).encode("utf-8")
+
+def expected_frames(line_ending: str):
+    return [event.replace("\n", line_ending) + line_ending for event in EVENTS]
+
+def feed_all(parser: SSEParser, chunks):
+    frames = []
+    for chunk in chunks:
+        frames.extend(parser.feed(chunk))
+    return frames
+
+@pytest.mark.parametrize("line_ending", ["\n", "\r\n", "\r"])
+def test_frames_split_at_every_offset(line_ending):
+    data = transcript(line_ending)
+    for offset in range(len(data) + 1):
+        parser = SSEParser()
+        frames = feed_all(parser, [data[:offset], data[offset:]])
+        assert frames == expected_frames(line_ending), f"split at byte {offset}"
+        assert parser.flush() == b""
+
+@pytest.mark.parametrize("line_ending", ["\n", "\r\n", "\r"])
+def test_frames_fed_one_byte_at_a_time(line_ending):
+    data = transcript(line_ending)
+    parser = SSEParser()
+    frames = feed_all(parser, [data[i:i + 1] for i in range(len(data))])
+    assert frames == expected_frames(line_ending)
+
+@pytest.mark.parametrize("passthrough", [False, True])
+def test_frames_split_at_random_offsets(passthrough):
+    rng = random.Random(3)
+    data = transcript("\n")
+    expected = [
+        frame.encode("utf-8") if passthrough else frame
+        for frame in expected_frames("\n")
+    ]
+    for _ in range(500):
+        offsets = sorted(rng.sample(range(1, len(data)), rng.randint(1, 12)))
+        chunks = [data[start:end] for start, end in zip([0] + offsets, offsets + [len(data)])]
+        assert feed_all(SSEParser(passthrough=passthrough), chunks) == expected, f"split at {offsets}"
+
+def test_passthrough_returns_the_upstream_bytes():
+    for line_ending in ("\n", "\r\n", "\r"):
+        data = transcript(line_ending)
+        for offset in range(len(data) + 1):
+            frames = feed_all(SSEParser(passthrough=True), [data[:offset], data[offset:]])
+            assert all(isinstance(frame, bytes) for frame in frames)
+            assert b"".join(frames) == data
+
+def test_incomplete_frame_is_left_for_flush():
+    data = transcript("\n") + "event: content\ndata: ünfinished".encode("utf-8")
+    for offset in range(len(data) + 1):
+        parser = SSEParser()
+        assert feed_all(parser, [data[:offset], data[offset:]]) == expected_frames("\n")
+        assert parser.flush() == "event: content\ndata: ünfinished".encode("utf-8")